@@ -0,0 +1,77 @@
+"""Benchmark of CFDI validation of one complement with and without vectorized bounds.
+
+Run from the repository root:
+
+    python benchmarks/bench_bounds.py [--sizes 1000,10000,100000] [--repeat 3]
+
+The CFDIs are parsed from JSON text with parse_json_float, as uploads are. Prints the
+best of --repeat runs per mode: every CFDI checked in full, bounds gathered with NumPy (when
+installed) and bounds gathered with the pure Python fallback. The error count must be
+the same in every mode."""
+import argparse
+import contextlib
+import io
+import json
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.complements import vector_bounds  # noqa: E402
+from src.complements.helpers import complement_builder  # noqa: E402
+from src.utils.definitions import parse_json_float  # noqa: E402
+
+CFDI = (
+    '{{"Cfdi": "CD613E30-D8F1-6ADF-91B7-584A2265B1F5", "TipoCfdi": "Ingreso", '
+    '"PrecioCompra": {price}, "Contraprestacion": 100.125, "CargoPorCapacidadAlmac": 12.5, '
+    '"FechaYHoraTransaccion": "2024-01-02T10:00:00-06:00", '
+    '"VolumenDocumentado": {{"ValorNumerico": {volume}, "UnidadDeMedida": "UM03"}}}}'
+    )
+
+
+def build_complement(size: int) -> list:
+    # Uno de cada mil CFDIs rompe un límite para que el camino completo también se ejecute.
+    cfdis = ",".join(
+        CFDI.format(price="10.1234" if index % 1000 == 0 else "10.5", volume=float(index % 500))
+        for index in range(size)
+        )
+    text = (
+        '[{"TipoComplemento": "Almacenamiento", "Nacional": [{"RfcClienteOProveedor": "AAA010101AAA", '
+        f'"NombreClienteOProveedor": "Proveedor Ejemplo SA", "CFDIs": [{cfdis}]}}]}}]'
+        )
+    return json.loads(text, parse_float=parse_json_float)
+
+
+def bench(complement: list) -> tuple:
+    builder = complement_builder(complement_data=complement, complement_type="Almacenamiento")
+    start = time.perf_counter()
+    builder.validate_complemento()
+    return time.perf_counter() - start, len(builder.get_error_list())
+
+
+def main() -> int:
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--sizes", default="1000,10000,100000")
+    arg_parser.add_argument("--repeat", type=int, default=3)
+    args = arg_parser.parse_args()
+
+    logging.getLogger("validator_service").setLevel(logging.WARNING)
+    numpy = vector_bounds.np
+    modes = (("full", False, None), ("numpy", True, numpy), ("python", True, None))
+    for size in (int(size) for size in args.sizes.split(",")):
+        complement = build_complement(size=size)
+        for name, enabled, np_module in modes:
+            if name == "numpy" and numpy is None:
+                print(f"{size:>9} CFDIs {name:<7} NumPy no está instalado")
+                continue
+            vector_bounds.VECTORIZED_BOUNDS, vector_bounds.np = enabled, np_module
+            with contextlib.redirect_stdout(io.StringIO()):
+                seconds, errors = min(bench(complement=complement) for _ in range(args.repeat))
+            print(f"{size:>9} CFDIs {name:<7} {seconds:>9.3f} s {seconds / size * 1e6:>9.2f} us/CFDI {errors:>7} errors")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
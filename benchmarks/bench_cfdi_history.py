@@ -0,0 +1,84 @@
+"""Benchmark of the CFDI history lookups, batched per complement against one query per CFDI.
+
+Run from the repository root:
+
+    python benchmarks/bench_cfdi_history.py [--cfdis 100000] [--complements 10] [--readers 4]
+
+Records a report of --cfdis UUIDs for one period in a temporary database, then prints the
+seconds to look up the next period's report, with half of its UUIDs repeated, batched per
+complement and one UUID at a time, and the same batched lookup run by --readers processes
+at once while another one records a report."""
+import argparse
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.complements.cfdi_history import CfdiHistory  # noqa: E402
+
+RFC = "AAA010101AAA"
+
+
+def build_uuids(size: int) -> list:
+    return [random.getrandbits(128).to_bytes(16, "big") for _ in range(size)]
+
+
+def lookup_batched(history: CfdiHistory, complements: list) -> int:
+    return sum(len(history.previous_periods(rfc=RFC, period="2024-02", uuids=uuids)) for uuids in complements)
+
+
+def lookup_each(history: CfdiHistory, complements: list) -> int:
+    return sum(
+        len(history.previous_periods(rfc=RFC, period="2024-02", uuids=[uuid]))
+        for uuids in complements
+        for uuid in uuids
+        )
+
+
+def reader(path: str, complements: list) -> float:
+    start = time.perf_counter()
+    lookup_batched(history=CfdiHistory(path=path), complements=complements)
+    return time.perf_counter() - start
+
+
+def main() -> int:
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--cfdis", type=int, default=100000)
+    arg_parser.add_argument("--complements", type=int, default=10)
+    arg_parser.add_argument("--readers", type=int, default=4)
+    args = arg_parser.parse_args()
+
+    random.seed(0)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "cfdis.db")
+        history = CfdiHistory(path=path)
+        previous = build_uuids(size=args.cfdis)
+        start = time.perf_counter()
+        history.record(rfc=RFC, period="2024-01", uuids=previous)
+        print(f"record   {args.cfdis:>9} UUIDs {time.perf_counter() - start:>8.3f} s")
+
+        current = random.sample(previous, args.cfdis // 2) + build_uuids(size=args.cfdis - args.cfdis // 2)
+        size = -(-len(current) // args.complements)
+        complements = [current[start:start + size] for start in range(0, len(current), size)]
+        for name, lookup in (("batched", lookup_batched), ("each", lookup_each)):
+            start = time.perf_counter()
+            found = lookup(history=history, complements=complements)
+            print(f"{name:<8} {args.cfdis:>9} UUIDs {time.perf_counter() - start:>8.3f} s {found:>9} found")
+
+        # Lectores de otros procesos mientras uno más registra un reporte.
+        with multiprocessing.Pool(args.readers + 1) as pool:
+            writer = pool.apply_async(CfdiHistory(path=path).record, kwds={
+                "rfc": RFC, "period": "2024-03", "uuids": build_uuids(size=args.cfdis),
+                })
+            seconds = pool.starmap(reader, [(path, complements)] * args.readers)
+            writer.get()
+        print(f"readers  {args.readers:>9} procs {max(seconds):>8.3f} s slowest")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,86 @@
+"""Benchmark of the report UUID index against a set of UUID strings.
+
+Run from the repository root:
+
+    python benchmarks/bench_cfdi_index.py [--sizes 100000,1000000] [--duplicates 0.001]
+
+Prints, per size, the seconds and bytes per UUID of CfdiIndex and of a set of the same
+UUIDs as str, and checks that the index finds every repeated UUID."""
+import argparse
+import os
+import random
+import sys
+import time
+import tracemalloc
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.complements.cfdi_index import CfdiIndex  # noqa: E402
+
+
+def build_uuids(size: int, duplicates: float) -> list:
+    uuids = [str(uuid.UUID(int=random.getrandbits(128))).upper() for _ in range(size)]
+    for index in random.sample(range(1, size), int(size * duplicates)):
+        uuids[index] = uuids[random.randrange(index)]
+    return uuids
+
+
+def bench_index(uuids: list, trace: bool) -> tuple:
+    if trace:
+        tracemalloc.start()
+    start = time.perf_counter()
+    index = CfdiIndex()
+    for cfdi_index, value in enumerate(uuids):
+        index.add(
+            uuid=value, product_index=0, section="Recepciones", complement_index=0, national_index=0,
+            cfdi_index=cfdi_index,
+            )
+    repeated = sum(1 for _ in index.duplicates())
+    seconds = time.perf_counter() - start
+    if not trace:
+        return seconds, 0, repeated
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return seconds, size, repeated
+
+
+def bench_set(uuids: list, trace: bool) -> tuple:
+    # Copias de las cadenas, como las que deja el parser en cada CFDI.
+    copies = [value.encode().decode() for value in uuids]
+    if trace:
+        tracemalloc.start()
+    start = time.perf_counter()
+    seen, repeated = set(), 0
+    for value in copies:
+        if value in seen:
+            repeated += 1
+        seen.add(value)
+    seconds = time.perf_counter() - start
+    if not trace:
+        return seconds, 0, repeated
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    # La cadena la tiene el CFDI mientras el conjunto la guarda, se cuenta su tamaño.
+    return seconds, size + sum(sys.getsizeof(value) for value in seen), repeated
+
+
+def main() -> int:
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--sizes", default="100000,1000000")
+    arg_parser.add_argument("--duplicates", type=float, default=0.001)
+    args = arg_parser.parse_args()
+
+    random.seed(0)
+    for size in (int(size) for size in args.sizes.split(",")):
+        uuids = build_uuids(size=size, duplicates=args.duplicates)
+        for name, bench in (("index", bench_index), ("set", bench_set)):
+            # El tiempo se mide sin tracemalloc, que encarece cada asignación.
+            seconds, _, repeated = bench(uuids=uuids, trace=False)
+            _, nbytes, _ = bench(uuids=uuids, trace=True)
+            print(f"{size:>9} UUIDs {name:<6} {seconds:>8.3f} s {nbytes / size:>8.1f} B/UUID {repeated:>7} repeated")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,119 @@
+"""Benchmark of Producto validation in process against the product pool.
+
+Run from the repository root:
+
+    python benchmarks/bench_products.py [--products 16] [--cfdis 100,1000,10000] [--workers 4] [--complements]
+
+Prints, per number of CFDIs per product, the seconds of the sequential run and of the pool
+run, with the pool already started, and checks that both return the same errors in the
+same order. The smallest size where the pool wins is a starting point for
+PARALLEL_MIN_CFDIS. With --complements the pool runs the Complemento tasks of every
+product instead of chunks of products, see COMPLEMENT_TASKS_MIN_CFDIS."""
+import argparse
+import contextlib
+import copy
+import io
+import logging
+import os
+import random
+import sys
+import time
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src import monthly_volume_report, product_pool  # noqa: E402
+from src.complements.cfdi_index import CfdiIndex  # noqa: E402
+
+
+def build_cfdi(index: int) -> dict:
+    return {
+        "Cfdi": str(uuid.UUID(int=random.getrandbits(128))).upper(),
+        "TipoCfdi": "Ingreso" if index % 50 else "Otro",
+        "PrecioVentaOCompraOContrap": 100.125,
+        "FechaYHoraTransaccion": "2024-01-02T10:00:00-06:00",
+        "VolumenDocumentado": {"ValorNumerico": 10.0, "UnidadDeMedida": "UM03"},
+        }
+
+
+def build_section(cfdis: int, volume_key: str, amount_key: str) -> dict:
+    return {
+        "TotalDocumentosMes": cfdis,
+        volume_key: {"ValorNumerico": 10.0 * cfdis, "UnidadDeMedida": "UM03"},
+        amount_key: 100.125 * cfdis,
+        "Complemento": [{
+            "TipoComplemento": "Comercializacion",
+            "Nacional": [{
+                "RfcClienteOProveedor": "AAA010101AAA",
+                "NombreClienteOProveedor": "Proveedor Ejemplo SA",
+                "PermisoClienteOProveedor": "H/12345/COM/2020",
+                "CFDIs": [build_cfdi(index=index) for index in range(cfdis)],
+                }],
+            }],
+        }
+
+
+def build_products(products: int, cfdis: int) -> list:
+    product = {
+        "ClaveProducto": "PR07",
+        "ClaveSubProducto": "SP16",
+        "ComposOctanajeGasolina": 87,
+        "GasolinaConCombustibleNoFosil": "No",
+        "ReporteDeVolumenMensual": {
+            "ControlDeExistencias": {
+                "VolumenExistenciasMes": 100.5,
+                "FechaYHoraEstaMedicionMes": "2024-01-31T23:00:00-06:00",
+                },
+            "Recepciones": build_section(
+                cfdis=cfdis // 2, volume_key="SumaVolumenRecepcionMes", amount_key="ImporteTotalRecepcionesMensual"),
+            "Entregas": build_section(
+                cfdis=cfdis - cfdis // 2, volume_key="SumaVolumenEntregadoMes", amount_key="ImporteTotalEntregasMes"),
+            },
+        }
+    return [copy.deepcopy(product) for _ in range(products)]
+
+
+def run(products: list) -> tuple:
+    cfdi_index = CfdiIndex()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        errors = product_pool.validate_products(products=products, caracter="permisionario", cfdi_index=cfdi_index)
+    seconds = time.perf_counter() - start
+    return seconds, errors, list(cfdi_index.duplicates())
+
+
+def main() -> int:
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--products", type=int, default=16)
+    arg_parser.add_argument("--cfdis", default="100,1000,10000")
+    arg_parser.add_argument("--workers", type=int, default=4)
+    arg_parser.add_argument("--complements", action="store_true")
+    args = arg_parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    random.seed(0)
+    product_pool.PRODUCT_WORKERS = args.workers
+    product_pool.PARALLEL_MIN_CFDIS = 0
+    monthly_volume_report.COMPLEMENT_TASKS_MIN_CFDIS = 0
+    mode = "PARALLEL_COMPLEMENTS" if args.complements else "PARALLEL_PRODUCTS"
+    # Arranca los procesos antes de medir, como en el servidor.
+    list(product_pool.get_pool().map(abs, range(args.workers)))
+    try:
+        for cfdis in (int(size) for size in args.cfdis.split(",")):
+            products = build_products(products=args.products, cfdis=cfdis)
+            setattr(product_pool, mode, False)
+            sequential, errors, duplicates = run(products=products)
+            setattr(product_pool, mode, True)
+            pool, pool_errors, pool_duplicates = run(products=products)
+            same = errors == pool_errors and duplicates == pool_duplicates
+            print(
+                f"{args.products:>4} products x {cfdis:>7} CFDIs  sequential {sequential:>8.3f} s"
+                f"  pool {pool:>8.3f} s  {len(errors):>7} errors  same {same}"
+                )
+    finally:
+        product_pool.shutdown_pool()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,123 @@
+"""Benchmark of product and monthly log validation for growing list sizes.
+
+Run from the repository root:
+
+    python benchmarks/bench_traversal.py [--sizes 1000,10000,100000] [--max-ratio 2.0] [--regex-stats]
+
+Prints seconds and microseconds per entry for every size. The time per entry must
+stay flat for linear scaling; with --max-ratio the script fails when the slowest
+per-entry time exceeds the fastest by more than that factor. --regex-stats prints the
+patterns that took the most time."""
+import argparse
+import contextlib
+import copy
+import io
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.monthly_log import MonthlyLogValidator  # noqa: E402
+from src.product_validator import ProductValidator  # noqa: E402
+from src.utils.regex_registry import regex  # noqa: E402
+
+CFDI = {
+    "Cfdi": "CD613E30-D8F1-6ADF-91B7-584A2265B1F5",
+    "TipoCfdi": "Ingreso",
+    "PrecioCompra": 10.5,
+    "Contraprestacion": 100.125,
+    "FechaYHoraTransaccion": "2024-01-02T10:00:00-06:00",
+    "VolumenDocumentado": {"ValorNumerico": 10.0, "UnidadDeMedida": "UM03"},
+    }
+COMPLEMENT = {
+    "TipoComplemento": "Comercializacion",
+    "Nacional": [{
+        "RfcClienteOProveedor": "AAA010101AAA",
+        "NombreClienteOProveedor": "Proveedor Ejemplo SA",
+        "PermisoProveedor": "H/12345/COM/2020",
+        "CFDIs": [CFDI, CFDI],
+        }],
+    }
+PRODUCT = {
+    "ClaveProducto": "PR07",
+    "ClaveSubProducto": "SP16",
+    "ComposOctanajeGasolina": 87,
+    "GasolinaConCombustibleNoFosil": "No",
+    "ReporteDeVolumenMensual": {
+        "ControlDeExistencias": {
+            "VolumenExistenciasMes": 100.5,
+            "FechaYHoraEstaMedicionMes": "2024-01-31T23:00:00-06:00",
+            },
+        "Recepciones": {
+            "TotalRecepcionesMes": 2,
+            "SumaVolumenRecepcionMes": {"ValorNumerico": 20.0, "UnidadDeMedida": "UM03"},
+            "TotalDocumentosMes": 2,
+            "ImporteTotalRecepcionesMensual": 200.25,
+            "Complemento": [COMPLEMENT],
+            },
+        "Entregas": {
+            "TotalEntregasMes": 2,
+            "SumaVolumenEntregadoMes": {"ValorNumerico": 20.0, "UnidadDeMedida": "UM03"},
+            "TotalDocumentosMes": 2,
+            "ImporteTotalEntregasMes": 200.25,
+            "Complemento": [COMPLEMENT],
+            },
+        },
+    }
+LOG_ENTRY = {
+    "NumeroRegistro": 1,
+    "FechaYHoraEvento": "2024-01-01T00:00:00-06:00",
+    "TipoEvento": 5,
+    "DescripcionEvento": "Evento",
+    }
+
+
+def bench_products(size: int) -> float:
+    products = [copy.deepcopy(PRODUCT) for _ in range(size)]
+    validator = ProductValidator(products=products, caracter="permisionario")
+    start = time.perf_counter()
+    validator.validate_products()
+    return time.perf_counter() - start
+
+
+def bench_log(size: int) -> float:
+    entries = [dict(LOG_ENTRY, NumeroRegistro=number) for number in range(size)]
+    validator = MonthlyLogValidator(month_log=entries)
+    start = time.perf_counter()
+    validator.validate_log()
+    return time.perf_counter() - start
+
+
+def main() -> int:
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--sizes", default="1000,10000,100000")
+    arg_parser.add_argument("--max-ratio", type=float, default=None)
+    arg_parser.add_argument("--regex-stats", action="store_true")
+    args = arg_parser.parse_args()
+    sizes = [int(size) for size in args.sizes.split(",")]
+
+    logging.getLogger("validator_service").setLevel(logging.WARNING)
+    regex.set_timing(args.regex_stats)
+    failed = False
+    for name, bench in (("Producto", bench_products), ("BitacoraMensual", bench_log)):
+        per_entry = []
+        for size in sizes:
+            with contextlib.redirect_stdout(io.StringIO()):
+                seconds = bench(size)
+            per_entry.append(seconds / size * 1e6)
+            print(f"{name:<16} {size:>9} entries {seconds:>9.3f} s {per_entry[-1]:>9.2f} us/entry")
+        ratio = max(per_entry) / min(per_entry)
+        print(f"{name:<16} per-entry ratio max/min {ratio:.2f}")
+        if args.max_ratio is not None and ratio > args.max_ratio:
+            failed = True
+
+    if args.regex_stats:
+        for row in regex.stats()[:10]:
+            print(f"{row['name']:<36} {row['calls']:>10} calls {row['seconds']:>9.3f} s {row['avg_us']:>7.3f} us/call")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,155 @@
+"""This module validates uploads read by chunks, compressed ones are decompressed by chunks too."""
+import gzip
+import os
+import shutil
+import tempfile
+import zipfile
+from typing import IO, Any, Dict, Iterator, List, Optional, Tuple, Union
+
+from src.json_stream import CHUNK_SIZE
+from src.json_validator import JsonValidator
+from src.validation_pool import format_errors
+
+ARCHIVE_MAX_BYTES = int(os.getenv("ARCHIVE_MAX_BYTES", str(2 * 1024 ** 3)))
+
+GZIP_MAGIC = b"\x1f\x8b"
+ZIP_MAGIC = b"PK\x03\x04"
+
+
+def archive_kind(fileobj: IO[bytes]) -> Optional[str]:
+    """Detect a gzip or zip upload by its magic bytes and rewind it.\n
+    :return: 'gzip', 'zip' or None."""
+    head = fileobj.read(4)
+    fileobj.seek(0)
+    if head.startswith(GZIP_MAGIC):
+        return "gzip"
+    if head.startswith(ZIP_MAGIC):
+        return "zip"
+    return None
+
+
+def is_report_member(member: zipfile.ZipInfo) -> bool:
+    """True for a .json file of a zip archive, not a directory nor macOS metadata
+    ('__MACOSX/' and '._' files)."""
+    name = os.path.basename(member.filename)
+    return (
+        not member.is_dir()
+        and name.lower().endswith(".json")
+        and not name.startswith("._")
+        and "__MACOSX" not in member.filename.split("/")
+        )
+
+
+def iter_archive(fileobj: IO[bytes], kind: str, filename: str) -> Iterator[Tuple[str, Union[IO[bytes], Exception]]]:
+    """Yield (member name, decompressing reader) one member at a time, nothing is extracted.
+    Only the json members of a zip are yielded, one that cannot be opened yields the exception
+    instead of its reader."""
+    if kind == "gzip":
+        name = filename[:-3] if filename.lower().endswith(".gz") else filename
+        with gzip.GzipFile(fileobj=fileobj, mode="rb") as reader:
+            yield name, reader
+        return
+
+    with zipfile.ZipFile(fileobj) as archive:
+        for member in filter(is_report_member, archive.infolist()):
+            name = os.path.basename(member.filename)
+            try:
+                reader = archive.open(member)
+            except Exception as exc:
+                yield name, exc
+                continue
+            with reader:
+                yield name, reader
+
+
+def validate_stream(
+        reader: IO[bytes],
+        filename: str,
+        chunk_size: int = CHUNK_SIZE,
+        record_history: bool = True,
+        check_size: bool = True,
+    ) -> List[Dict[str, str]]:
+    """Parse and validate a json report read by chunks from reader.\n
+    :param record_history: False to check the CFDI history without recording the report.\n
+    :param check_size: False for a reader that does not decompress, its size is the upload size.\n
+    :return: formatted error list."""
+    return stream_result(
+        reader=reader, filename=filename, chunk_size=chunk_size, record_history=record_history, check_size=check_size,
+        )["errors"]
+
+
+def stream_result(
+        reader: IO[bytes],
+        filename: str,
+        chunk_size: int = CHUNK_SIZE,
+        record_history: bool = True,
+        check_size: bool = True,
+    ) -> Dict[str, Any]:
+    """validate_stream result with the utf-8 check, as validate_upload gives it.\n
+    :return: dict with 'errors' and 'valid_utf8'."""
+    validator = JsonValidator(json_report={}, record_history=record_history)
+    parser = validator.stream_parser()
+    size = 0
+    while chunk := reader.read(chunk_size):
+        size += len(chunk)
+        if check_size and size > ARCHIVE_MAX_BYTES:
+            raise ValueError(f"Error: el contenido descomprimido excede {ARCHIVE_MAX_BYTES} bytes.")
+        parser.feed(chunk)
+    parser.close()
+
+    validator.set_json()
+    validator.validate_json_name(name=filename)
+    validator.validate_json()
+
+    return {
+        "errors": format_errors(validator.get_errors()) + parser.decode_errors.get_errors(),
+        "valid_utf8": not parser.decode_errors.total,
+        }
+
+
+def validate_archive(fileobj: IO[bytes], kind: str, filename: str, record_history: bool = True) -> Dict[str, Any]:
+    """Validate every json member of a gzip or zip upload, errors of zip members carry 'filename'
+    and a member that cannot be read or validated is reported without stopping the others.
+
+    :return: dict with 'errors'."""
+    error_list = []
+    for name, reader in iter_archive(fileobj=fileobj, kind=kind, filename=filename):
+        if kind == "gzip":
+            error_list.extend(validate_stream(reader=reader, filename=name, record_history=record_history))
+            continue
+        if isinstance(reader, Exception):
+            errors = [_member_error(exc=reader)]
+        else:
+            try:
+                errors = validate_stream(reader=reader, filename=name, record_history=record_history)
+            except Exception as exc:
+                errors = [_member_error(exc=exc)]
+        for error in errors:
+            error["filename"] = name
+        error_list.extend(errors)
+    return {"errors": error_list}
+
+
+def _member_error(exc: Exception) -> Dict[str, str]:
+    return {"type_error": type(exc).__name__, "error": f"Error al cargar el archivo: {str(exc)}"}
+
+
+def validate_file(path: str, kind: Optional[str], filename: str, record_history: bool = True) -> Dict[str, Any]:
+    """Validate an upload saved at path by chunks, runs inside the validation workers.\n
+    :param kind: 'gzip', 'zip' or None for a json report.\n
+    :return: dict with 'errors', and 'valid_utf8' for a json report."""
+    with open(path, "rb") as fileobj:
+        if kind is None:
+            return stream_result(reader=fileobj, filename=filename, record_history=record_history, check_size=False)
+        return validate_archive(fileobj=fileobj, kind=kind, filename=filename, record_history=record_history)
+
+
+def save_upload(fileobj: IO[bytes]) -> str:
+    """Copy an upload to a temporary file readable only by this user, so a worker process
+    can read it by chunks; the caller removes it.\n
+    :return: path of the copy."""
+    fileobj.seek(0)
+    with tempfile.NamedTemporaryFile(prefix="upload-", suffix=".tmp", delete=False) as copy:
+        shutil.copyfileobj(fileobj, copy, CHUNK_SIZE)
+    fileobj.seek(0)
+    return copy.name
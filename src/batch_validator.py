@@ -0,0 +1,93 @@
+"""This module validates many uploaded reports per request."""
+import asyncio
+import json
+import os
+import zipfile
+from typing import Any, AsyncIterator, Dict, List, Tuple, Union
+
+from starlette.datastructures import UploadFile
+
+from src.archive_stream import ARCHIVE_MAX_BYTES, is_report_member
+from src.json_stream import CHUNK_SIZE
+from src.validation_pool import VALIDATION_WORKERS, get_pool, validate_upload
+
+BATCH_MAX_IN_FLIGHT = int(os.getenv("BATCH_MAX_IN_FLIGHT", str(2 * max(VALIDATION_WORKERS, 1))))
+BATCH_MAX_FILES = int(os.getenv("BATCH_MAX_FILES", "10000"))
+
+
+def read_member(archive: zipfile.ZipFile, member: zipfile.ZipInfo) -> bytes:
+    """Decompress a zip member by chunks, up to ARCHIVE_MAX_BYTES.\n
+    :raise ValueError: if the member declares or decompresses to more than ARCHIVE_MAX_BYTES.\n
+    :return: member content."""
+    if member.file_size > ARCHIVE_MAX_BYTES:
+        raise ValueError(f"Error: el contenido descomprimido excede {ARCHIVE_MAX_BYTES} bytes.")
+    content = bytearray()
+    with archive.open(member) as reader:
+        # El tamaño declarado puede no ser el real, se cuenta lo descomprimido.
+        while chunk := reader.read(CHUNK_SIZE):
+            content += chunk
+            if len(content) > ARCHIVE_MAX_BYTES:
+                raise ValueError(f"Error: el contenido descomprimido excede {ARCHIVE_MAX_BYTES} bytes.")
+    return bytes(content)
+
+
+async def iter_members(files: List[UploadFile]) -> AsyncIterator[Tuple[str, Union[bytes, Exception]]]:
+    """Yield (filename, content) of every uploaded file, zip archives yield each json member.
+    A member that cannot be read yields the exception instead of its content."""
+    for upload in files:
+        if zipfile.is_zipfile(upload.file):
+            with zipfile.ZipFile(upload.file) as archive:
+                for member in filter(is_report_member, archive.infolist()):
+                    try:
+                        content = await asyncio.to_thread(read_member, archive, member)
+                    except (ValueError, zipfile.BadZipFile, NotImplementedError) as exc:
+                        content = exc
+                    yield os.path.basename(member.filename), content
+        else:
+            upload.file.seek(0)
+            yield upload.filename, await upload.read()
+
+
+async def validate_batch(files: List[UploadFile]) -> AsyncIterator[bytes]:
+    """Validate members on the pool and yield one NDJSON line per member as soon as it finishes.
+
+    At most BATCH_MAX_IN_FLIGHT members are read and queued at a time; every line
+    carries the member 'index' in upload order. The uploads are closed at the end."""
+    loop = asyncio.get_running_loop()
+    pending = {}
+    try:
+        index = 0
+        async for filename, content in iter_members(files):
+            if isinstance(content, Exception):
+                future = loop.create_future()
+                future.set_exception(content)
+            else:
+                future = loop.run_in_executor(get_pool(), validate_upload, content, filename)
+            pending[future] = (index, filename)
+            index += 1
+            if len(pending) >= BATCH_MAX_IN_FLIGHT:
+                for line in await _wait_first(pending):
+                    yield line
+        while pending:
+            for line in await _wait_first(pending):
+                yield line
+    finally:
+        for future in pending:
+            future.cancel()
+        for upload in files:
+            await upload.close()
+
+
+async def _wait_first(pending: Dict[asyncio.Future, Tuple[int, str]]) -> List[bytes]:
+    """Wait for at least one member and return its result lines."""
+    done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+    return [_result_line(future, *pending.pop(future)) for future in done]
+
+
+def _result_line(future: asyncio.Future, index: int, filename: str) -> bytes:
+    result: Dict[str, Any] = {"index": index, "filename": filename}
+    try:
+        result["errors"] = future.result()["errors"]
+    except Exception as exc:
+        result["Error"] = f"Error al cargar el archivo: {str(exc)}"
+    return json.dumps(result, ensure_ascii=False).encode("UTF-8") + b"\n"
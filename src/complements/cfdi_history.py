@@ -0,0 +1,103 @@
+"""This module keeps the CFDI UUIDs of every validated report in SQLite, by RFC and period.
+
+Once a report is validated its UUIDs are looked up among the ones recorded for the same
+RfcContribuyente in earlier periods, one query per Complemento item, chunked to
+CFDI_HISTORY_BATCH UUIDs, instead of one query per CFDI. A report without errors then
+replaces the UUIDs recorded for its RFC and period in a single transaction; ``forget``
+drops the ones of a report that was rejected afterwards. UUIDs are stored as their 16 bytes in a
+table without rowid whose primary key starts with (rfc, uuid), so every lookup is a probe
+of that key. The database runs in WAL mode: the workers of every process read it while
+one of them records a report."""
+import os
+import sqlite3
+import tempfile
+import threading
+from typing import Dict, Iterable, Optional, Sequence
+
+from src.utils.regex_registry import regex
+
+CHECK_CFDI_HISTORY = os.getenv("CHECK_CFDI_HISTORY", "false").lower() in ("1", "true", "yes")
+CFDI_HISTORY_DB_PATH = os.getenv(
+    "CFDI_HISTORY_DB_PATH", os.path.join(tempfile.gettempdir(), "json_validator_cfdis.db"))
+# Menor que el límite de parámetros por sentencia de SQLite.
+CFDI_HISTORY_BATCH = int(os.getenv("CFDI_HISTORY_BATCH", "500"))
+
+HISTORY_MESSAGE = "Error: Cfdi '{value}' ya fue declarado en el reporte del periodo {period}."
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS cfdis (
+    rfc TEXT NOT NULL,
+    uuid BLOB NOT NULL,
+    period TEXT NOT NULL,
+    PRIMARY KEY (rfc, uuid, period)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS cfdis_period ON cfdis (rfc, period);
+"""
+
+
+def report_period(date: object) -> Optional[str]:
+    """Period 'yyyy-mm' of a FechaYHoraReporteMes value.\n
+    :return: str or None when date is not in UTC format."""
+    if not isinstance(date, str) or not regex.UTC_FORMAT_REGEX(date):
+        return None
+    return date[:7]
+
+
+class CfdiHistory:
+    """UUIDs of the CFDIs declared by each RFC in each period.
+
+    Every process and thread opens its own connection, as JobStore does."""
+
+    def __init__(self, path: str = CFDI_HISTORY_DB_PATH) -> None:
+        self.path = path
+        self._local = threading.local()
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            # Con WAL basta sincronizar en cada checkpoint, no en cada transacción.
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+
+    def previous_periods(self, rfc: str, period: str, uuids: Sequence[bytes]) -> Dict[bytes, str]:
+        """Earliest period before period in which rfc declared each of uuids.\n
+        :param uuids: UUIDs as 16 bytes, looked up in chunks of CFDI_HISTORY_BATCH.\n
+        :return: dict of UUID bytes to period, only for the UUIDs already declared."""
+        found = {}
+        for start in range(0, len(uuids), CFDI_HISTORY_BATCH):
+            chunk = uuids[start:start + CFDI_HISTORY_BATCH]
+            rows = self.conn.execute(
+                f"SELECT uuid, MIN(period) FROM cfdis WHERE rfc = ? AND uuid IN ({', '.join('?' * len(chunk))}) "
+                "AND period < ? GROUP BY uuid",
+                (rfc, *chunk, period),
+                )
+            found.update(rows)
+        return found
+
+    def record(self, rfc: str, period: str, uuids: Iterable[bytes]) -> None:
+        """Store the UUIDs of a report, replacing the ones recorded for rfc and period by an
+        earlier report of the same period.\n
+        :return: None."""
+        with self.conn:
+            self.conn.execute("BEGIN")
+            self.conn.execute("DELETE FROM cfdis WHERE rfc = ? AND period = ?", (rfc, period))
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO cfdis (rfc, uuid, period) VALUES (?, ?, ?)",
+                ((rfc, uuid, period) for uuid in uuids),
+                )
+
+    def forget(self, rfc: str, period: str) -> int:
+        """Drop the UUIDs recorded for rfc and period, e.g. of a report that was rejected.\n
+        :return: number of UUIDs dropped."""
+        with self.conn:
+            self.conn.execute("BEGIN")
+            cursor = self.conn.execute("DELETE FROM cfdis WHERE rfc = ? AND period = ?", (rfc, period))
+        return cursor.rowcount
+
+
+cfdi_history = CfdiHistory()
@@ -0,0 +1,185 @@
+"""This module finds CFDI UUIDs declared more than once in a report.
+
+CfdiIndex is an open addressing hash table scoped to one report: the UUIDs are kept as
+their 16 bytes in a single bytearray and the location of their first occurrence as one
+64 bit integer in an array, 24 bytes per slot instead of a str object and a set entry per
+UUID. A location is the number of its group, the Complemento list and Nacional item that
+holds the CFDI, and the index of the CFDI in its list.
+
+Occurrences after the first one are kept apart and ``duplicates`` reports them once the
+whole report was read, ordered by their place in the report, so the result does not depend
+on the order the CFDIs were validated in, e.g. CFDIs streamed before their TipoComplemento.
+``complements`` hands the first occurrences to the report history of cfdi_history."""
+import os
+from array import array
+from typing import Dict, Iterator, List, Optional, Tuple
+from uuid import UUID
+
+CHECK_DUPLICATE_CFDIS = os.getenv("CHECK_DUPLICATE_CFDIS", "true").lower() in ("1", "true", "yes")
+CFDI_INDEX_CAPACITY = int(os.getenv("CFDI_INDEX_CAPACITY", "1024"))
+
+DUPLICATE_MESSAGE = "Error: Cfdi '{value}' duplicado, ya fue declarado en {first}."
+
+_KEY_SIZE = 16
+_EMPTY = -1
+_GROUP_SHIFT = 32
+_SECTION_ORDER = {"Recepciones": 0, "Entregas": 1}
+
+# (índice de producto, sección, índice de complemento, índice de Nacional)
+Group = Tuple[int, str, int, int]
+
+
+def uuid_bytes(value: object) -> Optional[bytes]:
+    """16 bytes of a CFDI UUID, with either case of hex digits.\n
+    :return: bytes or None when value is not a UUID."""
+    if not isinstance(value, str) or len(value) != 36:
+        return None
+    try:
+        key = bytes.fromhex(value.replace("-", ""))
+    except ValueError:
+        return None
+    return key if len(key) == _KEY_SIZE else None
+
+
+class CfdiIndex:
+    """UUIDs of every CFDI read so far and the location of their first occurrence."""
+    __slots__ = ("_keys", "_locations", "_mask", "_used", "_limit", "_groups", "_group_ids", "_repeated")
+
+    def __init__(self, capacity: int = CFDI_INDEX_CAPACITY) -> None:
+        capacity = 1 << max(capacity - 1, 1).bit_length()
+        self._keys = bytearray(capacity * _KEY_SIZE)
+        self._locations = array("q", [_EMPTY]) * capacity
+        self._mask = capacity - 1
+        self._used = 0
+        # Se duplica la tabla al 70% de ocupación, el sondeo lineal se alarga pasado ese punto.
+        self._limit = capacity * 7 // 10
+        self._groups: List[Group] = []
+        self._group_ids: Dict[Group, int] = {}
+        self._repeated: List[Tuple[bytes, int]] = []
+
+    def __len__(self) -> int:
+        return self._used
+
+    def add(
+            self,
+            uuid: object,
+            product_index: int,
+            section: str,
+            complement_index: int,
+            national_index: int,
+            cfdi_index: int,
+        ) -> None:
+        """Index one CFDI of Producto[product_index].ReporteDeVolumenMensual.<section>.\n
+        :param uuid: Value of its Cfdi key, values that are not a UUID are skipped.\n
+        :return: None."""
+        if (key := uuid_bytes(uuid)) is None:
+            return
+        group_id = self._group_id(group=(product_index, section, complement_index, national_index))
+        self._insert(key=key, location=group_id << _GROUP_SHIFT | cfdi_index)
+
+    def update(self, other: "CfdiIndex") -> None:
+        """Add the CFDIs of an index filled with other products of the same report, e.g. by
+        a worker process; the result is the same as adding them in any order.\n
+        :return: None."""
+        group_ids = [self._group_id(group=group) for group in other._groups]
+        cfdi_mask = (1 << _GROUP_SHIFT) - 1
+        for slot, location in enumerate(other._locations):
+            if location != _EMPTY:
+                key = bytes(other._keys[slot * _KEY_SIZE:(slot + 1) * _KEY_SIZE])
+                self._insert(key=key, location=group_ids[location >> _GROUP_SHIFT] << _GROUP_SHIFT | location & cfdi_mask)
+        self._repeated.extend(
+            (key, group_ids[location >> _GROUP_SHIFT] << _GROUP_SHIFT | location & cfdi_mask)
+            for key, location in other._repeated
+            )
+
+    def _group_id(self, group: Group) -> int:
+        if (group_id := self._group_ids.get(group)) is None:
+            group_id = self._group_ids[group] = len(self._groups)
+            self._groups.append(group)
+        return group_id
+
+    def _insert(self, key: bytes, location: int) -> None:
+        keys, locations, mask = self._keys, self._locations, self._mask
+        slot = hash(key) & mask
+        while locations[slot] != _EMPTY:
+            start = slot * _KEY_SIZE
+            if keys[start:start + _KEY_SIZE] == key:
+                self._repeated.append((key, location))
+                return
+            slot = (slot + 1) & mask
+        start = slot * _KEY_SIZE
+        keys[start:start + _KEY_SIZE] = key
+        locations[slot] = location
+        self._used += 1
+        if self._used >= self._limit:
+            self._grow()
+
+    def duplicates(self) -> Iterator[Tuple[str, str, str]]:
+        """Every CFDI whose UUID was declared before it in the report.\n
+        :return: Iterator of (UUID, path of the first CFDI, path of the repeated CFDI), in
+        report order of the repeated CFDI."""
+        occurrences: Dict[bytes, List[int]] = {}
+        for key, location in self._repeated:
+            occurrences.setdefault(key, [self._find(key=key)]).append(location)
+        repeated = []
+        for key, locations in occurrences.items():
+            first, *others = sorted(locations, key=self._order)
+            repeated.extend((self._order(location), key, first, location) for location in others)
+        for _, key, first, location in sorted(repeated):
+            yield str(UUID(bytes=key)).upper(), self.path(location=first), self.path(location=location)
+
+    def complements(self) -> Iterator[List[Tuple[bytes, int]]]:
+        """First occurrence of every UUID, grouped by the Complemento item that holds it.\n
+        :return: Iterator of lists of (UUID bytes, location), in report order."""
+        by_complement: Dict[Tuple[int, int, str, int], List[Tuple[bytes, int]]] = {}
+        keys = self._keys
+        for slot, location in enumerate(self._locations):
+            if location == _EMPTY:
+                continue
+            product_index, section, complement_index, _ = self._groups[location >> _GROUP_SHIFT]
+            complement = (product_index, _SECTION_ORDER.get(section, 2), section, complement_index)
+            by_complement.setdefault(complement, []).append((bytes(keys[slot * _KEY_SIZE:(slot + 1) * _KEY_SIZE]), location))
+        for complement in sorted(by_complement):
+            yield sorted(by_complement[complement], key=lambda item: self._order(location=item[1]))
+
+    def _find(self, key: bytes) -> int:
+        keys, locations, mask = self._keys, self._locations, self._mask
+        slot = hash(key) & mask
+        while keys[slot * _KEY_SIZE:(slot + 1) * _KEY_SIZE] != key:
+            slot = (slot + 1) & mask
+        return locations[slot]
+
+    def _order(self, location: int) -> Tuple[int, int, int, int, int]:
+        product_index, section, complement_index, national_index = self._groups[location >> _GROUP_SHIFT]
+        cfdi_index = location & ((1 << _GROUP_SHIFT) - 1)
+        return product_index, _SECTION_ORDER.get(section, 2), complement_index, national_index, cfdi_index
+
+    def _grow(self) -> None:
+        old_keys, old_locations = self._keys, self._locations
+        capacity = len(old_locations) * 2
+        self._keys = keys = bytearray(capacity * _KEY_SIZE)
+        self._locations = locations = array("q", [_EMPTY]) * capacity
+        self._mask = mask = capacity - 1
+        self._limit = capacity * 7 // 10
+        for old_slot in [slot for slot, location in enumerate(old_locations) if location != _EMPTY]:
+            start = old_slot * _KEY_SIZE
+            key = bytes(old_keys[start:start + _KEY_SIZE])
+            slot = hash(key) & mask
+            while locations[slot] != _EMPTY:
+                slot = (slot + 1) & mask
+            keys[slot * _KEY_SIZE:(slot + 1) * _KEY_SIZE] = key
+            locations[slot] = old_locations[old_slot]
+
+    def path(self, location: int) -> str:
+        """Path of the CFDI at location, as given by ``complements``."""
+        product_index, section, complement_index, national_index = self._groups[location >> _GROUP_SHIFT]
+        cfdi_index = location & ((1 << _GROUP_SHIFT) - 1)
+        return (
+            f"Producto[{product_index}].ReporteDeVolumenMensual.{section}"
+            f".Complemento[{complement_index}].Nacional[{national_index}].CFDIs[{cfdi_index}]"
+            )
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the table, groups aside."""
+        return len(self._keys) + self._locations.itemsize * len(self._locations)
@@ -1,37 +1,42 @@
 """Base class for components inheratence using Almacenamiento Complement"""
-import re
-from typing import Optional, Union
-
-from src.complements.constants import (ADUANAL_PEDIMENTO, CFDI_REGEX,
-                                       DATE_REGEX, FOLIO_CERTIFIED_REGEX,
-                                       FOLIO_DICTAMEN_REGEX,
-                                       IMPORT_PERMISSION_REGEX,
-                                       INTERN_SPOT_REGEX, MEASURE_UNIT,
-                                       PERMISSION_PROOVE_REGEX,
-                                       RFC_PERSONA_MORAL_REGEX, RFC_REGEX,
-                                       TRANSPORT_PERM_REGEX, UTC_FORMAT_REGEX)
-from src.complements.enumerators import (AduanaEntrance, CfdiType,
-                                         ComplementTypeEnum, CountryCode,
-                                         IncotermCode)
+from typing import List, Optional, Tuple, Union
+
+from src.complements.cfdi_index import CfdiIndex
+from src.complements.enumerators import ComplementTypeEnum
+from src.complements.rule_tables import COMPLEMENT_RULES
+from src.complements.rules import (LONGITUD_MESSAGE, MIN_MAX_MESSAGE,
+                                   NONFOUND_MESSAGE, REGEX_MESSAGE,
+                                   VALUE_MESSAGE)
+from src.complements.rules_codegen import compiled_rules
+from src.complements.totals import DocumentTotals
+from src.complements.vector_bounds import suspect_records
 from src.custom_exceptions import (ClaveError, LongitudError, RegexError,
-                                   TipadoError, ValorError, ValorMinMaxError)
+                                   ValorError, ValorMinMaxError)
 from src.decorators import exception_wrapper
 from src.dict_type_validator import DictionaryTypeValidator
-from src.dict_types import (compl_foreign_pedimentos, complement,
-                            complement_certified, complement_cfdis,
-                            complement_dictamen, complement_foreign,
-                            complement_national, complement_transport)
+from src.dict_types import complement
+from src.utils.path_context import PathContext
+from src.utils.progress import advance, count_cfdis
 
 
 class ComplementBuilder:
     """Base class for complement types according type."""
-    def __init__(self, complement_type: str, complement_dict: list):
+    rules_type = "Almacenamiento"
+
+    def __init__(self, complement_type: str, complement_dict: list, offset: int = 0):
         self._comp_index = 0
+        self.offset = offset
+        self.path = PathContext(key="Complemento", index=offset)
         self.complement = complement_dict
         self.complement_type = complement_type
         self.current_complement = complement_dict[self._comp_index]
         self.comp_len = len(complement_dict)
         self.exc_func = set()
+        # Totales de la sección a la que se suma cada CFDI y pedimento validado.
+        self.totals: Optional[DocumentTotals] = None
+        # Índice de UUIDs del reporte y (índice de producto, sección) de esta lista Complemento.
+        self.cfdi_index: Optional[CfdiIndex] = None
+        self.cfdi_scope: Optional[Tuple[int, str]] = None
         self._errors = {}
         self._errors_list = []
 
@@ -44,20 +49,16 @@ class ComplementBuilder:
             self._validate_dictamen()
             self._validate_certificado()
             self._validate_nacional()
-            self.__validate_national_cfdi()
             self._validate_aclaracion()
             self._validate_extranjero()
-            self.__validate_extranjero_pedimentos()
 
             self._update_index()
             # self.validate_complemento()
 
     @exception_wrapper
     def _validate_complemento_tipado(self) -> None:
-        if err := DictionaryTypeValidator().validate_dict_type(dict_to_validate=self.current_complement, dict_type=complement):
-            type_err = err.get("type_err")
-            err_message = err.get("err_message")
-            self.catch_error(err_type=type_err, err_message=err_message)
+        for err in DictionaryTypeValidator.validate_dict_types(dict_to_validate=self.current_complement, dict_type=complement):
+            self.catch_error(err_type=err["type_err"], err_message=err["err_message"])
 
     @exception_wrapper
     def _validate_tipo_complemento(self) -> None:
@@ -68,72 +69,25 @@ class ComplementBuilder:
 
     @exception_wrapper
     def _validate_transporte(self) -> None:
+        """Validate Transporte object.\n
+        :return: None."""
         if (transportation := self.current_complement.get("Transporte")) is None:
             return
-        transp_permission = transportation.get("PermisoTransporte")
-        vehicle_key = transportation.get("ClaveVehiculo")
-        trans_fee = transportation.get("TarifaDeTransporte")
-        trans_cap_fee = transportation.get("CargoPorCapacidadTransporte")
-        trans_use_fee = transportation.get("CargoPorUsoTrans")
-        trans_volum_charge = transportation.get("CargoVolumetricoTransporte")
-
-        if err := DictionaryTypeValidator().validate_dict_type(dict_to_validate=transportation,
-                                                               dict_type=complement_transport):
-            type_err = err.get("type_err")
-            err_message = err.get("err_message")
-            self.catch_error(err_type=type_err, err_message=err_message)
-        if transp_permission is None:
-            self._nonfound_key_error(key="PermisoTransporte")
-            # self.catch_error(err_type=ClaveError, err_message="Error: clave 'PermisoTransporte' no encontrada.")
-        if trans_fee is None:
-            self._nonfound_key_error(key="TarifaDeTransporte")
-            # self.catch_error(ClaveError, "Error: clave 'TarifaDeTransporte' no encontrada.")
-
-        if transp_permission and not re.match(TRANSPORT_PERM_REGEX, transp_permission):
-            self._regex_error(
-                key="PermisoTransporte", value=transp_permission, pattern=TRANSPORT_PERM_REGEX,
-                )
-            # self.catch_error(RegexError,
-            # f"Error: valor 'PermisoTransporte' no cumple con el patron {TRANSPORT_PERM_REGEX}")
-        if vehicle_key and not 6 <= len(vehicle_key) <= 12:
-            self._longitud_error(
-                key="ClaveVehiculo", value=vehicle_key, min_long=6, max_long=12,
-                )
-            # self.catch_error(LongitudError, "Error: 'ClaveVehiculo' no cumple con la longitud min 6 o max 12.")
-        if trans_fee and not 0 <= trans_fee <= 1000000000000:
-            self._min_max_value_error(
-                key="TarifaDeTransporte", value=trans_fee, min_val=0, max_val=1000000000000,
-                )
-            # self.catch_error(
-            #     err_type=ValorMinMaxError,
-            #     err_message="Error: valor 'TarifaDeTransporte' no se encuentra en el rango min 0 o max 1000000000000."
-            #     )
-        if trans_cap_fee and 0 <= trans_cap_fee <= 1000000000000:
-            self._min_max_value_error(
-                key="CargoPorCapacidadTransporte", value=trans_cap_fee, min_val=0, max_val=1000000000000,
-                )
-            # self.catch_error(
-            #     err_type=ValorMinMaxError,
-            #     err_message="Error:
-            # valor 'CargoPorCapacidadTransporte' no se encuentra en el rango min 0 o max 1000000000000."
-            #     )
-        if trans_use_fee and 0 <= trans_use_fee <= 1000000000000:
-            self._min_max_value_error(
-                key="CargoPorUsoTrans", value=ValorMinMaxError, min_val=0, max_val=1000000000000,
-                )
-            # self.catch_error(
-            #     err_type=ValorMinMaxError,
-            #     err_message="Error: valor 'CargoPorUsoTrans' no se encuentra en el rango min 0 o max 1000000000000."
-            #     )
-        if trans_volum_charge and 0 <= trans_volum_charge <= 1000000000000:
-            self._min_max_value_error(
-                key="CargoVolumetricoTransporte", value=trans_volum_charge, min_val=0, max_val=1000000000000,
-                )
-            # self.catch_error(
-            #     err_type=ValorMinMaxError,
-            #     err_message="Error:
-            # valor 'CargoVolumetricoTransporte' no se encuentra en el rango min 0 o max 1000000000000."
-            #     )
+        with self.path.at("Transporte"):
+            self._apply_rules(section="Transporte", record=transportation)
+
+    @exception_wrapper
+    def _validate_terminal_alm_dist(self) -> None:
+        """Validate TerminalAlmYDist object and its Almacenamiento and Transporte objects.\n
+        :return: None."""
+        if (alm_terminal := self.current_complement.get("TerminalAlmYDist")) is None:
+            return
+        with self.path.at("TerminalAlmYDist"):
+            self._apply_rules(section="TerminalAlmYDist", record=alm_terminal)
+            for key in ("Almacenamiento", "Transporte"):
+                if (record := alm_terminal.get(key)) is not None:
+                    with self.path.at(key):
+                        self._apply_rules(section=f"TerminalAlmYDist.{key}", record=record)
 
     @exception_wrapper
     def _validate_dictamen(self) -> None:
@@ -141,56 +95,8 @@ class ComplementBuilder:
         :return: None."""
         if (dictamen := self.current_complement.get("Dictamen")) is None:
             return
-        dictamen_parent = "Dictamen"
-
-        if err := DictionaryTypeValidator().validate_dict_type(dict_to_validate=dictamen,
-                                                               dict_type=complement_dictamen):
-            type_err = err.get("type_err")
-            err_message = err.get("err_message")
-            self.catch_error(err_type=type_err, err_message=err_message, source=dictamen_parent)
-        dictamen_rfc = dictamen.get("RfcDictamen")
-        dictamen_lote = dictamen.get("LoteDictamen")
-        dictamen_folio = dictamen.get("NumeroFolioDictamen")
-        dictamen_date = dictamen.get("FechaEmisionDictamen")
-        dictamen_result = dictamen.get("ResultadoDictamen")
-
-        if dictamen_rfc is None:
-            print("parent", "Dictamen.RfcDictamen")
-            self._nonfound_key_error(key="RfcDictamen", source=dictamen_parent)
-        if dictamen_lote is None:
-            self._nonfound_key_error(key="LoteDictamen", source=dictamen_parent)
-        if dictamen_folio is None:
-            self._nonfound_key_error(key="NumeroFolioDictamen", source=dictamen_parent)
-        if dictamen_date is None:
-            self._nonfound_key_error(key="FechaEmisionDictamen", source=dictamen_parent)
-        if dictamen_result is None:
-            self._nonfound_key_error(key="ResultadoDictamen", source=dictamen_parent)
-
-        if dictamen_rfc and not re.match(RFC_PERSONA_MORAL_REGEX, dictamen_rfc):
-            self._regex_error(
-                key="RfcDictamen", value=dictamen_rfc, pattern=RFC_PERSONA_MORAL_REGEX,
-                source=f"{dictamen_parent}.RfcDictamen"
-                )
-        if dictamen_lote and not 1 <= len(dictamen_lote) <= 50:
-            self._longitud_error(
-                key="LoteDictamen", value=dictamen_lote, min_long=1, max_long=50,
-                source=f"{dictamen_parent}.LoteDictamen"
-                )
-        if dictamen_folio and not re.match(FOLIO_DICTAMEN_REGEX, dictamen_folio):
-            self._regex_error(
-                key="NumeroFolioDictamen", value=dictamen_folio, pattern=FOLIO_DICTAMEN_REGEX,
-                source=f"{dictamen_parent}.NumeroFolioDictamen"
-                )
-        if dictamen_date and not re.match(DATE_REGEX, dictamen_date):
-            self._regex_error(
-                key="FechaEmisionDictamen", value=dictamen_date, pattern=DATE_REGEX,
-                source=f"{dictamen_parent}.FechaEmisionDictamen"
-                )
-        if dictamen_result and not 10 <= len(dictamen_result) <= 300:
-            self._longitud_error(
-                key="ResultadoDictamen", value=dictamen_result, min_long=10, max_long=300,
-                source=f"{dictamen_parent}.ResultadoDictamen"
-                )
+        with self.path.at("Dictamen"):
+            self._apply_rules(section="Dictamen", record=dictamen)
 
     @exception_wrapper
     def _validate_certificado(self) -> None:
@@ -198,329 +104,84 @@ class ComplementBuilder:
         :return: None."""
         if (certified := self.current_complement.get("Certificado")) is None:
             return
-
-        cert_parent = "Certificado"
-        certified_rfc = certified.get("RfcCertificado")
-        certified_folio = certified.get("NumeroFolioCertificado")
-        certified_date = certified.get("FechaEmisionCertificado")
-        certified_result = certified.get("ResultadoCertificado")
-
-        if err := DictionaryTypeValidator().validate_dict_type(dict_to_validate=certified,
-                                                               dict_type=complement_certified):
-            type_err = err.get("type_err")
-            err_message = err.get("err_message")
-            self.catch_error(err_type=type_err, err_message=err_message, source=cert_parent)
-        if certified_rfc is None:
-            self._nonfound_key_error(key="RfcCertificado", source=cert_parent)
-        if certified_folio is None:
-            self._nonfound_key_error(key="NumeroFolioCertificado", source=cert_parent)
-        if certified_date is None:
-            self._nonfound_key_error(key="FechaEmisionCertificado", source=cert_parent)
-        if certified_result is None:
-            self._nonfound_key_error(key="ResultadoCertificado", source=cert_parent)
-
-        if certified_rfc and not re.match(RFC_PERSONA_MORAL_REGEX, certified_rfc):
-            self._regex_error(
-                key="RfcCertificado", value=certified_rfc, pattern=RFC_PERSONA_MORAL_REGEX,
-                source=f"{cert_parent}.RfcCertificado"
-                )
-        if certified_folio and not re.match(FOLIO_CERTIFIED_REGEX, certified_folio):
-            self._regex_error(
-                key="NumeroFolioCertificado", value=certified_folio, pattern=FOLIO_CERTIFIED_REGEX,
-                source=f"{cert_parent}.NumeroFolioCertificado"
-                )
-        if certified_date and not re.match(DATE_REGEX, certified_date):
-            self._regex_error(
-                key="FechaEmisionCertificado", value=certified_date, pattern=DATE_REGEX,
-                source=f"{cert_parent}.FechaEmisionCertificado"
-                )
-        if certified_result and not 10 <= len(certified_result) <= 300:
-            self._longitud_error(
-                key="ResultadoCertificado", value=certified_result, min_long=10, max_long=300,
-                source=f"{cert_parent}.ResultadoCertificado"
-                )
+        with self.path.at("Certificado"):
+            self._apply_rules(section="Certificado", record=certified)
 
     @exception_wrapper
     def _validate_nacional(self) -> None:
-        """Validate Nacional objs list.\n
+        """Validate Nacional objs list and their CFDIs.\n
         :return: None."""
         if (national := self.current_complement.get("Nacional")) is None:
             return
 
-        for national_item in national:
-            custom_client_rfc = national_item.get("RfcClienteOProveedor")
-            custom_client_name = national_item.get("NombreClienteOProveedor")
-            supplier_permission = national_item.get("PermisoProveedor")
-
-            national_parent = f"Nacional[{national.index(national_item)}]"
-
-            if err := DictionaryTypeValidator().validate_dict_type(dict_to_validate=national_item,
-                                                                dict_type=complement_national):
-                type_err = err.get("type_err")
-                err_message = err.get("err_message")
-                self.catch_error(err_type=type_err, err_message=err_message)
-            if custom_client_rfc is None:
-                self._nonfound_key_error(
-                    key="RfcClienteOProveedor",
-                    source=f"{national_parent}.RfcClienteOProveedor"
-                    )
-            if custom_client_name is None:
-                self._nonfound_key_error(
-                    key="NombreClienteOProveedor",
-                    source=f"{national_parent}.NombreClienteOProveedor"
-                    )
-            if custom_client_rfc and not re.match(RFC_REGEX, custom_client_rfc):
-                self._regex_error(
-                    key="RfcClienteOProveedor", value=custom_client_rfc, pattern=RFC_REGEX,
-                    source=f"{national_parent}.RfcClienteOProveedor"
-                    )
-            if custom_client_name and not 10 <= len(custom_client_name) <= 150:
-                self._longitud_error(
-                    key="NombreClienteOProveedor", value=custom_client_name, min_long=10, max_long=150,
-                    source=f"{national_parent}.NombreClienteOProveedor"
-                    )
-            if supplier_permission and not re.match(PERMISSION_PROOVE_REGEX, supplier_permission):
-                self._regex_error(
-                    key="PermisoProveedor", value=supplier_permission, pattern=PERMISSION_PROOVE_REGEX,
-                    source=f"{national_parent}.PermisoProveedor"
-                    )
+        with self.path.at("Nacional"):
+            for national_index, national_item in enumerate(national):
+                self.path.set_index(national_index)
+                self._apply_rules(section="Nacional", record=national_item)
+                if cfdis := national_item.get("CFDIs"):
+                    suspects = self._suspect_records(section="CFDIs", records=cfdis)
+                    with self.path.at("CFDIs"):
+                        for cfdi_index, cfdi in enumerate(cfdis):
+                            self.path.set_index(cfdi_index)
+                            self._validate_cfdi(cfdi=cfdi, bounds=suspects is None or suspects[cfdi_index])
+
+    def validate_cfdi(self, cfdi: dict, national_index: int, cfdi_index: int) -> None:
+        """Validate one CFDI of the current complement read on its own.\n
+        :param national_index: Index of the Nacional item holding the CFDI.\n
+        :param cfdi_index: Index of the CFDI in its CFDIs list.\n
+        :return: None."""
+        with self.path.at(key="Nacional", index=national_index), self.path.at(key="CFDIs", index=cfdi_index):
+            self._validate_cfdi(cfdi=cfdi)
 
     @exception_wrapper
-    def __validate_national_cfdi(self) -> None:
-        """Validate Nacional Cfdis obj list.\n
+    def _validate_cfdi(self, cfdi: dict, bounds: bool = True) -> None:
+        """Validate Cfdi obj.\n
+        :param bounds: False when vector_bounds already cleared its numeric fields.\n
         :return: None."""
-        if (national := self.current_complement.get("Nacional")) is None:
-            return
-        for national_item in national:
-            national_parent = f"Nacional[{national.index(national_item)}]"
-
-            if cfdis := national_item.get("CFDIs"):
-                for cfdi in cfdis:
-                    cfdi_parent = f"CFDIs[{cfdis.index(cfdi)}]"
-                    cfdi_val = cfdi.get("Cfdi")
-                    cfdi_type = cfdi.get("TipoCfdi")
-                    purchase_price = cfdi.get("PrecioCompra")
-                    consideration = cfdi.get("Contraprestacion")
-                    alm_fee = cfdi.get("CargoPorCapacidadAlmac")
-                    alm_cap_fee = cfdi.get("CargoPorCapacidadAlmac")
-                    alm_use_fee = cfdi.get("CargoPorUsoAlmac")
-                    alm_volum_fee = cfdi.get("CargoVolumetricoAlmac")
-                    discount = cfdi.get("Descuento")
-                    transaction_date = cfdi.get("FechaYHoraTransaccion")
-                    documented_volum = cfdi.get("VolumenDocumentado")
-
-                    if err := DictionaryTypeValidator().validate_dict_type(dict_to_validate=cfdi,
-                                                                        dict_type=complement_cfdis):
-                        type_err = err.get("type_err")
-                        err_message = err.get("err_message")
-                        self.catch_error(err_type=type_err, err_message=err_message,
-                                         source=f"{national_parent}.{cfdi_parent}")
-
-                    if cfdi_val is None:
-                        self._nonfound_key_error(
-                            key="Cfdi", source=f"{national_parent}.{cfdi_parent}"
-                            )
-                    if cfdi_type is None:
-                        self._nonfound_key_error(
-                            key="TipoCfdi", source=f"{national_parent}.{cfdi_parent}"
-                            )
-                    if cfdi_type and cfdi_type not in [cfdi.value for cfdi in CfdiType]:
-                        self._value_error(
-                            key="TipoCfdi", value=cfdi_type,
-                            source=f"{national_parent}.{cfdi_parent}.TipoCfdi"
-                            )
-                    if transaction_date is None:
-                        self._nonfound_key_error(
-                            key="FechaYHoraTransaccion", source=f"{national_parent}.{cfdi_parent}"
-                            )
-                    if documented_volum is None:
-                        self._nonfound_key_error(
-                            key="VolumenDocumentado", source=f"{national_parent}.{cfdi_parent}"
-                            )
-                    if documented_volum:
-                        num_value = documented_volum.get("ValorNumerico")
-                        measure_unit = documented_volum.get("UnidadDeMedida")
-                        if num_value is None:
-                            self._nonfound_key_error(
-                                key="ValorNumerico",
-                                source=f"{national_parent}.{cfdi_parent}.VolumenDocumentado"
-                                )
-                        if measure_unit is None:
-                            self._nonfound_key_error(
-                                key="UnidadDeMedida",
-                                source=f"{national_parent}.{cfdi_parent}.VolumenDocumentado"
-                                )
-                        if num_value and not 0 <= num_value <= 100000000000:
-                            self._min_max_value_error(
-                                key="ValorNumerico", value=num_value, min_val=0, max_val=100000000000,
-                                source=f"{national_parent}.{cfdi_parent}.VolumenDocumentado.ValorNumerico"
-                                )
-                        if measure_unit and not re.match(MEASURE_UNIT, measure_unit):
-                            self._regex_error(
-                                key="UnidadDeMedida", value=measure_unit, pattern=MEASURE_UNIT,
-                                source=f"{national_parent}.{cfdi_parent}.VolumenDocumentado.UnidadDeMedida"
-                                )
-
-                    if cfdi_val and not re.match(CFDI_REGEX, cfdi_val):
-                        self._regex_error(
-                            key="Cfdi", value=cfdi_val, pattern=CFDI_REGEX,
-                            source=f"{national_parent}.{cfdi_parent}.Cfdi"
-                            )
-                    if purchase_price and not 0 <= purchase_price <= 1000000000000:
-                        self._min_max_value_error(
-                            key="PrecioCompra", value=purchase_price, min_val=0, max_val=1000000000000,
-                            source=f"{national_parent}.{cfdi_parent}.PrecioCompra"
-                            )
-                    if consideration and not 1 <= consideration <= 1000000000000:
-                        self._min_max_value_error(
-                            key="Contraprestacion", value=consideration, min_val=0, max_val=1000000000000,
-                            source=f"{national_parent}.{cfdi_parent}.Contraprestacion"
-                            )
-                    if alm_fee and not 1 <= alm_fee <= 1000000000000:
-                        self._min_max_value_error(
-                            key="CargoPorCapacidadAlmac", value=alm_fee, min_val=1, max_val=1000000000000,
-                            source=f"{national_parent}.{cfdi_parent}.CargoPorCapacidadAlmac"
-                            )
-                    if alm_cap_fee and not 1 <= alm_cap_fee <= 1000000000000:
-                        self._min_max_value_error(
-                            key="CargoPorCapacidadAlmac", value=alm_cap_fee, min_val=1, max_val=1000000000000,
-                            source=f"{national_parent}.{cfdi_parent}.CargoPorCapacidadAlmac"
-                            )
-                    if alm_use_fee and not 1 <= alm_use_fee <= 1000000000000:
-                        self._min_max_value_error(
-                            key="CargoPorUsoAlmac", value=alm_use_fee, min_val=1, max_val=1000000000000,
-                            source=f"{national_parent}.{cfdi_parent}.CargoPorUsoAlmac"
-                            )
-                    if alm_volum_fee and not 1 <= alm_volum_fee <= 1000000000000:
-                        self._min_max_value_error(
-                            key="CargoVolumetricoAlmac", value=alm_volum_fee, min_val=1, max_val=1000000000000,
-                            source=f"{national_parent}.{cfdi_parent}.CargoVolumetricoAlmac"
-                            )
-                    if discount and not 1 <= discount <= 1000000000000:
-                        self._min_max_value_error(
-                            key="Descuento", value=discount, min_val=1, max_val=1000000000000,
-                            source=f"{national_parent}.{cfdi_parent}.Descuento"
-                            )
-                    if transaction_date and not re.match(UTC_FORMAT_REGEX, transaction_date):
-                        self._regex_error(
-                            key="FechaYHoraTransaccion", value=transaction_date, pattern=UTC_FORMAT_REGEX,
-                            source=f"{national_parent}.{cfdi_parent}.FechaYHoraTransaccion"
-                            )
+        if self.totals is not None:
+            self.totals.add(record=cfdi)
+        if self.cfdi_index is not None and self.cfdi_scope is not None and isinstance(cfdi, dict):
+            self._index_cfdi(uuid=cfdi.get("Cfdi"))
+        self._apply_rules(section="CFDIs", record=cfdi, bounds=bounds)
+
+    def _index_cfdi(self, uuid: object) -> None:
+        """Add uuid to the report index, repeated UUIDs are reported once the report is read.\n
+        :return: None."""
+        product_index, section = self.cfdi_scope
+        complement_index, national_index, cfdi_index = self.path.indices
+        self.cfdi_index.add(
+            uuid=uuid, product_index=product_index, section=section, complement_index=complement_index,
+            national_index=national_index, cfdi_index=cfdi_index,
+            )
 
     @exception_wrapper
     def _validate_extranjero(self) -> None:
-        """Validate Extrajero objs.\n
+        """Validate Extranjero objs list and their Pedimentos.\n
         :return: None."""
         if (foreign := self.current_complement.get("Extranjero")) is None:
             return
-        import_permission = foreign.get("PermisoImportacion")
-        ped_parent = "Pedimentos"
-
-        if err := DictionaryTypeValidator().validate_dict_type(dict_to_validate=foreign, dict_type=complement_foreign):
-            type_err = err.get("type_err")
-            err_message = err.get("err_message")
-            self.catch_error(err_type=type_err, err_message=err_message, source=ped_parent)
-        if import_permission is None:
-            self._nonfound_key_error(key="PermisoImportacion")
-
-        if import_permission and not re.match(IMPORT_PERMISSION_REGEX, import_permission):
-            self._regex_error(
-                key="PermisoImportacion", value=import_permission, pattern=IMPORT_PERMISSION_REGEX,
-                source=f"{ped_parent}.PermisoImportacion"
-                )
+
+        with self.path.at("Extranjero"):
+            for foreign_index, foreign_item in enumerate(foreign):
+                self.path.set_index(foreign_index)
+                self._apply_rules(section="Extranjero", record=foreign_item)
+                if pedimentos := foreign_item.get("Pedimentos"):
+                    suspects = self._suspect_records(section="Pedimentos", records=pedimentos)
+                    with self.path.at("Pedimentos"):
+                        for pedimento_index, pedimento in enumerate(pedimentos):
+                            self.path.set_index(pedimento_index)
+                            self._validate_pedimento(
+                                pedimento=pedimento, bounds=suspects is None or suspects[pedimento_index],
+                                )
 
     @exception_wrapper
-    def __validate_extranjero_pedimentos(self) -> None:
-        """Validate Extrajero Peidmento objs.\n
+    def _validate_pedimento(self, pedimento: dict, bounds: bool = True) -> None:
+        """Validate Pedimento obj.\n
+        :param bounds: False when vector_bounds already cleared its numeric fields.\n
         :return: None."""
-        if (foreign := self.current_complement.get("Extranjero")) is None:
-            return
-        if (pedimentos := foreign[0].get("Pedimentos")) is None:
-            return
-
-        for fore in foreign:
-            if err := DictionaryTypeValidator().validate_dict_type(dict_to_validate=fore,
-                                                                    dict_type=complement_foreign):
-                type_err = err.get("type_err")
-                err_message = err.get("err_message")
-                self.catch_error(err_type=type_err, err_message=err_message)
-                return
-            pedimento = fore.get("Pedimentos")
-
-            intern_point = pedimento.get("PuntoDeInternacion")
-            origin_country = pedimento.get("PaisOrigen")
-            aduanal_transp = pedimento.get("MedioDeTransEntraAduana")
-            aduanal_pedimento = pedimento.get("PedimentoAduanal")
-            incoterm = pedimento.get("Incoterms")
-            import_price = pedimento.get("PrecioDeImportacion")
-            documented_volume = pedimento.get("VolumenDocumentado")
-
-            if err := DictionaryTypeValidator().validate_dict_type(dict_to_validate=pedimento,
-                                                                dict_type=compl_foreign_pedimentos):
-                type_err = err.get("type_err")
-                err_message = err.get("err_message")
-                self.catch_error(err_type=type_err, err_message=err_message)
-            if intern_point is None:
-                self._nonfound_key_error(key="PuntoDeInternacion")
-            if origin_country is None:
-                self._nonfound_key_error(key="PaisOrigen")
-            if aduanal_pedimento is None:
-                self._nonfound_key_error(key="PedimentoAduanal")
-            if incoterm is None:
-                self._nonfound_key_error(key="Incoterms")
-            if import_price is None:
-                self._nonfound_key_error(key="PrecioDeImportacion")
-            if documented_volume is None:
-                self._nonfound_key_error(key="VolumenDocumentado")
-
-            if documented_volume:
-                num_value = documented_volume.get("ValorNumerico")
-                measure_unit = documented_volume.get("UnidadDeMedida")
-                if num_value is None:
-                    self._nonfound_key_error(key="ValorNumerico")
-                if measure_unit is None:
-                    self._nonfound_key_error(key="UnidadDeMedida")
-                if num_value and not 0 <= num_value <= 100000000000:
-                    self._min_max_value_error(
-                        key="ValorNumerico", value=num_value, min_val=0, max_val=100000000000,
-                        )
-                if measure_unit and not re.match(MEASURE_UNIT, measure_unit):
-                    self._regex_error(
-                        key="UnidadDeMedida", value=measure_unit, pattern=MEASURE_UNIT,
-                        )
-
-            if intern_point and not re.match(INTERN_SPOT_REGEX, intern_point):
-                self._regex_error(
-                    key="PuntoDeInternacion", value=intern_point, pattern=INTERN_SPOT_REGEX,
-                    )
-            if intern_point and not 2 <= intern_point <= 3:
-                self._min_max_value_error(
-                    key="PuntoDeInternacion", value=intern_point, min_val=2, max_val=3,
-                    )
-            if origin_country and origin_country not in CountryCode:
-                self._value_error(
-                    key="PaisOrigen", value=origin_country,
-                    )
-            if aduanal_transp and aduanal_transp not in [item.value for item in AduanaEntrance]:
-                self._value_error(
-                    key="MedioDeTransporteAduana", value=aduanal_transp,
-                    )
-            if aduanal_pedimento and not re.match(ADUANAL_PEDIMENTO, aduanal_pedimento):
-                self._regex_error(
-                    key="PedimentoAduanal", value=aduanal_pedimento, pattern=ADUANAL_PEDIMENTO,
-                    )
-            if aduanal_pedimento and len(aduanal_pedimento) != 21:
-                self._longitud_error(
-                    key="PedimentoAduanal", value=aduanal_pedimento, min_long=21, max_long=21,
-                    )
-            if incoterm and incoterm not in IncotermCode.__members__:
-                self._value_error(
-                    key="Incoterms", value=incoterm
-                    )
-            if import_price and not 0 <= import_price <= 100000000000:
-                self._min_max_value_error(
-                    key="PrecioDeImportacion", value=import_price, min_val=0, max_val=100000000000,
-                    )
+        if self.totals is not None:
+            self.totals.add(record=pedimento, pedimento=True)
+        self._apply_rules(section="Pedimentos", record=pedimento, bounds=bounds)
 
     @exception_wrapper
     def _validate_aclaracion(self) -> None:
@@ -534,6 +195,23 @@ class ComplementBuilder:
                 source="Aclaracion"
                 )
 
+    def _apply_rules(self, section: str, record: dict, bounds: bool = True) -> None:
+        """Store the errors of the rule table of section over record.\n
+        :param section: Path of the record inside the complement, e.g. 'TerminalAlmYDist.Transporte'.\n
+        :param bounds: False skips numeric ranges and definitions.\n
+        :return: None."""
+        if (check := compiled_rules(self.rules_type, bounds=bounds).get(section)) is None:
+            return
+        for err_type, err_message, source in check(record):
+            self.catch_error(err_type=err_type, err_message=err_message, source=source)
+
+    def _suspect_records(self, section: str, records: list) -> Optional[List[bool]]:
+        """Records of a list that may break a numeric bound of section, see vector_bounds.\n
+        :return: One flag per record or None to check every record in full."""
+        if not isinstance(records, list):
+            return None
+        return suspect_records(records=records, rules=COMPLEMENT_RULES[self.rules_type].get(section))
+
     def _current_complement(self) -> dict:
         return self.current_complement[self._comp_index]
 
@@ -541,7 +219,10 @@ class ComplementBuilder:
         return self._comp_index < self.comp_len
 
     def _update_index(self) -> None:
+        advance("complements")
+        advance("cfdis", count_cfdis(self.current_complement))
         self._comp_index += 1
+        self.path.set_index(self.offset + self._comp_index)
         if self._next_complement():
             self.current_complement = self.complement[self._comp_index]
 
@@ -555,7 +236,7 @@ class ComplementBuilder:
             "type_error": err_type.__name__, 
             "error": err_message,
             # "source": source,
-            "source": f"Complemento[{self.complement.index(self.current_complement)}].{source}"
+            "source": self.path.render(source)
             }
 
     def _nonfound_key_error(
@@ -569,7 +250,7 @@ class ComplementBuilder:
         :return: None."""
         self.catch_error(
             err_type=ClaveError,
-            err_message=f"Error: Elemento '{key}' no declarado.",
+            err_message=NONFOUND_MESSAGE.format(key=key),
             source=source
         )
 
@@ -590,7 +271,7 @@ class ComplementBuilder:
         :return: None."""
         self.catch_error(
             err_type=ValorMinMaxError,
-            err_message=f"Error: clave {key} con valor {value} no tiene el valor min {min_val} ó max {max_val}.",
+            err_message=MIN_MAX_MESSAGE.format(key=key, value=value, min_val=min_val, max_val=max_val),
             source=source
         )
 
@@ -611,7 +292,7 @@ class ComplementBuilder:
         :return: None."""
         self.catch_error(
             err_type=LongitudError,
-            err_message=f"Error: clave {key} con valor {value} no tiene una longitud min {min_long} ó max {max_long}.",
+            err_message=LONGITUD_MESSAGE.format(key=key, value=value, min_long=min_long, max_long=max_long),
             source=source
         )
 
@@ -628,7 +309,7 @@ class ComplementBuilder:
         :return: None."""
         self.catch_error(
             err_type=ValorError,
-            err_message=f"Error: valor '{value}' en clave {key} no válido.",
+            err_message=VALUE_MESSAGE.format(key=key, value=value),
             source=source
         )
 
@@ -647,7 +328,7 @@ class ComplementBuilder:
         :return: None."""
         self.catch_error(
             err_type=RegexError,
-            err_message=f"Error: clave {key} con valor {value} no cumple con el patrón {pattern}",
+            err_message=REGEX_MESSAGE.format(key=key, value=value, pattern=pattern),
             source=source
         )
 
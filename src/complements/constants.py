@@ -1,19 +1,76 @@
 """This module handle constants."""
+from src.utils.regex_registry import regex
 
 complement_type = ["Almacenamiento", "CDLR", "Comercializacion",
                    "Distribucion", "Expendio", "Extraccion", "Refinacion", "Transporte"]
 
-TRANSPORT_PERM_REGEX = r"^(PL/[0-9]{1,5}/TRA/OM/[0-9]{4})|(PL/[0-9]{1,5}/TR A/DUC/[0-9]{4})|(PL/[0-9]{1,5}/TRA/TM/[0-9]{4})|(P Q/[0-9]{1,5}/TRA/DUC/[0-9]{4})|(G/[0-9]{1,5}/TUP/[0-9]{4})|(G/[0-9]{1,5}/SAB/[0-9]{4})|(G/[0-9]{1,5}/TRA/OM/[0-9]{4})|(P/[0-9]{1,5}/TRA/TM/[0-9]{4})|(P/[0-9]{1,5}/TRA/OM/[0-9]{4})|(G/[0-9]{1,5}/TRA/[0-9]{4})|(GN/[0-9]{1,5}/P/TRA/DUC/[0-9]{4})|(GN/[0-9]{1,5}/TRA/DUC/[0-9]{4})|(P/[0-9]{1,5}/TRA/DUC/[0-9]{4})|(P/[0-9]{1,5}/P/TRA/DUC/[0-9]{4})|(LP/[0-9]{1,5}/TRA/DUC/[0-9]{4})|(G/[0-9]{1,5}/LPT/[0-9]{4})|(LP/[0-9]{1,5}/TRA/[0-9]{4})$"
-TRANSPORT_PERM_EXO_REGEX = r"^(PL/[0-9]{1,5}/TRA/OM/[0-9]{4})|(PL/[0-9]{1,5}/TR A/DUC/[0-9]{4})|(PL/[0-9]{1,5}/TRA/TM/[0-9]{4})|(P Q/[0-9]{1,5}/TRA/DUC/[0-9]{4})|(G/[0-9]{1,5}/TUP/[0-9]{4})|(G/[0-9]{1,5}/SAB/[0-9]{4})|(G/[0-9]{1,5}/TRA/OM/[0-9]{4})|(G/[0-9]{1,5}/TRA/[0-9]{4})|(GN/[0-9]{1,5}/P/TRA/DUC/[0-9]{4})|(GN/[0-9]{1,5}/TRA/DUC/[0-9]{4})$"
-TRANSP_PERM_CDLRGN_REGEX = r"^(G/[0-9]{1,5}/TUP/[0-9]{4})|(G/[0-9]{1,5}/SAB/[0-9]{4})|(G/[0-9]{1,5}/TRA/OM/[0-9]{4})|(G/[0-9]{1,5}/TRA/[0-9]{4})|(GN/[0-9]{1,5}/P/TRA/DUC/[0-9]{4})|(GN/[0-9]{1,5}/TRA/DUC/[0-9]{4})|(LP/[0-9]{1,5}/TRA/DUC/[0-9]{4})$"
-PERMISSION_PROOVE_REGEX = r"^(H/[0-9]{1,5}/COM/[0-9]{4})|(PL/[0-9]{1,5}/DIS/OM/[0-9]{4})|(G/[0-9]{1,5}/COM/GN/[0-9]{4})|(G/[0-9]{1,5}/COM/PETRO/[0-9]{4})|(G/[0-9]{1,5}/COM/CEE/[0-9]{4})|(G/[0-9]{1,5}/DIS/[0-9]{4})|(G/[0-9]{1,5}/DIS/OM/[0-9]{4})|(LP/[0-9]{1,5}/DIST/AUT/[0-9]{4})|(LP/[0-9]{1,5}/DIST/PLA/[0-9]{4})|(LP/[0-9]{1,5}/DIST/DUC/[0-9]{4})|(G/[0-9]{1,5}/LPD/[0-9]{4})|(LP/[0-9]{1,5}/COM/[0-9]{4})|(LP/[0-9]{1,5}/DIST/REP/[0-9]{4})|(PL/[0-9]{1,5}/DIS/DUC/[0-9]{4})$"
-PERMISSION_PROOVE_CLIENT_REGEX = r"(H/[0-9]{1,5}/COM/[0-9]{4})|(PL/[0-9]{1,5}/EXP/ES/[0-9]{4})|(PL/[0-9]{1,5}/EXP/ES/MM/[0-9]{4})|(PL/[0-9]{1,5}/EXP/ESA/[0-9]{4})|(PL/[0-9]{1,5}/DIS/OM/[0-9]{4})|(H/[0-9]{1,5}/COM/[0-9]{4})|(PL/[0-9]{1,5}/EXP/AE/[0-9]{4})|(G/[0-9]{1,5}/COM/GN/[0-9]{4})|(G/[0-9]{1,5}/COM/PETRO/[0-9]{4})|(G/[0-9]{1,5}/COM/CEE/[0-9]{4})|(G/[0-9]{1,5}/DIS/[0-9]{4})|(G/[0-9]{1,5}/DIS/OM/[0-9]{4})|(G/[0-9]{1,5}/EXP/ES/FE/[0-9]{4})|(G/[0-9]{1,5}/EXP/ES/MM/[0-9]{4})|(G/[0-9]{1,5}/LICUE/[0-9]{4})|(G/[0-9]{1,5}/REG/[0-9]{4})|(LP/[0-9]{1,5}/DIST/AUT/[0-9]{4})|(LP/[0-9]{1,5}/DIST/PLA/[0-9]{4})|(LP/[0-9]{1,5}/DIST/DUC/[0-9]{4})|(G/[0-9]{1,5}/LPD/[0-9]{4})|(LP/[0-9]{1,5}/EXP/ES/[0-9]{4})|(LP/[0-9]{1,5}/EXP/AUT/[0-9]{4})|(LP/[0-9]{1,5}/COM/[0-9]{4})|(LP/[0-9]{1,5}/DIST/REP/[0-9]{4})|(PL/[0-9]{1,5}/EXP/ESA/MM/[0-9]{4})|(PL/[0-9]{1,5}/DIS/DUC/[0-9]{4})|(SENER-REF-[0-9]{1,3}-[0-9]{4})|(SENER-TP-[0-9]{1,3}-[0-9]{4})|(SENER-CPG-[0-9]{1,3}-[0-9]{4})$"
-PERMISSION_PROOVE_CLIENT_DIS_REGEX = r"(H/[0-9]{1,5}/COM/[0-9]{4})|(PL/[0-9]{1,5}/EXP/ES/[0-9]{4})|(PL/[0-9]{1,5}/EXP/ES/MM/[0-9]{4})|(PL/[0-9]{1,5}/EXP/ESA/[0-9]{4})|(H/[0-9]{1,5}/COM/[0-9]{4})|(PL/[0-9]{1,5}/EXP/AE/[0-9]{4})|(G/[0-9]{1,5}/COM/GN/[0-9]{4})|(G/[0-9]{1,5}/COM/PETRO/[0-9]{4})|(G/[0-9]{1,5}/COM/CEE/[0-9]{4})|(G/[0-9]{1,5}/ EXP/ES/FE/[0-9]{4})|(G/[0-9]{1,5}/EXP/ES/MM/[0-9]{4})|(G/[0-9]{1,5}/LICUE/[0-9]{4})|(G/[0-9]{1,5}/REG/[0-9]{4})|(LP/[0-9]{1,5}/EXP/ES/[0-9]{4})|(LP/[0-9]{1,5}/EXP/AUT/[0-9]{4})|(LP/[0-9]{1,5}/COM/[0-9]{4})|(PL/[0-9]{1,5}/EXP/ESA/MM/[0-9]{4})|(SENER-R EF-[0-9]{1,3}-[0-9]{4})|(SENER-TP-[0-9]{1,3}-[0-9]{4})|(SENER-CPG-[0-9]{1,3}-[0-9]{4})$"
-PERMISSION_PROOVE_CLIENT_EXO_REGEX = r"(H/[0-9]{1,5}/COM/[0-9]{4})|(PL/[0-9]{1,5}/DIS/OM/[0-9]{4})|(G/[0-9]{1,5}/COM/GN/[0-9]{4})|(G/[0-9]{1,5}/DIS/[0-9]{4})|(G/[0-9]{1,5}/DIS/OM/[0-9]{4})|(LP/[0-9]{1,5}/DIST/AUT/[0-9]{4})|(LP/[0-9]{1,5}/DIST/PLA/[0-9]{4})|(LP/[0-9]{1,5}/DIST/DUC/[0-9]{4})|(G/[0-9]{1,5}/LPD/[0-9]{4})|(LP/[0-9]{1,5}/COM/ [0-9]{4})|(LP/[0-9]{1,5}/DIST/REP/[0-9]{4})|(PL/[0-9]{1,5}/DIS/DUC/[0-9]{4})|(SENER-REF-[0-9]{1,3}-[0-9]{4})$"
-PERMISSION_ALM_DIST_REGEX = r"^(PL/[0-9]{1,5}/DIS/OM/[0-9]{4})|(PL/[0-9]{1,5}/ALM/[0-9]{4})|(PQ/[0-9]{1,5}/ALM/[0-9]{4})|(PL/[0-9]{1,5}/ALM/AE/[0-9]{4})|(G/[0-9]{1,5}/ALM/[0-9]{4})|(P/[0-9]{1,5}/ALM/[0-9]{4})|(LP/[0-9]{1,5}/DIST/AUT/[0-9]{4})|(LP/[0-9]{1,5}/DIST/PLA/[0-9]{4})|(LP/[0-9]{1,5}/DIST/DUC/[0-9]{4})|(G/[0-9]{1,5}/LPD/[0-9]{4})|(LP/[0-9]{1,5}/ALM/[0-9]{4})|(G/[0-9]{1,5}/LPA/[0-9]{4})|(LP/[0-9]{1,5}/DIST/REP/[0-9]{4})|(PL/[0-9]{1,5}/DIS/DUC/[0-9]{4})$"
-PERMISSION_ALM_CDLRGN_REGEX = r"^G/[0-9]{1,5}/ALM/[0-9]{4}$"
-PERMISSION_ALM_TRANSP_REGEX = r"(PL/[0-9]{1,5}/DIS/OM/[0-9]{4})|(PL/[0-9]{1,5}/AL M/[0-9]{4})|(PQ/[0-9]{1,5}/ALM/[0-9]{4})|(PL/[0-9]{1,5}/ALM/AE/[0-9]{4})|(G/[0-9]{1,5}/ALM/[0-9]{4})|(P/[0-9]{1,5}/ALM/[0-9]{4})|(LP/[0-9]{1,5}/DIST/AUT/[0-9]{4})|(LP/[0-9]{1,5}/DIST/PLA/[0-9]{4})|(LP /[0-9]{1,5}/DIST/DUC/[0-9]{4})|(G/[0-9]{1,5}/LPD/[0-9]{4})|(LP/[0-9]{1,5}/ALM/[0-9]{4})|(G/[0-9]{1,5}/LPA/[0-9]{4})|(LP/[0-9]{1,5}/DIST/REP/[0-9]{4})|(PL/[0-9]{1,5}/DIS/DUC/[0-9]{4})$"
-PERMISSION_ALM_REGEX = r"^(PL/[0-9]{1,5}/ALM/[0-9]{4})|(PQ/[0-9]{1,5}/ALM/[0-9]{4})|(PL/[0-9]{1,5}/ALM/AE/[0-9]{4})|(G/[0-9]{1,5}/ALM/[0-9]{4})|(P/[0-9]{1,5}/ALM/[0-9]{4})|(LP/[0-9]{1,5}/ALM/[0-9]{4})|(G/[0-9]{1,5}/LPA/[0-9]{4})$"
+# Plantillas de números de permiso por familia: {num} son 1 a 5 dígitos, {num3} 1 a 3 y {year} 4.
+PERMIT_TEMPLATES = {
+    "TRANSPORT_PERM": (
+        "PL/{num}/TRA/OM/{year}", "PL/{num}/TRA/DUC/{year}", "PL/{num}/TRA/TM/{year}", "PQ/{num}/TRA/DUC/{year}",
+        "G/{num}/TUP/{year}", "G/{num}/SAB/{year}", "G/{num}/TRA/OM/{year}", "P/{num}/TRA/TM/{year}",
+        "P/{num}/TRA/OM/{year}", "G/{num}/TRA/{year}", "GN/{num}/P/TRA/DUC/{year}", "GN/{num}/TRA/DUC/{year}",
+        "P/{num}/TRA/DUC/{year}", "P/{num}/P/TRA/DUC/{year}", "LP/{num}/TRA/DUC/{year}", "G/{num}/LPT/{year}",
+        "LP/{num}/TRA/{year}",
+        ),
+    "TRANSPORT_PERM_EXO": (
+        "PL/{num}/TRA/OM/{year}", "PL/{num}/TRA/DUC/{year}", "PL/{num}/TRA/TM/{year}", "PQ/{num}/TRA/DUC/{year}",
+        "G/{num}/TUP/{year}", "G/{num}/SAB/{year}", "G/{num}/TRA/OM/{year}", "G/{num}/TRA/{year}",
+        "GN/{num}/P/TRA/DUC/{year}", "GN/{num}/TRA/DUC/{year}",
+        ),
+    "TRANSP_PERM_CDLRGN": (
+        "G/{num}/TUP/{year}", "G/{num}/SAB/{year}", "G/{num}/TRA/OM/{year}", "G/{num}/TRA/{year}",
+        "GN/{num}/P/TRA/DUC/{year}", "GN/{num}/TRA/DUC/{year}", "LP/{num}/TRA/DUC/{year}",
+        ),
+    "PERMISSION_PROOVE": (
+        "H/{num}/COM/{year}", "PL/{num}/DIS/OM/{year}", "G/{num}/COM/GN/{year}", "G/{num}/COM/PETRO/{year}",
+        "G/{num}/COM/CEE/{year}", "G/{num}/DIS/{year}", "G/{num}/DIS/OM/{year}", "LP/{num}/DIST/AUT/{year}",
+        "LP/{num}/DIST/PLA/{year}", "LP/{num}/DIST/DUC/{year}", "G/{num}/LPD/{year}", "LP/{num}/COM/{year}",
+        "LP/{num}/DIST/REP/{year}", "PL/{num}/DIS/DUC/{year}",
+        ),
+    "PERMISSION_PROOVE_CLIENT": (
+        "H/{num}/COM/{year}", "PL/{num}/EXP/ES/{year}", "PL/{num}/EXP/ES/MM/{year}", "PL/{num}/EXP/ESA/{year}",
+        "PL/{num}/DIS/OM/{year}", "PL/{num}/EXP/AE/{year}", "G/{num}/COM/GN/{year}", "G/{num}/COM/PETRO/{year}",
+        "G/{num}/COM/CEE/{year}", "G/{num}/DIS/{year}", "G/{num}/DIS/OM/{year}", "G/{num}/EXP/ES/FE/{year}",
+        "G/{num}/EXP/ES/MM/{year}", "G/{num}/LICUE/{year}", "G/{num}/REG/{year}", "LP/{num}/DIST/AUT/{year}",
+        "LP/{num}/DIST/PLA/{year}", "LP/{num}/DIST/DUC/{year}", "G/{num}/LPD/{year}", "LP/{num}/EXP/ES/{year}",
+        "LP/{num}/EXP/AUT/{year}", "LP/{num}/COM/{year}", "LP/{num}/DIST/REP/{year}", "PL/{num}/EXP/ESA/MM/{year}",
+        "PL/{num}/DIS/DUC/{year}", "SENER-REF-{num3}-{year}", "SENER-TP-{num3}-{year}", "SENER-CPG-{num3}-{year}",
+        ),
+    "PERMISSION_PROOVE_CLIENT_DIS": (
+        "H/{num}/COM/{year}", "PL/{num}/EXP/ES/{year}", "PL/{num}/EXP/ES/MM/{year}", "PL/{num}/EXP/ESA/{year}",
+        "PL/{num}/EXP/AE/{year}", "G/{num}/COM/GN/{year}", "G/{num}/COM/PETRO/{year}", "G/{num}/COM/CEE/{year}",
+        "G/{num}/EXP/ES/FE/{year}", "G/{num}/EXP/ES/MM/{year}", "G/{num}/LICUE/{year}", "G/{num}/REG/{year}",
+        "LP/{num}/EXP/ES/{year}", "LP/{num}/EXP/AUT/{year}", "LP/{num}/COM/{year}", "PL/{num}/EXP/ESA/MM/{year}",
+        "SENER-REF-{num3}-{year}", "SENER-TP-{num3}-{year}", "SENER-CPG-{num3}-{year}",
+        ),
+    "PERMISSION_PROOVE_CLIENT_EXO": (
+        "H/{num}/COM/{year}", "PL/{num}/DIS/OM/{year}", "G/{num}/COM/GN/{year}", "G/{num}/DIS/{year}",
+        "G/{num}/DIS/OM/{year}", "LP/{num}/DIST/AUT/{year}", "LP/{num}/DIST/PLA/{year}", "LP/{num}/DIST/DUC/{year}",
+        "G/{num}/LPD/{year}", "LP/{num}/COM/{year}", "LP/{num}/DIST/REP/{year}", "PL/{num}/DIS/DUC/{year}",
+        "SENER-REF-{num3}-{year}",
+        ),
+    "PERMISSION_ALM_DIST": (
+        "PL/{num}/DIS/OM/{year}", "PL/{num}/ALM/{year}", "PQ/{num}/ALM/{year}", "PL/{num}/ALM/AE/{year}",
+        "G/{num}/ALM/{year}", "P/{num}/ALM/{year}", "LP/{num}/DIST/AUT/{year}", "LP/{num}/DIST/PLA/{year}",
+        "LP/{num}/DIST/DUC/{year}", "G/{num}/LPD/{year}", "LP/{num}/ALM/{year}", "G/{num}/LPA/{year}",
+        "LP/{num}/DIST/REP/{year}", "PL/{num}/DIS/DUC/{year}",
+        ),
+    "PERMISSION_ALM_CDLRGN": (
+        "G/{num}/ALM/{year}",
+        ),
+    "PERMISSION_ALM_TRANSP": (
+        "PL/{num}/DIS/OM/{year}", "PL/{num}/ALM/{year}", "PQ/{num}/ALM/{year}", "PL/{num}/ALM/AE/{year}",
+        "G/{num}/ALM/{year}", "P/{num}/ALM/{year}", "LP/{num}/DIST/AUT/{year}", "LP/{num}/DIST/PLA/{year}",
+        "LP/{num}/DIST/DUC/{year}", "G/{num}/LPD/{year}", "LP/{num}/ALM/{year}", "G/{num}/LPA/{year}",
+        "LP/{num}/DIST/REP/{year}", "PL/{num}/DIS/DUC/{year}",
+        ),
+    "PERMISSION_ALM": (
+        "PL/{num}/ALM/{year}", "PQ/{num}/ALM/{year}", "PL/{num}/ALM/AE/{year}", "G/{num}/ALM/{year}",
+        "P/{num}/ALM/{year}", "LP/{num}/ALM/{year}", "G/{num}/LPA/{year}",
+        ),
+    }
+
 ADUANAL_PEDIMENTO = r"^[0-9]{2} (0[1-2]|0[5-8]|1[1-2]|14|1[6-9]|20|2[2-8]|3[0-1]|3[3-4]|3[7-9]|40|4[2-4]|4[6-8]|5[0-3]|6[4-5]|67|73|75|8[0-4]) [0-9]{4} [0-9](?!0{6})[0-9]{6}$"
 INTERN_SPOT_REGEX = r"^(0[1-2]|0[5-8]|1[1-2]|14|1[6-9]|20|2[2-8]|3[0-1]|3[3-4]|3[7-9]|40|4[2-4]|4[6-8]|5[0-3]|6[4-5]|67|73|75|8[0-4])([0-7])?$"
 FOLIO_CERTIFIED_REGEX = r"^([A-ZÑ]|\&){3}[0-9]{2}(0[1-9]|1[0-2])([12][0-9]|0[1-9]|3[01])[A-Z0-9]{3}[0-9]{5}[12][0-9]{3}$"
@@ -25,3 +82,8 @@ DATE_REGEX = r"^\d{4}-(0[1-9]|1[0-2])-(0[1-9]|[12][0-9]|3[01])$"
 UTC_FORMAT_REGEX = r"^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}[+-]\d{2}:\d{2}$"
 IMPORT_PERMISSION_REGEX = r"^[a-zA-Z0-9]{4}C[a-zA-Z0-9]{9}$"
 MEASURE_UNIT = r"^UM0[1-4]$"
+
+regex.register_all(globals(), (
+    "ADUANAL_PEDIMENTO", "INTERN_SPOT_REGEX", "FOLIO_CERTIFIED_REGEX", "FOLIO_DICTAMEN_REGEX", "RFC_PERSONA_MORAL_REGEX",
+    "CFDI_REGEX", "RFC_REGEX", "DATE_REGEX", "UTC_FORMAT_REGEX", "IMPORT_PERMISSION_REGEX", "MEASURE_UNIT",
+    ))
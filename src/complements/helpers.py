@@ -1,10 +1,13 @@
-from typing import TypeVar
+from typing import Dict, Optional, Tuple, TypeVar
 
 from src.complements import (CDLRGNComplement, ComercializationComplement,
                              ComplementBuilder, DistributionComplement,
                              ExpenditureComplement, StorageComplement,
                              TransportComplement)
+from src.complements.cfdi_index import CfdiIndex
+from src.complements.totals import DocumentTotals
 from src.utils.logger import logger
+from src.utils.progress import ProgressTracker, tracking
 
 ComplementType = TypeVar("ComplementType", bound="ComplementBuilder")
 
@@ -12,8 +15,10 @@ ComplementType = TypeVar("ComplementType", bound="ComplementBuilder")
 logging = logger()
 
 
-def complement_builder(complement_data: dict, complement_type: str) -> ComplementType:
-    """Complement builder objects."""
+def complement_builder(complement_data: dict, complement_type: str, offset: int = 0) -> ComplementType:
+    """Complement builder objects.
+
+    :param offset: Index of the first given complement in its Complemento list."""
     try:
         complement_map = {
             "Almacenamiento": StorageComplement,
@@ -25,6 +30,29 @@ def complement_builder(complement_data: dict, complement_type: str) -> Complemen
         }
 
         complement_class = complement_map.get(complement_type)
-        return complement_class(complement_dict=complement_data, complement_type=complement_type)
+        return complement_class(complement_dict=complement_data, complement_type=complement_type, offset=offset)
     except Exception as exc:
         logging.warning(f"Error al crear el complemento: {exc}")
+
+
+def validate_complement_task(
+        complement: dict,
+        complement_type: str,
+        offset: int,
+        cfdi_scope: Tuple[int, str],
+        index_cfdis: bool,
+        with_totals: bool,
+    ) -> Tuple[list, Optional[CfdiIndex], Optional[DocumentTotals], Dict[str, int]]:
+    """Validate one Complemento list item in a worker, as MonthlyVolumeReportValidator does
+    for the whole list.\n
+    :param offset: Index of the item in its Complemento list.\n
+    :param cfdi_scope: (product index, section) of the list.\n
+    :param index_cfdis: True to return the CFDI index of the item.\n
+    :param with_totals: True to return the document totals of the item.\n
+    :return: (errors, CFDI index or None, totals or None, progress counters)."""
+    complement_obj = complement_builder(complement_data=[complement], complement_type=complement_type, offset=offset)
+    complement_obj.totals = DocumentTotals(complement_type=complement_type, section=cfdi_scope[1]) if with_totals else None
+    complement_obj.cfdi_index, complement_obj.cfdi_scope = CfdiIndex() if index_cfdis else None, cfdi_scope
+    with tracking(ProgressTracker(on_update=lambda counts: None, interval=float("inf"))) as tracker:
+        complement_obj.validate_complemento()
+    return complement_obj.get_error_list(), complement_obj.cfdi_index, complement_obj.totals, tracker.counts
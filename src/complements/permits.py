@@ -0,0 +1,81 @@
+"""This module parses permit numbers against the templates of PERMIT_TEMPLATES."""
+from types import SimpleNamespace
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from src.complements.constants import PERMIT_TEMPLATES
+
+# Longitudes válidas de cada campo numérico de las plantillas.
+_FIELD_LENGTHS = {"{num}": range(1, 6), "{num3}": range(1, 4), "{year}": (4,)}
+_FIELD_PATTERNS = {"{num}": "[0-9]{1,5}", "{num3}": "[0-9]{1,3}", "{year}": "[0-9]{4}"}
+
+Shape = Tuple[str, ...]
+
+
+def permit_shape(value: str) -> Optional[Shape]:
+    """Split a permit number on '/' (or '-' when it has no '/') and replace every run
+    of digits by its length, e.g. 'H/123/COM/2020' gives ('/', 'H', '#3', 'COM', '#4').\n
+    :return: Shape or None if value is not a string."""
+    if not isinstance(value, str):
+        return None
+    sep = "/" if "/" in value else "-"
+    return (sep, *(
+        f"#{len(segment)}" if segment.isascii() and segment.isdigit() else segment
+        for segment in value.split(sep)
+        ))
+
+
+def _template_shapes(template: str) -> Iterable[Shape]:
+    sep = "/" if "/" in template else "-"
+    shapes: List[Tuple[str, ...]] = [(sep,)]
+    for segment in template.split(sep):
+        lengths = _FIELD_LENGTHS.get(segment)
+        if lengths is None:
+            shapes = [shape + (segment,) for shape in shapes]
+        else:
+            shapes = [shape + (f"#{length}",) for shape in shapes for length in lengths]
+    return shapes
+
+
+def _template_pattern(template: str) -> str:
+    for field, pattern in _FIELD_PATTERNS.items():
+        template = template.replace(field, pattern)
+    return template
+
+
+_SHAPES: Dict[Shape, str] = {
+    shape: template
+    for templates in PERMIT_TEMPLATES.values()
+    for template in templates
+    for shape in _template_shapes(template)
+    }
+
+
+class PermitMatcher:
+    """Permit family callable as ``matcher(value)``: a dict lookup of the value shape, it
+    returns the matched template or None, like a regex match object in a condition.
+
+    ``pattern`` renders the family as a regular expression for error messages."""
+    __slots__ = ("family", "templates", "pattern")
+
+    def __init__(self, family: str, templates: Iterable[str]) -> None:
+        self.family = family
+        self.templates: FrozenSet[str] = frozenset(templates)
+        self.pattern = "^(" + "|".join(_template_pattern(template) for template in templates) + ")$"
+
+    def __call__(self, value: str) -> Optional[str]:
+        template = _SHAPES.get(permit_shape(value))
+        return template if template in self.templates else None
+
+
+def permit_families(value: str) -> List[str]:
+    """Families whose templates accept the given permit number.\n
+    :return: List[str]."""
+    template = _SHAPES.get(permit_shape(value))
+    if template is None:
+        return []
+    return [family for family, templates in PERMIT_TEMPLATES.items() if template in templates]
+
+
+permits = SimpleNamespace(**{
+    family: PermitMatcher(family=family, templates=templates) for family, templates in PERMIT_TEMPLATES.items()
+    })
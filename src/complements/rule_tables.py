@@ -0,0 +1,303 @@
+"""This module holds the rule table of every complement type."""
+from typing import Dict, Optional
+
+from src.complements.enumerators import (AduanaEntrance, CfdiType, CountryCode,
+                                         IncotermCode)
+from src.complements.permits import permits
+from src.complements.rules import Field, Rules
+from src.dict_types import (cdlrgn_cfdis, com_comp_cfdis,
+                            comercialization_transport,
+                            compl_foreign_pedimentos, complement_certified,
+                            complement_cfdis, complement_client,
+                            complement_dictamen, complement_foreign,
+                            complement_foreign_io, complement_national,
+                            complement_national_client,
+                            complement_transport, expenditure_cfdis,
+                            terminal_alm, terminal_alm_permiso,
+                            terminal_transport, transport_cfdis,
+                            transport_terminal)
+from src.utils.definitions import CantidadMonetaria
+from src.utils.regex_registry import regex
+
+MAX_AMOUNT = 1000000000000
+MAX_VOLUME = 100000000000
+
+CFDI_TYPES = [item.value for item in CfdiType]
+COUNTRY_CODES = [item.value for item in CountryCode]
+ADUANA_ENTRANCES = [item.value for item in AduanaEntrance]
+INCOTERM_CODES = list(IncotermCode.__members__)
+
+VOLUME_FIELDS = (
+    Field("ValorNumerico", required=True, min_val=0, max_val=MAX_VOLUME),
+    Field("UnidadDeMedida", required=True, pattern=regex.MEASURE_UNIT),
+    )
+
+DICTAMEN = Rules(
+    Field("RfcDictamen", required=True, pattern=regex.RFC_PERSONA_MORAL_REGEX),
+    Field("LoteDictamen", required=True, min_len=1, max_len=50),
+    Field("NumeroFolioDictamen", required=True, pattern=regex.FOLIO_DICTAMEN_REGEX),
+    Field("FechaEmisionDictamen", required=True, pattern=regex.DATE_REGEX),
+    Field("ResultadoDictamen", required=True, min_len=10, max_len=300),
+    schema=complement_dictamen,
+    )
+
+CERTIFICADO = Rules(
+    Field("RfcCertificado", required=True, pattern=regex.RFC_PERSONA_MORAL_REGEX),
+    Field("NumeroFolioCertificado", required=True, pattern=regex.FOLIO_CERTIFIED_REGEX),
+    Field("FechaEmisionCertificado", required=True, pattern=regex.DATE_REGEX),
+    Field("ResultadoCertificado", required=True, min_len=10, max_len=300),
+    schema=complement_certified,
+    )
+
+
+def _pedimentos(
+        point: str, country: str, transport: str, price: str, schema: Optional[Dict[str, type]] = None,
+    ) -> Rules:
+    """Pedimentos table, the key names change between import only and import or export complements.
+    The schema defaults to the types of the given key names."""
+    if schema is None:
+        schema = {
+            point: str, country: str, transport: str, "PedimentoAduanal": str, "Incoterms": str,
+            price: CantidadMonetaria,
+            }
+    return Rules(
+        Field(point, required=True, pattern=regex.INTERN_SPOT_REGEX, min_len=2, max_len=3),
+        Field(country, required=True, choices=COUNTRY_CODES),
+        Field(transport, choices=ADUANA_ENTRANCES),
+        Field("PedimentoAduanal", required=True, pattern=regex.ADUANAL_PEDIMENTO, min_len=21, max_len=21),
+        Field("Incoterms", required=True, choices=INCOTERM_CODES),
+        Field(price, required=True, min_val=0, max_val=MAX_VOLUME),
+        Field("VolumenDocumentado", required=True, fields=VOLUME_FIELDS),
+        schema=schema,
+        )
+
+
+IMPORT_PEDIMENTOS = _pedimentos(
+    point="PuntoDeInternacion", country="PaisOrigen", transport="MedioDeTransEntraAduana",
+    price="PrecioDeImportacion", schema=compl_foreign_pedimentos,
+    )
+IMPORT_EXPORT_PEDIMENTOS = _pedimentos(
+    point="PuntoDeInternacionOExtraccion", country="PaisOrigenODestino", transport="MedioDeTransEntraOSaleAduana",
+    price="PrecioDeImportacionOExportacion",
+    )
+
+IMPORT_EXTRANJERO = Rules(
+    Field("PermisoImportacion", required=True, pattern=regex.IMPORT_PERMISSION_REGEX),
+    schema=complement_foreign,
+    )
+IMPORT_EXPORT_EXTRANJERO = Rules(
+    Field("PermisoImportacionOExportacion", required=True, pattern=regex.IMPORT_PERMISSION_REGEX),
+    schema=complement_foreign_io,
+    )
+
+# Tablas por TipoComplemento, cada sección es la ruta del registro dentro del complemento.
+COMPLEMENT_RULES = {
+    "Almacenamiento": {
+        "Transporte": Rules(
+            Field("PermisoTransporte", required=True, pattern=permits.TRANSPORT_PERM),
+            Field("ClaveVehiculo", min_len=6, max_len=12),
+            Field("TarifaDeTransporte", required=True, min_val=0, max_val=MAX_AMOUNT),
+            Field("CargoPorCapacidadTransporte", min_val=0, max_val=MAX_AMOUNT),
+            Field("CargoPorUsoTrans", min_val=0, max_val=MAX_AMOUNT),
+            Field("CargoVolumetricoTransporte", min_val=0, max_val=MAX_AMOUNT),
+            schema=complement_transport,
+            ),
+        "Dictamen": DICTAMEN,
+        "Certificado": CERTIFICADO,
+        "Nacional": Rules(
+            Field("RfcClienteOProveedor", required=True, pattern=regex.RFC_REGEX),
+            Field("NombreClienteOProveedor", required=True, min_len=10, max_len=150),
+            Field("PermisoProveedor", pattern=permits.PERMISSION_PROOVE),
+            schema=complement_national,
+            ),
+        "CFDIs": Rules(
+            Field("Cfdi", required=True, pattern=regex.CFDI_REGEX),
+            Field("TipoCfdi", required=True, choices=CFDI_TYPES),
+            Field("PrecioCompra", min_val=0, max_val=MAX_AMOUNT),
+            Field("Contraprestacion", min_val=1, max_val=MAX_AMOUNT),
+            Field("TarifaDeAlmacenamiento", min_val=1, max_val=MAX_AMOUNT),
+            Field("CargoPorCapacidadAlmac", min_val=1, max_val=MAX_AMOUNT),
+            Field("CargoPorUsoAlmac", min_val=1, max_val=MAX_AMOUNT),
+            Field("CargoVolumetricoAlmac", min_val=1, max_val=MAX_AMOUNT),
+            Field("Descuento", min_val=1, max_val=MAX_AMOUNT),
+            Field("FechaYHoraTransaccion", required=True, pattern=regex.UTC_FORMAT_REGEX),
+            Field("VolumenDocumentado", required=True, fields=VOLUME_FIELDS),
+            schema=complement_cfdis,
+            ),
+        "Extranjero": IMPORT_EXTRANJERO,
+        "Pedimentos": IMPORT_PEDIMENTOS,
+        },
+    "CDLRGN": {
+        "TerminalAlmYDist.Almacenamiento": Rules(
+            Field("TerminalAlm", required=True, min_len=5, max_len=250),
+            Field("PermisoAlmacenamiento", required=True, pattern=permits.PERMISSION_ALM_CDLRGN),
+            schema=terminal_alm_permiso,
+            ),
+        "TerminalAlmYDist.Transporte": Rules(
+            Field("PermisoTransporte", required=True, pattern=permits.TRANSP_PERM_CDLRGN),
+            Field("ClaveDeVehiculo", min_len=6, max_len=12),
+            schema=terminal_transport,
+            ),
+        "Certificado": CERTIFICADO,
+        "Nacional": Rules(
+            Field("RfcCliente", required=True, pattern=regex.RFC_REGEX),
+            Field("NombreCliente", required=True, min_len=10, max_len=150),
+            schema=complement_client,
+            ),
+        "CFDIs": Rules(
+            Field("Cfdi", required=True, pattern=regex.CFDI_REGEX),
+            Field("TipoCfdi", required=True, choices=CFDI_TYPES),
+            Field("Contraprestacion", required=True, min_val=1, max_val=MAX_AMOUNT),
+            Field("FechaYHoraTransaccion", required=True, pattern=regex.UTC_FORMAT_REGEX),
+            Field("VolumenDocumentado", required=True, fields=VOLUME_FIELDS),
+            schema=cdlrgn_cfdis,
+            ),
+        "Extranjero": IMPORT_EXPORT_EXTRANJERO,
+        "Pedimentos": _pedimentos(
+            point="PuntoDeInternacionOExtraccion", country="PaisOrigenODestino",
+            transport="MedioDeTransEntraOSaleAduana", price="PrecioDeImportacion",
+            ),
+        },
+    "Comercializacion": {
+        "TerminalAlmYDist.Almacenamiento": Rules(
+            Field("TerminalAlmYDist", required=True, min_len=5, max_len=250),
+            Field("PermisoAlmYDist", required=True, pattern=permits.PERMISSION_ALM_DIST),
+            Field("TarifaDeAlmacenamiento", min_val=0, max_val=MAX_AMOUNT),
+            Field("CargoPorCapacidadAlmac", min_val=0, max_val=MAX_AMOUNT),
+            Field("CargoPorUsoAlmac", min_val=0, max_val=MAX_AMOUNT),
+            Field("CargoVolumetricoAlmac", min_val=0, max_val=MAX_AMOUNT),
+            schema=terminal_alm,
+            ),
+        "TerminalAlmYDist.Transporte": Rules(
+            Field("PermisoTransporte", required=True, pattern=permits.TRANSPORT_PERM),
+            Field("ClaveDeVehiculo", min_len=6, max_len=12),
+            Field("TarifaDeTransporte", required=True, min_val=0, max_val=MAX_AMOUNT),
+            Field("CargoPorCapacidadTrans", min_val=0, max_val=MAX_AMOUNT),
+            Field("CargoPorUsoTrans", min_val=0, max_val=MAX_AMOUNT),
+            Field("CargoVolumetricoTrans", min_val=0, max_val=MAX_AMOUNT),
+            schema=comercialization_transport,
+            ),
+        "Dictamen": DICTAMEN,
+        "Nacional": Rules(
+            Field("RfcClienteOProveedor", required=True, pattern=regex.RFC_REGEX),
+            Field("NombreClienteOProveedor", min_len=10, max_len=150),
+            Field("PermisoClienteOProveedor", pattern=permits.PERMISSION_PROOVE_CLIENT),
+            schema=complement_national_client,
+            ),
+        "CFDIs": Rules(
+            Field("Cfdi", required=True, pattern=regex.CFDI_REGEX),
+            Field("TipoCfdi", required=True, choices=CFDI_TYPES),
+            Field("PrecioVentaOCompraOContrap", required=True, min_val=0, max_val=MAX_AMOUNT),
+            Field("FechaYHoraTransaccion", required=True, pattern=regex.UTC_FORMAT_REGEX),
+            Field("VolumenDocumentado", required=True, fields=VOLUME_FIELDS),
+            schema=com_comp_cfdis,
+            ),
+        "Extranjero": IMPORT_EXPORT_EXTRANJERO,
+        "Pedimentos": IMPORT_EXPORT_PEDIMENTOS,
+        },
+    "Distribucion": {
+        "TerminalAlmYDist.Almacenamiento": Rules(
+            Field("TerminalAlm", required=True, min_len=5, max_len=250),
+            Field("PermisoAlmacenamiento", required=True, pattern=permits.PERMISSION_ALM),
+            Field("TarifaDeAlmacenamiento", required=True, min_val=0, max_val=MAX_AMOUNT),
+            Field("CargoPorCapacidadAlmac", min_val=0, max_val=MAX_AMOUNT),
+            Field("CargoPorUsoAlmac", min_val=0, max_val=MAX_AMOUNT),
+            Field("CargoVolumetricoAlmac", min_val=0, max_val=MAX_AMOUNT),
+            schema=terminal_alm_permiso,
+            ),
+        "TerminalAlmYDist.Transporte": Rules(
+            Field("PermisoTransporte", required=True, pattern=permits.TRANSPORT_PERM),
+            Field("ClaveDeVehiculo", min_len=6, max_len=12),
+            Field("TarifaDeTransporte", required=True, min_val=0, max_val=MAX_AMOUNT),
+            Field("CargoPorCapacidadTransporte", min_val=0, max_val=MAX_AMOUNT),
+            Field("CargoPorUsoTrans", min_val=0, max_val=MAX_AMOUNT),
+            Field("CargoVolumetricoTrans", min_val=0, max_val=MAX_AMOUNT),
+            Field("TarifaDeSuministro", min_val=0, max_val=MAX_AMOUNT),
+            schema=terminal_transport,
+            ),
+        "Dictamen": DICTAMEN,
+        "Certificado": CERTIFICADO,
+        "Nacional": Rules(
+            Field("RfcClienteOProveedor", required=True, pattern=regex.RFC_REGEX),
+            Field("NombreClienteOProveedor", min_len=10, max_len=150),
+            Field("PermisoClienteOProveedor", pattern=permits.PERMISSION_PROOVE_CLIENT_DIS),
+            schema=complement_national_client,
+            ),
+        "CFDIs": Rules(
+            Field("Cfdi", required=True, pattern=regex.CFDI_REGEX),
+            Field("TipoCfdi", required=True, choices=CFDI_TYPES),
+            Field("PrecioVentaOCompraOContrap", required=True, min_val=0, max_val=MAX_AMOUNT),
+            Field("FechaYHoraTransaccion", required=True, pattern=regex.UTC_FORMAT_REGEX),
+            Field("VolumenDocumentado", required=True, fields=VOLUME_FIELDS),
+            schema=com_comp_cfdis,
+            ),
+        "Extranjero": IMPORT_EXPORT_EXTRANJERO,
+        "Pedimentos": IMPORT_EXPORT_PEDIMENTOS,
+        },
+    "Expendio": {
+        "TerminalAlmYDist.Almacenamiento": Rules(
+            Field("TerminalAlmYDist", min_len=5, max_len=250),
+            Field("PermisoAlmYDist", required=True, pattern=permits.PERMISSION_ALM),
+            Field("TarifaDeAlmacenamiento", min_val=0, max_val=MAX_AMOUNT),
+            Field("CargoPorCapacidadAlmac", min_val=0, max_val=MAX_AMOUNT),
+            Field("CargoPorUsoAlmac", min_val=0, max_val=MAX_AMOUNT),
+            Field("CargoVolumetricoAlmac", min_val=0, max_val=MAX_AMOUNT),
+            schema=terminal_alm,
+            ),
+        "TerminalAlmYDist.Transporte": Rules(
+            Field("PermisoTransporte", required=True, pattern=permits.TRANSPORT_PERM_EXO),
+            Field("ClaveDeVehiculo", min_len=6, max_len=12),
+            Field("TarifaDeTransporte", required=True, min_val=0, max_val=MAX_AMOUNT),
+            Field("CargoPorCapacidadTransporte", min_val=0, max_val=MAX_AMOUNT),
+            Field("CargoPorUsoTrans", min_val=0, max_val=MAX_AMOUNT),
+            Field("CargoVolumetricoTrans", min_val=0, max_val=MAX_AMOUNT),
+            schema=terminal_transport,
+            ),
+        "Dictamen": DICTAMEN,
+        "Certificado": CERTIFICADO,
+        "Nacional": Rules(
+            Field("RfcClienteOProveedor", required=True, pattern=regex.RFC_REGEX),
+            Field("NombreClienteOProveedor", required=True, min_len=10, max_len=150),
+            Field("PermisoProveedor", pattern=permits.PERMISSION_PROOVE_CLIENT_EXO),
+            schema=complement_national,
+            ),
+        "CFDIs": Rules(
+            Field("Cfdi", required=True, pattern=regex.CFDI_REGEX),
+            Field("TipoCfdi", required=True, choices=CFDI_TYPES),
+            Field("PrecioCompra", required=True),
+            Field("PrecioDeVentaAlPublico", required_when=("TipoCfdi", "Ingreso"), min_val=0, max_val=MAX_AMOUNT),
+            Field("PrecioVenta", only_when=("TipoCfdi", "Ingreso"), min_val=1, max_val=MAX_AMOUNT),
+            Field("FechaYHoraTransaccion", required=True, pattern=regex.UTC_FORMAT_REGEX),
+            Field("VolumenDocumentado", required=True, fields=VOLUME_FIELDS),
+            schema=expenditure_cfdis,
+            ),
+        "Extranjero": IMPORT_EXTRANJERO,
+        "Pedimentos": IMPORT_PEDIMENTOS,
+        },
+    "Transporte": {
+        "TerminalAlmYDist": Rules(
+            Field("TerminalAlmYDist", required=True, min_len=5, max_len=250),
+            Field("PermisoAlmYDist", required=True, pattern=permits.PERMISSION_ALM_TRANSP),
+            schema=transport_terminal,
+            ),
+        "Certificado": CERTIFICADO,
+        "Nacional": Rules(
+            Field("RfcCliente", required=True, pattern=regex.RFC_REGEX),
+            Field("NombreCliente", required=True, min_len=10, max_len=150),
+            schema=complement_client,
+            ),
+        "CFDIs": Rules(
+            Field("Cfdi", required=True, pattern=regex.CFDI_REGEX),
+            Field("TipoCfdi", required=True, choices=CFDI_TYPES),
+            Field("Contraprestacion", required=True, min_val=1, max_val=MAX_AMOUNT),
+            Field("TarifaDeTransporte", required=True, min_val=1, max_val=MAX_AMOUNT),
+            Field("CargoPorCapacidadDeTrans", min_val=1, max_val=MAX_AMOUNT),
+            Field("CargoPorUsoTrans", min_val=1, max_val=MAX_AMOUNT),
+            Field("CargoVolumetricoTrans", min_val=1, max_val=MAX_AMOUNT),
+            Field("Descuento", min_val=1, max_val=MAX_AMOUNT),
+            Field("FechaYHoraTransaccion", required=True, pattern=regex.UTC_FORMAT_REGEX),
+            Field("VolumenDocumentado", required=True, fields=VOLUME_FIELDS),
+            schema=transport_cfdis,
+            ),
+        },
+    }
@@ -0,0 +1,174 @@
+"""This module compiles complement rule tables into flat lists of checks."""
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from src.custom_exceptions import (ClaveError, LongitudError, RegexError,
+                                   ValorError, ValorMinMaxError)
+from src.dict_type_validator import DictionaryTypeValidator
+
+NONFOUND_MESSAGE = "Error: Elemento '{key}' no declarado."
+CONDITIONAL_MESSAGE = "Error: clave '{key}' es condicional cuando clave '{other}' = '{expected}'."
+MIN_MAX_MESSAGE = "Error: clave {key} con valor {value} no tiene el valor min {min_val} ó max {max_val}."
+LONGITUD_MESSAGE = "Error: clave {key} con valor {value} no tiene una longitud min {min_long} ó max {max_long}."
+VALUE_MESSAGE = "Error: valor '{value}' en clave {key} no válido."
+REGEX_MESSAGE = "Error: clave {key} con valor {value} no cumple con el patrón {pattern}"
+
+# (tipo de error, mensaje, ruta relativa al registro)
+RuleError = Tuple[type, str, Optional[str]]
+Check = Callable[[dict, Any], Optional[Tuple[type, str]]]
+PlanEntry = Tuple[str, str, Tuple[Check, ...], list]
+
+
+class Field:
+    """Constraints of one key of a record.
+
+    Value constraints are only checked on non empty values of the matching kind: ranges
+    on numbers, lengths and patterns on strings; a value of the wrong type is reported
+    by the schema of the table. ``pattern`` is any matcher with a ``pattern`` attribute,
+    e.g. ``regex.CFDI_REGEX`` or ``permits.TRANSPORT_PERM``; ``fields`` holds the rules
+    of a nested object such as VolumenDocumentado."""
+    __slots__ = (
+        "key", "required", "required_when", "only_when", "min_val", "max_val",
+        "min_len", "max_len", "pattern", "choices", "fields",
+        )
+
+    def __init__(
+            self,
+            key: str,
+            required: bool = False,
+            required_when: Optional[Tuple[str, Any]] = None,
+            only_when: Optional[Tuple[str, Any]] = None,
+            min_val: Optional[float] = None,
+            max_val: Optional[float] = None,
+            min_len: Optional[int] = None,
+            max_len: Optional[int] = None,
+            pattern: Optional[Callable[[str], Any]] = None,
+            choices: Optional[Iterable[str]] = None,
+            fields: Iterable["Field"] = (),
+        ) -> None:
+        self.key = key
+        self.required = required
+        self.required_when = required_when
+        self.only_when = only_when
+        self.min_val = min_val
+        self.max_val = max_val
+        self.min_len = min_len
+        self.max_len = max_len
+        self.pattern = pattern
+        self.choices = None if choices is None else frozenset(choices)
+        self.fields = tuple(fields)
+
+
+class Rules:
+    """Rule table of one kind of record: its dict_types schema and its fields.
+
+    The table is compiled on first use into a flat list of ``(key, source, checks)``
+    entries, so every key is read once per record and sources are built once per table."""
+    __slots__ = ("schema", "fields", "_plans")
+
+    def __init__(self, *fields: Field, schema: Optional[Dict[str, type]] = None) -> None:
+        self.schema = schema
+        self.fields = fields
+        self._plans: Dict[bool, List[PlanEntry]] = {}
+
+    def check(self, record: dict, bounds: bool = True) -> Iterator[RuleError]:
+        """Run every rule over record.\n
+        :param bounds: False skips numeric ranges and definitions, for records already
+        cleared by ``vector_bounds``.\n
+        :return: Iterator of (error type, message, source relative to record)."""
+        if self.schema is not None:
+            for err in DictionaryTypeValidator.validate_dict_types(
+                    dict_to_validate=record, dict_type=self.schema, definitions=bounds):
+                yield err["type_err"], err["err_message"], None
+        if (plan := self._plans.get(bounds)) is None:
+            plan = self._plans[bounds] = compile_fields(fields=self.fields, bounds=bounds)
+        yield from _run(plan=plan, record=record)
+
+
+def compile_fields(fields: Iterable[Field], prefix: str = "", bounds: bool = True) -> List[PlanEntry]:
+    """Compile fields into ``(key, source, checks, nested plan)`` entries.\n
+    :param prefix: Source of the object holding the fields.\n
+    :param bounds: False leaves out the numeric range checks.\n
+    :return: List[PlanEntry]."""
+    return [
+        (
+            field.key,
+            f"{prefix}{field.key}",
+            tuple(_field_checks(field=field, bounds=bounds)),
+            compile_fields(fields=field.fields, prefix=f"{prefix}{field.key}.", bounds=bounds),
+            )
+        for field in fields
+        ]
+
+
+def _run(plan: List[PlanEntry], record: dict) -> Iterator[RuleError]:
+    get = record.get
+    for key, source, checks, nested in plan:
+        value = get(key)
+        for check in checks:
+            if (err := check(record, value)) is not None:
+                yield err[0], err[1], source
+        if nested and value and isinstance(value, dict):
+            yield from _run(plan=nested, record=value)
+
+
+def _field_checks(field: Field, bounds: bool = True) -> Iterator[Check]:
+    key = field.key
+
+    if field.required:
+        message = NONFOUND_MESSAGE.format(key=key)
+
+        def required(record, value):
+            if value is None:
+                return ClaveError, message
+        yield required
+
+    if field.required_when is not None:
+        other, expected = field.required_when
+        message = CONDITIONAL_MESSAGE.format(key=key, other=other, expected=expected)
+
+        def required_when(record, value):
+            if value is None and record.get(other) == expected:
+                return ClaveError, message
+        yield required_when
+
+    if field.only_when is not None:
+        other, expected = field.only_when
+        message = CONDITIONAL_MESSAGE.format(key=key, other=other, expected=expected)
+
+        def only_when(record, value):
+            if value is not None and record.get(other) != expected:
+                return ClaveError, message
+        yield only_when
+
+    if bounds and field.min_val is not None:
+        min_val, max_val = field.min_val, field.max_val
+
+        def in_range(record, value):
+            if value and isinstance(value, (int, float)) and not min_val <= value <= max_val:
+                return ValorMinMaxError, MIN_MAX_MESSAGE.format(key=key, value=value, min_val=min_val, max_val=max_val)
+        yield in_range
+
+    if field.min_len is not None:
+        min_len, max_len = field.min_len, field.max_len
+
+        def in_length(record, value):
+            if value and isinstance(value, str) and not min_len <= len(value) <= max_len:
+                return LongitudError, LONGITUD_MESSAGE.format(key=key, value=value, min_long=min_len, max_long=max_len)
+        yield in_length
+
+    if field.pattern is not None:
+        matcher = field.pattern
+
+        def matches(record, value):
+            if value and isinstance(value, str) and not matcher(value):
+                return RegexError, REGEX_MESSAGE.format(key=key, value=value, pattern=matcher.pattern)
+        yield matches
+
+    if field.choices is not None:
+        choices = field.choices
+
+        def in_choices(record, value):
+            if value and (not isinstance(value, str) or value not in choices):
+                return ValorError, VALUE_MESSAGE.format(key=key, value=value)
+        yield in_choices
+
@@ -0,0 +1,345 @@
+"""This module generates specialized checker functions from the complement rule tables.
+
+Every complement type gets one generated module with a ``check_<section>(record)``
+function per section. Keys, limits, messages and sources are inlined as constants and
+the module is compiled with ``compile()``. When RULES_CACHE_DIR is set the code object
+is cached there with marshal under a hash of the rule definitions, next to its source
+for debugging. The cached code is executed on load, so the directory must be private:
+it is created with mode 0o700 and a directory or file that is not owned by this user,
+or that group or others can write, is not used."""
+import hashlib
+import importlib.util
+import linecache
+import marshal
+import os
+import re
+import sys
+import stat
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from src.complements.rule_tables import COMPLEMENT_RULES
+from src.complements.rules import (CONDITIONAL_MESSAGE, LONGITUD_MESSAGE,
+                                   MIN_MAX_MESSAGE, NONFOUND_MESSAGE,
+                                   REGEX_MESSAGE, VALUE_MESSAGE, Field,
+                                   RuleError, Rules)
+from src.constants import RULESET_VERSION
+from src.custom_exceptions import (ClaveError, LongitudError, RegexError,
+                                   ValorError, ValorMinMaxError)
+from src.dict_type_validator import DictionaryTypeValidator
+from src.utils.logger import logger
+
+RULES_CODEGEN = os.getenv("RULES_CODEGEN", "true").lower() in ("1", "true", "yes")
+# Sin valor los checkers se compilan en memoria en cada proceso.
+RULES_CACHE_DIR = os.getenv("RULES_CACHE_DIR") or None
+
+# Cambiar cuando cambie el código generado para invalidar el caché en disco.
+CODEGEN_VERSION = "3"
+
+Checker = Callable[[dict], List[RuleError]]
+
+logging = logger()
+
+_SENTINEL = "\x00"
+_compiled: Dict[str, Tuple[Dict[str, Checker], Dict[str, Checker]]] = {}
+
+
+class _Module:
+    """Generated source of one complement type and the objects it needs at load time."""
+
+    def __init__(self) -> None:
+        self.lines: List[str] = []
+        self.schemas: Dict[int, int] = {}
+        self.matchers: Dict[int, int] = {}
+
+    def emit(self, depth: int, line: str) -> None:
+        self.lines.append("    " * depth + line)
+
+    def schema(self, schema: Dict[str, type]) -> str:
+        index = self.schemas.setdefault(id(schema), len(self.schemas))
+        return f"_SCHEMAS[{index}]"
+
+    def matcher(self, matcher: Callable[[str], Any]) -> str:
+        index = self.matchers.setdefault(id(matcher), len(self.matchers))
+        return f"_MATCHERS[{index}]"
+
+    @property
+    def source(self) -> str:
+        return "\n".join(self.lines) + "\n"
+
+
+def _message_parts(template: str, **consts: Any) -> Tuple[str, str]:
+    """Split a message template around its value, with every other field formatted."""
+    prefix, suffix = template.format(value=_SENTINEL, **consts).split(_SENTINEL)
+    return prefix, suffix
+
+
+def _append_with_value(module: _Module, depth: int, err: str, template: str, var: str, source: str, **consts) -> None:
+    prefix, suffix = _message_parts(template, **consts)
+    module.emit(depth, f"append(({err}, {prefix!r} + str({var}) + {suffix!r}, {source!r}))")
+
+
+def _emit_fields(module: _Module, fields: Tuple[Field, ...], prefix: str, depth: int, level: int, bounds: bool) -> None:
+    """Emit the checks of fields in the same order as ``rules._field_checks``."""
+    get, var = f"get{level}", f"v{level}"
+    for field in fields:
+        key, source = field.key, f"{prefix}{field.key}"
+        module.emit(depth, f"{var} = {get}({key!r})")
+
+        if field.required:
+            module.emit(depth, f"if {var} is None:")
+            module.emit(depth + 1, f"append((ClaveError, {NONFOUND_MESSAGE.format(key=key)!r}, {source!r}))")
+        if field.required_when is not None:
+            other, expected = field.required_when
+            message = CONDITIONAL_MESSAGE.format(key=key, other=other, expected=expected)
+            module.emit(depth, f"if {var} is None and {get}({other!r}) == {expected!r}:")
+            module.emit(depth + 1, f"append((ClaveError, {message!r}, {source!r}))")
+        if field.only_when is not None:
+            other, expected = field.only_when
+            message = CONDITIONAL_MESSAGE.format(key=key, other=other, expected=expected)
+            module.emit(depth, f"if {var} is not None and {get}({other!r}) != {expected!r}:")
+            module.emit(depth + 1, f"append((ClaveError, {message!r}, {source!r}))")
+
+        has_range = bounds and field.min_val is not None
+        has_str = field.min_len is not None or field.pattern is not None
+        if has_range or has_str or field.choices is not None:
+            module.emit(depth, f"if {var}:")
+            branch = "if"
+            if has_range:
+                module.emit(depth + 1, f"if isinstance({var}, (int, float)) and not {field.min_val!r} <= {var} <= {field.max_val!r}:")
+                _append_with_value(
+                    module, depth + 2, "ValorMinMaxError", MIN_MAX_MESSAGE, var, source,
+                    key=key, min_val=field.min_val, max_val=field.max_val,
+                    )
+                branch = "elif"
+            if has_str:
+                module.emit(depth + 1, f"{branch} isinstance({var}, str):")
+                if field.min_len is not None:
+                    module.emit(depth + 2, f"if not {field.min_len!r} <= len({var}) <= {field.max_len!r}:")
+                    _append_with_value(
+                        module, depth + 3, "LongitudError", LONGITUD_MESSAGE, var, source,
+                        key=key, min_long=field.min_len, max_long=field.max_len,
+                        )
+                if field.pattern is not None:
+                    module.emit(depth + 2, f"if not {module.matcher(field.pattern)}({var}):")
+                    _append_with_value(
+                        module, depth + 3, "RegexError", REGEX_MESSAGE, var, source,
+                        key=key, pattern=field.pattern.pattern,
+                        )
+            if field.choices is not None:
+                choices = "{" + ", ".join(repr(choice) for choice in sorted(field.choices)) + "}"
+                module.emit(depth + 1, f"if not isinstance({var}, str) or {var} not in {choices}:")
+                _append_with_value(module, depth + 2, "ValorError", VALUE_MESSAGE, var, source, key=key)
+
+        if field.fields:
+            module.emit(depth, f"if {var} and isinstance({var}, dict):")
+            module.emit(depth + 1, f"get{level + 1} = {var}.get")
+            _emit_fields(
+                module=module, fields=field.fields, prefix=f"{source}.", depth=depth + 1, level=level + 1, bounds=bounds,
+                )
+
+
+def _function_name(section: str) -> str:
+    return "check_" + re.sub(r"\W", "_", section)
+
+
+def generate_module(complement_type: str, tables: Dict[str, Rules]) -> _Module:
+    """Generate the checkers module of a complement type.\n
+    :param tables: Rule tables by section, as in COMPLEMENT_RULES.\n
+    :return: _Module with the source and the schemas and matchers it refers to."""
+    module = _Module()
+    module.emit(0, f'"""Checkers of the {complement_type} complement, generated by rules_codegen."""')
+    # Las variantes '_lean' omiten rangos y definiciones, ya revisados por vector_bounds.
+    for bounds, suffix in ((True, ""), (False, "_lean")):
+        for section, rules in tables.items():
+            module.emit(0, "")
+            module.emit(0, "")
+            module.emit(0, f"def {_function_name(section)}{suffix}(record):")
+            module.emit(1, "errors = []")
+            module.emit(1, "append = errors.append")
+            if rules.schema is not None:
+                module.emit(1, f"for err in {module.schema(rules.schema)}.errors(record, {bounds}):")
+                module.emit(2, 'append((err["type_err"], err["err_message"], None))')
+            module.emit(1, "get0 = record.get")
+            _emit_fields(module=module, fields=rules.fields, prefix="", depth=1, level=0, bounds=bounds)
+            module.emit(1, "return errors")
+    for name, suffix in (("CHECKERS", ""), ("LEAN_CHECKERS", "_lean")):
+        module.emit(0, "")
+        module.emit(0, "")
+        module.emit(0, f"{name} = {{")
+        for section in tables:
+            module.emit(1, f"{section!r}: {_function_name(section)}{suffix},")
+        module.emit(1, "}")
+    return module
+
+
+def _field_matchers(fields: Tuple[Field, ...]) -> List[Callable[[str], Any]]:
+    matchers = []
+    for field in fields:
+        if field.pattern is not None:
+            matchers.append(field.pattern)
+        matchers.extend(_field_matchers(fields=field.fields))
+    return matchers
+
+
+def _unique(items: List[Any]) -> tuple:
+    return tuple({id(item): item for item in items}.values())
+
+
+def module_references(tables: Dict[str, Rules]) -> Tuple[tuple, tuple]:
+    """Schemas and matchers of the generated module, in the order ``generate_module``
+    numbers them, so cached code can be loaded without generating its source.\n
+    :return: (schema checkers, matchers)."""
+    schemas, matchers = [], []
+    for rules in tables.values():
+        if rules.schema is not None:
+            schemas.append(rules.schema)
+        matchers.extend(_field_matchers(fields=rules.fields))
+    return tuple(DictionaryTypeValidator.checker(schema) for schema in _unique(schemas)), _unique(matchers)
+
+
+def _describe_field(field: Field) -> tuple:
+    return (
+        field.key, field.required, field.required_when, field.only_when,
+        field.min_val, field.max_val, field.min_len, field.max_len,
+        None if field.pattern is None else field.pattern.pattern,
+        None if field.choices is None else tuple(sorted(field.choices)),
+        tuple(_describe_field(nested) for nested in field.fields),
+        )
+
+
+def fingerprint(complement_type: str, tables: Dict[str, Rules]) -> str:
+    """Hash of everything the generated code depends on.\n
+    :return: sha256 hex digest."""
+    description = (
+        CODEGEN_VERSION,
+        RULESET_VERSION,
+        importlib.util.MAGIC_NUMBER.hex(),
+        complement_type,
+        tuple(
+            (
+                section,
+                None if rules.schema is None else tuple((key, repr(kind)) for key, kind in rules.schema.items()),
+                tuple(_describe_field(field) for field in rules.fields),
+                )
+            for section, rules in tables.items()
+            ),
+        )
+    return hashlib.sha256(repr(description).encode()).hexdigest()
+
+
+def _cache_paths(complement_type: str, digest: str, cache_dir: str) -> Tuple[str, str]:
+    base = os.path.join(cache_dir, f"{complement_type}-{digest[:16]}")
+    return f"{base}.marshal", f"{base}.py"
+
+
+def _is_private(status: os.stat_result) -> bool:
+    """True when status belongs to this user and neither group nor others can write it."""
+    return status.st_uid == os.getuid() and not status.st_mode & (stat.S_IWGRP | stat.S_IWOTH)
+
+
+def _private_dir(cache_dir: str) -> bool:
+    """Create cache_dir with mode 0o700 if missing and check that it is private.
+
+    :return: False when the directory cannot be used."""
+    try:
+        os.makedirs(cache_dir, mode=0o700, exist_ok=True)
+        status = os.lstat(cache_dir)
+    except OSError as exc:
+        logging.warning(f"Error al crear el caché de reglas {cache_dir}: {exc}")
+        return False
+    if not stat.S_ISDIR(status.st_mode) or not _is_private(status):
+        logging.warning(f"El caché de reglas {cache_dir} no es un directorio privado de este usuario, no se usa.")
+        return False
+    return True
+
+
+def _load_cached(code_path: str) -> Optional[Any]:
+    try:
+        with open(code_path, "rb", opener=lambda path, flags: os.open(path, flags | os.O_NOFOLLOW)) as file:
+            if not _is_private(os.fstat(file.fileno())):
+                logging.warning(f"El caché de reglas {code_path} no es privado de este usuario, no se usa.")
+                return None
+            return marshal.load(file)
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+
+
+def _write_atomic(path: str, data: bytes) -> None:
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as file:
+        file.write(data)
+    os.replace(tmp_path, path)
+
+
+def compile_checkers(
+        complement_type: str,
+        tables: Dict[str, Rules],
+        cache_dir: Optional[str] = None,
+    ) -> Tuple[Dict[str, Checker], Dict[str, Checker]]:
+    """Load the generated checkers of a complement type from the disk cache, or generate,
+    compile and cache them.\n
+    :param cache_dir: Private directory of the marshal cache, None to compile in memory only.\n
+    :return: Checker function by section, with and without numeric bounds."""
+    digest = fingerprint(complement_type=complement_type, tables=tables)
+    code = None
+
+    if cache_dir is not None and _private_dir(cache_dir=cache_dir):
+        code_path, source_path = _cache_paths(complement_type=complement_type, digest=digest, cache_dir=cache_dir)
+        if (code := _load_cached(code_path)) is None:
+            source = generate_module(complement_type=complement_type, tables=tables).source
+            code = compile(source, source_path, "exec")
+            try:
+                _write_atomic(source_path, source.encode())
+                _write_atomic(code_path, marshal.dumps(code))
+            except OSError as exc:
+                logging.warning(f"Error al guardar el caché de reglas {code_path}: {exc}")
+    if code is None:
+        filename = f"<rules:{complement_type}>"
+        source = generate_module(complement_type=complement_type, tables=tables).source
+        code = compile(source, filename, "exec")
+        # Las trazas de los checkers generados en memoria muestran su código fuente.
+        linecache.cache[filename] = (len(source), None, source.splitlines(True), filename)
+
+    schemas, matchers = module_references(tables=tables)
+    namespace = {
+        "__name__": f"src.complements.generated.{complement_type}",
+        "ClaveError": ClaveError,
+        "LongitudError": LongitudError,
+        "RegexError": RegexError,
+        "ValorError": ValorError,
+        "ValorMinMaxError": ValorMinMaxError,
+        "_SCHEMAS": schemas,
+        "_MATCHERS": matchers,
+        }
+    exec(code, namespace)
+    return namespace["CHECKERS"], namespace["LEAN_CHECKERS"]
+
+
+def compiled_rules(complement_type: str, bounds: bool = True) -> Dict[str, Checker]:
+    """Checkers of a complement type, compiled once per process. With RULES_CODEGEN
+    disabled the rule tables are interpreted by ``Rules.check``.\n
+    :param bounds: False gives the checkers without numeric ranges and definitions.\n
+    :return: Checker function by section."""
+    if (checkers := _compiled.get(complement_type)) is None:
+        tables = COMPLEMENT_RULES[complement_type]
+        if RULES_CODEGEN:
+            checkers = compile_checkers(complement_type=complement_type, tables=tables, cache_dir=RULES_CACHE_DIR)
+        else:
+            checkers = (
+                {section: rules.check for section, rules in tables.items()},
+                {section: partial(rules.check, bounds=False) for section, rules in tables.items()},
+                )
+        _compiled[complement_type] = checkers
+    return checkers[0] if bounds else checkers[1]
+
+
+def rules_source(complement_type: str) -> str:
+    """Generated source of a complement type, for debugging.\n
+    :return: str."""
+    return generate_module(complement_type=complement_type, tables=COMPLEMENT_RULES[complement_type]).source
+
+
+if __name__ == "__main__":
+    for name in sys.argv[1:] or COMPLEMENT_RULES:
+        print(rules_source(complement_type=name))
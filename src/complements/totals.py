@@ -0,0 +1,139 @@
+"""This module accumulates the totals of the documents of a Recepciones or Entregas section.
+
+The complement traversal adds every CFDI and pedimento it validates to the DocumentTotals
+of its section: the number of documents, the documented volume by UnidadDeMedida and the
+amount. Records are not kept, so streamed CFDIs are added as they are read and nothing is
+walked twice. ``reconcile`` compares the totals with the ones declared by the section."""
+import math
+import os
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from src.custom_exceptions import EntregasError, RecepcionesError
+
+RECONCILE_TOTALS = os.getenv("RECONCILE_TOTALS", "true").lower() in ("1", "true", "yes")
+# Diferencia aceptada entre lo declarado y lo documentado, relativa y absoluta.
+RECONCILE_REL_TOLERANCE = float(os.getenv("RECONCILE_REL_TOLERANCE", "0.01"))
+RECONCILE_ABS_TOLERANCE = float(os.getenv("RECONCILE_ABS_TOLERANCE", "0.001"))
+
+# Clave del importe de un CFDI por tipo de complemento y sección; None no compara el importe.
+# Expendio declara PrecioCompra en todos sus CFDIs, la venta es PrecioVenta; PrecioDeVentaAlPublico
+# es un precio por unidad y no se suma. En Almacenamiento PrecioCompra y Contraprestacion son
+# opcionales y ninguno corresponde siempre al importe de la sección.
+AMOUNT_KEYS = {
+    "Almacenamiento": {"Recepciones": None, "Entregas": None},
+    "CDLRGN": {"Recepciones": "Contraprestacion", "Entregas": "Contraprestacion"},
+    "Comercializacion": {"Recepciones": "PrecioVentaOCompraOContrap", "Entregas": "PrecioVentaOCompraOContrap"},
+    "Distribucion": {"Recepciones": "PrecioVentaOCompraOContrap", "Entregas": "PrecioVentaOCompraOContrap"},
+    "Expendio": {"Recepciones": "PrecioCompra", "Entregas": "PrecioVenta"},
+    "Transporte": {"Recepciones": "Contraprestacion", "Entregas": "Contraprestacion"},
+    }
+PEDIMENTO_AMOUNT_KEYS = ("PrecioDeImportacion", "PrecioDeImportacionOExportacion")
+
+# Claves declaradas por sección: (documentos, volumen, importe)
+SECTION_KEYS = {
+    "Recepciones": ("TotalDocumentosMes", "SumaVolumenRecepcionMes", "ImporteTotalRecepcionesMensual"),
+    "Entregas": ("TotalDocumentosMes", "SumaVolumenEntregadoMes", "ImporteTotalEntregasMes"),
+    }
+_SECTION_ERRORS = {"Recepciones": RecepcionesError, "Entregas": EntregasError}
+
+MISMATCH_MESSAGE = "Error: clave {key} con valor {declared} no concuerda con {documented} de los documentos del complemento."
+
+
+def _number(value: Any) -> Optional[float]:
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return value
+    return None
+
+
+def _close(declared: float, documented: float) -> bool:
+    return math.isclose(declared, documented, rel_tol=RECONCILE_REL_TOLERANCE, abs_tol=RECONCILE_ABS_TOLERANCE)
+
+
+class DocumentTotals:
+    """Running totals of the CFDIs and pedimentos of one section, with the number of
+    documents that lack a volume or an amount."""
+    __slots__ = (
+        "complement_type", "section", "amount_key", "documents", "volumes", "amount", "without_volume",
+        "without_amount",
+        )
+
+    def __init__(self, complement_type: str, section: str) -> None:
+        self.complement_type = complement_type
+        self.section = section
+        self.amount_key = AMOUNT_KEYS.get(complement_type, {}).get(section)
+        self.documents = 0
+        self.volumes: Dict[str, float] = {}
+        self.amount = 0.0
+        self.without_volume = 0
+        self.without_amount = 0
+
+    def add(self, record: Any, pedimento: bool = False) -> None:
+        """Add one document to the totals.\n
+        :param pedimento: True for a Pedimentos record, whose amount keys differ from a CFDI.\n
+        :return: None."""
+        self.documents += 1
+        if not isinstance(record, dict):
+            self.without_volume += 1
+            self.without_amount += 1
+            return
+
+        volume = record.get("VolumenDocumentado")
+        if isinstance(volume, dict):
+            value, unit = _number(volume.get("ValorNumerico")), volume.get("UnidadDeMedida")
+        else:
+            value, unit = None, None
+        if value is None or not isinstance(unit, str):
+            self.without_volume += 1
+        else:
+            self.volumes[unit] = self.volumes.get(unit, 0.0) + value
+
+        amount_keys = PEDIMENTO_AMOUNT_KEYS if pedimento else (self.amount_key,) if self.amount_key else ()
+        for key in amount_keys:
+            if (amount := _number(record.get(key))) is not None:
+                self.amount += amount
+                break
+        else:
+            self.without_amount += 1
+
+    def update(self, other: "DocumentTotals") -> None:
+        """Add the totals of other documents of the same section, e.g. the ones of a
+        Complemento item validated by a worker.\n
+        :return: None."""
+        self.documents += other.documents
+        for unit, volume in other.volumes.items():
+            self.volumes[unit] = self.volumes.get(unit, 0.0) + volume
+        self.amount += other.amount
+        self.without_volume += other.without_volume
+        self.without_amount += other.without_amount
+
+    def reconcile(self, declared: Any) -> Iterator[Tuple[type, str, str]]:
+        """Compare the totals with the ones declared by their section. The volume is compared
+        when every document has one in the declared unit and the amount when the section type
+        has an amount key and every document declares it; nothing is compared for a section
+        without documents.\n
+        :param declared: Section object.\n
+        :return: Iterator of (error type, message, source relative to section)."""
+        if not self.documents or not isinstance(declared, dict):
+            return
+        err_type = _SECTION_ERRORS[self.section]
+        documents_key, volume_key, amount_key = SECTION_KEYS[self.section]
+
+        if (documents := _number(declared.get(documents_key))) is not None and documents != self.documents:
+            yield err_type, MISMATCH_MESSAGE.format(
+                key=documents_key, declared=documents, documented=self.documents,
+                ), documents_key
+
+        volume = declared.get(volume_key)
+        if isinstance(volume, dict) and not self.without_volume:
+            value, unit = _number(volume.get("ValorNumerico")), volume.get("UnidadDeMedida")
+            if value is not None and self.volumes.keys() == {unit} and not _close(value, self.volumes[unit]):
+                key = f"{volume_key}.ValorNumerico"
+                yield err_type, MISMATCH_MESSAGE.format(
+                    key=key, declared=value, documented=f"{round(self.volumes[unit], 3)} {unit}",
+                    ), key
+
+        amount = _number(declared.get(amount_key))
+        if amount is not None and not self.without_amount and not _close(amount, self.amount):
+            yield err_type, MISMATCH_MESSAGE.format(
+                key=amount_key, declared=amount, documented=round(self.amount, 3),
+                ), amount_key
@@ -0,0 +1,147 @@
+"""This module checks the numeric bounds of a whole list of records at once.
+
+Every numeric field of a rule table, its Field ranges and the definitions of its schema,
+is gathered across the records as a column and compared against its limits with NumPy
+when it is installed, or with a plain loop otherwise. Records that pass every bound are
+validated by the checkers without ranges; the rest, the ones that may hold an error, by
+the full checkers, so the errors and their order do not change."""
+import os
+from itertools import repeat
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from src.complements.rules import Field, Rules
+from src.utils.definitions import (JSON_FLOAT_TYPES, Definition, JsonFloat,
+                                   float_decimals)
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Desactivado por omisión. 'auto' solo agrupa con NumPy instalado; 'true' usa el recorrido en
+# Python si no lo está.
+_VECTORIZED_BOUNDS = os.getenv("VECTORIZED_BOUNDS", "false").lower()
+VECTORIZED_BOUNDS = _VECTORIZED_BOUNDS in ("1", "true", "yes") or (_VECTORIZED_BOUNDS == "auto" and np is not None)
+VECTORIZE_MIN_RECORDS = int(os.getenv("VECTORIZE_MIN_RECORDS", "64"))
+
+# (ruta de la clave, mínimo, máximo, máximo de decimales o None, admite null)
+Bound = Tuple[Tuple[str, ...], float, float, Optional[int], bool]
+
+# Clave ausente; un null explícito no pasa la definición de un esquema.
+_MISSING = object()
+
+# Código por clase de valor: decimales de los números del parser y enteros, _REPR para
+# floats sin lexema, _ABSENT para claves ausentes y _OTHER para cualquier otro tipo; bool y
+# las definiciones ya construidas siguen el camino completo.
+_REPR, _ABSENT, _OTHER = -1, -2, -3
+_CLASS_CODES = {json_float: json_float.decimals for json_float in JSON_FLOAT_TYPES}
+_CLASS_CODES.update({JsonFloat: JsonFloat.decimals, int: 0, float: _REPR, object: _ABSENT})
+
+_bounds: Dict[int, Tuple[Rules, Tuple[Bound, ...]]] = {}
+
+
+def _field_bounds(fields: Sequence[Field], prefix: Tuple[str, ...] = ()) -> List[Bound]:
+    bounds = []
+    for field in fields:
+        path = (*prefix, field.key)
+        if field.min_val is not None:
+            bounds.append((path, field.min_val, field.max_val, None, True))
+        bounds.extend(_field_bounds(fields=field.fields, prefix=path))
+    return bounds
+
+
+def _merge(bounds: List[Bound]) -> Tuple[Bound, ...]:
+    """One bound per key path with the tightest limits of all its bounds; a record out of
+    the merged limits is only suspect, the full checkers decide."""
+    merged: Dict[Tuple[str, ...], Bound] = {}
+    for path, min_val, max_val, max_decimals, nullable in bounds:
+        if (previous := merged.get(path)) is not None:
+            decimals = [value for value in (previous[3], max_decimals) if value is not None]
+            min_val, max_val = max(previous[1], min_val), min(previous[2], max_val)
+            max_decimals, nullable = min(decimals, default=None), previous[4] and nullable
+        merged[path] = (path, min_val, max_val, max_decimals, nullable)
+    return tuple(merged.values())
+
+
+def section_bounds(rules: Rules) -> Tuple[Bound, ...]:
+    """Numeric bounds of a rule table: its Field ranges and its schema definitions.\n
+    :return: Tuple of (key path, min, max, max decimals or None, accepts null)."""
+    if (cached := _bounds.get(id(rules))) is not None and cached[0] is rules:
+        return cached[1]
+    bounds = _field_bounds(fields=rules.fields)
+    for key, expected_type in (rules.schema or {}).items():
+        if issubclass(expected_type, Definition):
+            bounds.append(((key,), expected_type.min_val, expected_type.max_val, expected_type.max_decimals, False))
+    _bounds[id(rules)] = (rules, _merge(bounds=bounds))
+    return _bounds[id(rules)][1]
+
+
+def _column(records: Sequence[dict], path: Tuple[str, ...]) -> list:
+    key, *nested = path
+    values = list(map(dict.get, records, repeat(key), repeat(_MISSING)))
+    for key in nested:
+        values = [value.get(key, _MISSING) if value.__class__ is dict else _MISSING for value in values]
+    return values
+
+
+def _codes(values: list, nullable: bool) -> Iterator[int]:
+    codes = _CLASS_CODES if not nullable else {**_CLASS_CODES, type(None): _ABSENT}
+    return map(codes.get, map(type, values), repeat(_OTHER))
+
+
+def _suspects_numpy(records: Sequence[dict], bounds: Tuple[Bound, ...]) -> List[bool]:
+    count = len(records)
+    suspect = np.zeros(count, dtype=bool)
+    for path, min_val, max_val, max_decimals, nullable in bounds:
+        values = _column(records=records, path=path)
+        codes = np.fromiter(_codes(values=values, nullable=nullable), dtype=np.int8, count=count)
+        lowest, highest = codes.min(), codes.max()
+        if highest == _ABSENT and lowest == _ABSENT:
+            continue
+        if lowest >= _REPR:
+            # Caso común: la clave es un número en todos los registros.
+            numeric, numbers = slice(None), np.fromiter(values, dtype=float, count=count)
+        else:
+            suspect |= codes == _OTHER
+            (numeric,) = np.nonzero(codes >= _REPR)
+            numbers = np.array(values, dtype=object)[numeric].astype(float)
+        # NaN no cumple ninguna comparación y también queda marcado.
+        suspect[numeric] |= ~((numbers >= min_val) & (numbers <= max_val))
+        if max_decimals is not None and highest > max_decimals:
+            suspect |= codes > max_decimals
+        if max_decimals is not None and lowest <= _REPR <= highest:
+            for index in np.nonzero(codes == _REPR)[0].tolist():
+                suspect[index] |= float_decimals(values[index]) > max_decimals
+    return suspect.tolist()
+
+
+def _suspects_python(records: Sequence[dict], bounds: Tuple[Bound, ...]) -> List[bool]:
+    suspect = [False] * len(records)
+    for path, min_val, max_val, max_decimals, nullable in bounds:
+        values = _column(records=records, path=path)
+        for index, (code, value) in enumerate(zip(_codes(values=values, nullable=nullable), values)):
+            if code == _ABSENT:
+                continue
+            if (
+                    code == _OTHER
+                    or not min_val <= value <= max_val
+                    or (max_decimals is not None and (code if code != _REPR else float_decimals(value)) > max_decimals)
+                ):
+                suspect[index] = True
+    return suspect
+
+
+def suspect_records(records: Sequence[dict], rules: Optional[Rules]) -> Optional[List[bool]]:
+    """Flag the records that may break a numeric bound of rules; the others can be checked
+    without ranges nor definitions.\n
+    :return: One flag per record, or None when the list is too short to be worth it."""
+    if not VECTORIZED_BOUNDS or rules is None or len(records) < VECTORIZE_MIN_RECORDS:
+        return None
+    if not (bounds := section_bounds(rules=rules)):
+        return None
+    # Registros que no son objetos se revisan completos, con la excepción que correspondan.
+    if set(map(type, records)) != {dict}:
+        return None
+    if np is not None:
+        return _suspects_numpy(records=records, bounds=bounds)
+    return _suspects_python(records=records, bounds=bounds)
@@ -1,5 +1,4 @@
 """This module handle Gas Condensado validaciones"""
-import re
 from typing import Union
 
 from src.constants import CONDENSEDGAS_REGEX, petroleo_caracteres
@@ -7,6 +6,7 @@ from src.custom_exceptions import RegexError, ValorMinMaxError, ClaveError
 from src.decorators import exception_wrapper
 from src.dict_type_validator import DictionaryTypeValidator
 from src.dict_types import gas_dict
+from src.utils.regex_registry import regex
 
 
 # TODO VALIDAR EL TIPADO Y AJUSTAR LA MANERA DE REGRESAR LOS ERRORES
@@ -27,7 +27,8 @@ class CondensedGasValidator:
 
     @exception_wrapper
     def _validate_condensado_tipos(self) -> None:
-        DictionaryTypeValidator().validate_dict_type(dict_to_validate=self.gas_natural, dict_type=gas_dict)
+        for err in DictionaryTypeValidator.validate_dict_types(dict_to_validate=self.gas_natural, dict_type=gas_dict):
+            self.catch_error(err_type=err["type_err"], err_message=err["err_message"])
 
     @exception_wrapper
     def _validate_condensado(self) -> None:
@@ -38,7 +39,7 @@ class CondensedGasValidator:
                 err_type=ClaveError,
                 err_message=f"""Error: 'ComposGasNaturalOCondensados' debe expresarse si se manifiesta caracter {petroleo_caracteres} y Producto 'PR09' o 'PR10'."""
                 )
-        if compo_gas and not re.match(CONDENSEDGAS_REGEX, compo_gas):
+        if compo_gas and not regex.CONDENSEDGAS_REGEX(compo_gas):
             self.catch_error(
                 err_type=RegexError,
                 err_message=f"Error: 'ComposGasNaturalOCondensados {compo_gas}' no cumple con el patron {CONDENSEDGAS_REGEX}"
@@ -1,4 +1,8 @@
 """This module handle constants."""
+from src.utils.regex_registry import regex
+
+# Cambiar cuando cambien las reglas de validación para invalidar resultados previos.
+RULESET_VERSION = "5"
 
 caracteres = {
     "contratista": ["NumContratoOAsignacion"],
@@ -64,3 +68,8 @@ CONDENSEDGAS_REGEX = r"^GNC(0[1-9]|10)$"
 RFC_PERSONA_FISICA = r"^([A-ZÑ]|\&){4}[0-9]{2}(0[1-9]|1[0-2])([12][0 -9]|0[1-9]|3[01])[A-Z0-9]{3}$"
 FILE_NAME_REGEX = r"^M_([A-Za-z0-9]{8}-[A-Za-z0-9]{4}-[A-Za-z0-9]{4}-[A-Za-z0-9]{4}-[A-Za-z0-9]{12})_[A-Z0-9Ñ&]{12,13}_[A-Z0-9Ñ&]{12}_(\d{4}-\d{2}-\d{2})_(ACA|AUP|ALM|ACO|BSP|BDE|CMN|COM|CON|DEN|DIS|EMA|ESN|EDS|ESA|EXO|EXP|EXT|GSH|LON|RPO|PTA|PDD|PGN|RCN|REF|RGN|SIS|SFO|SDA|TDA|TDD|TRA|TDP|USP|ACL|ASN|MNA|TRE)-\d{4}_(EXT|REF|PGN|CON|DEN|LON|RGN|TRA|ALM|AGA|USP|DIS|CMN|EXO)_JSON$"
 # FILE_NAME_REGEX = r"^M_[A-Za-z0-9]{36}_[A-ZÑ&]{3,4}[0-9]{2}(0[1-9]|1[0-2])(0[1-9]|[12][0-9]|3[01])[A-Z0-9]{3}_[A-ZÑ&]{3}[0-9]{2}(0[1-9]|1[0-2])(0[1-9]|[12][0-9]|3[01])[A-Z0-9]{3}_[0-9]{4}-(0[1-9]|1[0-2])-(0[1-9]|[12][0-9]|3[01])_((ACA|AUP|ALM|ACO|BSP|BDE|CMN|COM|CON|DEN|DIS|EMA|ESN|EDS|ESA|EXO|EXP|EXT|GSH|LON|RPO|PTA|PDD|PGN|RCN|REF|RGN|SIS|SFO|SDA|TDA|TDD|TRA|TDP|USP)-[0-9]{4}|(ACL|ASN)-(MNA|TRE)-[A-Z0-9]{4})_(EXT|REF|PGN|CON|DEN|LON|RGN|TRA|ALM|AGA|USP|DIS|CMN|EXO)_JSON\.zip$"
+
+regex.register_all(globals(), (
+    "VERSION_REGEX", "RFC_CONTR_REGEX", "MODALITY_PERMISSION_REGEX", "UTC_FORMAT_REGEX", "SUBPRODUCTO_REGEX",
+    "CONDENSEDGAS_REGEX", "RFC_PERSONA_FISICA", "FILE_NAME_REGEX",
+    ))
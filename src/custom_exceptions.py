@@ -61,3 +61,9 @@ class ValorError(BaseError):
 
 class ProductoError(BaseError):
     """Custom Producto and SubProducto error."""
+
+class DuplicadoError(BaseError):
+    """Custom duplicated value error."""
+
+class ClienteDesconectadoError(BaseError):
+    """The client disconnected before its validation finished."""
@@ -1,33 +1,103 @@
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
 from src.custom_exceptions import TipadoError
+from src.utils.definitions import Definition
+
+# (tipo esperado, nombre del tipo, validador de definiciones como CantidadMonetaria)
+FieldType = Tuple[type, str, Optional[Callable[[object], Optional[str]]]]
+
+
+def _definition_validator(expected_type: type) -> Optional[Callable[[object], Optional[str]]]:
+    """Validator of a definition such as CantidadMonetaria, None for plain types."""
+    if issubclass(expected_type, Definition):
+        return expected_type.validate
+    return None
+
+
+class SchemaChecker:
+    """Type checker of one dict_types schema, built once with the expected type, its name
+    and, for definitions, the validator of every key."""
+    __slots__ = ("dict_type", "_fields")
+
+    def __init__(self, dict_type: Dict[str, type]) -> None:
+        self.dict_type = dict_type
+        self._fields: Dict[str, FieldType] = {
+            key: (
+                expected_type,
+                expected_type.__name__,
+                _definition_validator(expected_type=expected_type),
+                )
+            for key, expected_type in dict_type.items()
+            }
+
+    def errors(self, record: dict, definitions: bool = True) -> List[dict]:
+        """Every type mismatch of record, in key order of record.\n
+        :param definitions: False skips range and decimals of definitions, for records whose
+        numbers were already checked by ``vector_bounds``.\n
+        :return: List of {"type_err", "err_message"} dicts, empty when record is valid."""
+        errors = []
+        fields = self._fields
+        for key, value in record.items():
+            if (field := fields.get(key)) is None:
+                continue
+            expected_type, type_name, validator = field
+            if isinstance(value, expected_type):
+                continue
+            if validator is not None:
+                if definitions and (message := validator(value)) is not None:
+                    errors.append({
+                        "type_err": TipadoError,
+                        "err_message": f"Error: Clave {key} no usa la definición {type_name}{message}"
+                        })
+                continue
+            errors.append({
+                "type_err": TipadoError,
+                "err_message": f"Error: Clave {key} no es de tipo {type_name}"
+                })
+        return errors
+
+    def errors_many(self, records: Iterable[dict]) -> List[Tuple[int, dict]]:
+        """Type mismatches of a list of same-shaped records, e.g. a CFDIs array.\n
+        :return: List of (record index, error dict)."""
+        errors = self.errors
+        return [(index, err) for index, record in enumerate(records) for err in errors(record)]
 
 
 class DictionaryTypeValidator:
     """Class for validate values type in dictionaries."""
+    _checkers: Dict[int, SchemaChecker] = {}
 
     @classmethod
-    def validate_dict_type(cls, dict_to_validate: dict, dict_type: dict[str, type]) -> bool:
-        """Validate type values in dictionary based on base dict typing."""
-        for key, value in dict_to_validate.items():
-            if key not in dict_type:
-                continue
-            if not isinstance(value, dict_type[key]):
-                key_type = str(dict_type[key])
-                expected_type = dict_type[key]
-                type_extracted = key_type.split("'")[1]
-
-                if hasattr(expected_type, 'min_val') and hasattr(expected_type, 'max_val'):
-                    try:
-                        value = expected_type(value)
-                        return
-                    except (TypeError, ValueError) as e:
-                        return {
-                            "type_err": TipadoError,
-                            "err_message": f"Error: Clave {key} no usa la definición {expected_type.__name__}{e}"
-                        }
-                if "." in type_extracted:
-                    print("TYP EXPECTED HAY UN PUNTO VER SI ESTE I SIRVE A FUTURO.")
-                    type_extracted = type_extracted.split(".")[-1]
-                return {
-                    "type_err": TipadoError,
-                    "err_message": f"Error: Clave {key} no es de tipo {type_extracted}"
-                    }
+    def checker(cls, dict_type: Dict[str, type]) -> SchemaChecker:
+        """Compiled checker of a schema, built on first use.\n
+        :return: SchemaChecker."""
+        if (checker := cls._checkers.get(id(dict_type))) is None or checker.dict_type is not dict_type:
+            checker = SchemaChecker(dict_type=dict_type)
+            cls._checkers[id(dict_type)] = checker
+        return checker
+
+    @classmethod
+    def validate_dict_type(cls, dict_to_validate: dict, dict_type: dict[str, type]) -> Optional[dict]:
+        """Validate type values in dictionary based on base dict typing.\n
+        :return: First type error or None."""
+        if errors := cls.checker(dict_type).errors(dict_to_validate):
+            return errors[0]
+        return None
+
+    @classmethod
+    def validate_dict_types(
+            cls,
+            dict_to_validate: dict,
+            dict_type: dict[str, type],
+            definitions: bool = True,
+        ) -> List[dict]:
+        """Validate type values in dictionary based on base dict typing.\n
+        :param definitions: False skips range and decimals of definitions.\n
+        :return: Every type error."""
+        return cls.checker(dict_type).errors(dict_to_validate, definitions=definitions)
+
+    @classmethod
+    def validate_many(cls, dicts_to_validate: Iterable[dict], dict_type: dict[str, type]) -> List[Tuple[int, dict]]:
+        """Validate type values of a list of dictionaries sharing the same typing.\n
+        :return: List of (dictionary index, type error)."""
+        return cls.checker(dict_type).errors_many(dicts_to_validate)
@@ -83,7 +83,6 @@ com_comp_cfdis = {
     "Cfdi": str,
     "TipoCfdi": str,
     "PrecioVentaOCompraOContrap": CantidadMonetaria,
-    "VolumenDocumentado": CantidadMonetaria,
     "FechaYHoraTransaccion": str,
     # "VolumenDocumentado": ,
 }
@@ -93,6 +92,11 @@ complement_foreign = {
     "Pedimentos": list,
 }
 
+complement_foreign_io = {
+    "PermisoImportacionOExportacion": str,
+    "Pedimentos": list,
+}
+
 compl_foreign_pedimentos = {
     "PuntoDeInternacion": str,
     "PaisOrigen": str,
@@ -117,6 +121,83 @@ terminal_alm = {
     "CargoVolumetricoAlmac": CantidadMonetaria,
 }
 
+terminal_alm_permiso = {
+    "TerminalAlm": str,
+    "PermisoAlmacenamiento": str,
+    "TarifaDeAlmacenamiento": CantidadMonetaria,
+    "CargoPorCapacidadAlmac": CantidadMonetaria,
+    "CargoPorUsoAlmac": CantidadMonetaria,
+    "CargoVolumetricoAlmac": CantidadMonetaria,
+}
+
+terminal_transport = {
+    "PermisoTransporte": str,
+    "ClaveDeVehiculo": str,
+    "TarifaDeTransporte": CantidadMonetaria,
+    "CargoPorCapacidadTransporte": CantidadMonetaria,
+    "CargoPorUsoTrans": CantidadMonetaria,
+    "CargoVolumetricoTrans": CantidadMonetaria,
+    "TarifaDeSuministro": CantidadMonetaria,
+}
+
+comercialization_transport = {
+    "PermisoTransporte": str,
+    "ClaveDeVehiculo": str,
+    "TarifaDeTransporte": CantidadMonetaria,
+    "CargoPorCapacidadTrans": CantidadMonetaria,
+    "CargoPorUsoTrans": CantidadMonetaria,
+    "CargoVolumetricoTrans": CantidadMonetaria,
+}
+
+transport_terminal = {
+    "TerminalAlmYDist": str,
+    "PermisoAlmYDist": str,
+}
+
+complement_national_client = {
+    "RfcClienteOProveedor": str,
+    "NombreClienteOProveedor": str,
+    "PermisoClienteOProveedor": str,
+    "CFDIs": list,
+}
+
+complement_client = {
+    "RfcCliente": str,
+    "NombreCliente": str,
+    "CFDIs": list,
+}
+
+cdlrgn_cfdis = {
+    "Cfdi": str,
+    "TipoCfdi": str,
+    "Contraprestacion": CantidadMonetaria,
+    "FechaYHoraTransaccion": str,
+    # "VolumenDocumentado": ,
+}
+
+expenditure_cfdis = {
+    "Cfdi": str,
+    "TipoCfdi": str,
+    "PrecioCompra": CantidadMonetaria,
+    "PrecioDeVentaAlPublico": CantidadMonetaria,
+    "PrecioVenta": CantidadMonetaria,
+    "FechaYHoraTransaccion": str,
+    # "VolumenDocumentado": ,
+}
+
+transport_cfdis = {
+    "Cfdi": str,
+    "TipoCfdi": str,
+    "Contraprestacion": CantidadMonetaria,
+    "TarifaDeTransporte": CantidadMonetaria,
+    "CargoPorCapacidadDeTrans": CantidadMonetaria,
+    "CargoPorUsoTrans": CantidadMonetaria,
+    "CargoVolumetricoTrans": CantidadMonetaria,
+    "Descuento": CantidadMonetaria,
+    "FechaYHoraTransaccion": str,
+    # "VolumenDocumentado": ,
+}
+
 # month_report_dict = {
 #     "ControlDeExistencias": {
 #         "VolumenExistenciasMes": float,
@@ -138,3 +138,16 @@ class PermisoEnum(Enum):
     PER54 = "SENER-REF-XXX-AAAA"
     PER55 = "SENER-TP-XXX-AAAA"
     PER56 = "SENER-CPG-XXX-AAAA"
+
+class EchoModeEnum(Enum):
+    """How /upload/ returns the submitted json in 'json_data'."""
+    NONE = "none"
+    RAW = "raw"
+    PRETTY = "pretty"
+
+class JobStatusEnum(Enum):
+    """Background validation job status."""
+    QUEUED = "queued"
+    RUNNING = "running"
+    FINISHED = "finished"
+    FAILED = "failed"
@@ -1,17 +1,53 @@
 """This module handle FastAPI instance"""
+import asyncio
 import json
 import os
-from typing import Any, Dict, List, Union
+from contextlib import asynccontextmanager
+from typing import Any, Dict, List, Optional, Union
 
-from fastapi import FastAPI, File, UploadFile
+from fastapi import FastAPI, File, Form, HTTPException, Query, Request, UploadFile
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, Response, StreamingResponse
 from fastapi.staticfiles import StaticFiles
-
-from src.json_validator import JsonValidator
-
-
-app = FastAPI()
+from starlette.datastructures import UploadFile as StarletteUploadFile
+
+from src.archive_stream import archive_kind, save_upload, validate_file
+from src.batch_validator import BATCH_MAX_FILES, validate_batch
+from src.custom_exceptions import ClienteDesconectadoError
+from src.enumerators import EchoModeEnum
+from src.job_store import JOBS_HEARTBEAT_SECONDS, job_store
+from src.result_cache import result_cache, upload_key
+from src.utils.logger import logger
+from src.validation_pool import (check_callback_url, run_in_pool,
+                                 shutdown_pool, start_pool, submit_job,
+                                 validate_upload)
+
+logging = logger()
+
+
+async def _watch_jobs() -> None:
+    """Renew the heartbeat of this process and fail the jobs of the stopped ones."""
+    while True:
+        try:
+            await asyncio.to_thread(job_store.heartbeat)
+            if failed := await asyncio.to_thread(job_store.fail_orphaned):
+                logging.warning(f"{failed} trabajo(s) sin terminar de un proceso detenido marcados como fallidos.")
+        except Exception as exc:
+            logging.error(f"Error al revisar los trabajos pendientes: {exc}")
+        await asyncio.sleep(JOBS_HEARTBEAT_SECONDS)
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    """Start the validation workers with the app and stop them on shutdown."""
+    await start_pool()
+    watcher = asyncio.create_task(_watch_jobs())
+    yield
+    watcher.cancel()
+    shutdown_pool()
+
+
+app = FastAPI(lifespan=lifespan)
 
 app.add_middleware(
     middleware_class=CORSMiddleware,
@@ -29,45 +65,165 @@ async def read_root():
     """Render json validator."""
     return open("src/static/index.html", "rb").read()
 
-@app.post("/upload/")
-async def upload_json(file: UploadFile = File(...)) -> Dict[str, Union[str, List, Any]]:
-    """Upload json file endppoint."""
+@app.post("/upload/", response_model=None)
+async def upload_json(
+        request: Request,
+        file: UploadFile = File(...),
+        stream: bool = False,
+        echo: EchoModeEnum = EchoModeEnum.PRETTY,
+        dry_run: bool = False,
+    ) -> Union[Dict[str, Union[str, List, Any]], Response]:
+    """Upload json file endppoint.\n
+    :param stream: read the upload by chunks and validate each Producto while parsing,
+    the response omits 'json_data'.
+    :param echo: 'pretty' returns the json re-serialized with indent as a string, 'raw' returns
+    the uploaded bytes unchanged as a json value and 'none' omits 'json_data'.
+    :param dry_run: check the CFDIs against the history of earlier periods without recording
+    this report, see CHECK_CFDI_HISTORY.
+    Gzip and zip uploads are always streamed without 'json_data', zip member errors carry 'filename'."""
     try:
-        content = await file.read()
-        content = content.decode("UTF-8", errors="replace")
-
-        json_data = json.loads(content)
-
-        # Validamos el JSON
-        validator = JsonValidator(json_report=json_data)
-        validator.set_json()
-        validator.validate_json_name(name=file.filename)
-        validator.validate_json()
-
-        errors = validator.get_errors()
-
-        error_list = []
-        for error in errors:
-            error_list.append({
-                "type_error": error.get("type_error", "Desconocido"),
-                "error": error.get("error", "Sin mensaje"),
-                "source": error.get("source", "Objeto no encontrado.")
-            })
-
-        error_list.extend(
-            {
-                "type_error": "Decodificación",
-                "error": f"Caracter encontrado: '{char}' en linea '{ind}'",
-            }
-            for ind, char in enumerate(content)
-            if char == "�")
-
-        formatted_json = json.dumps(json_data, indent=4)
-
-        return {"json_data": formatted_json, "errors": error_list}
+        # Sin caché no se calcula el hash de la carga.
+        cache_key = await upload_key(file) if result_cache.enabled else None
+        if (kind := archive_kind(file.file)) or stream:
+            return await _upload_by_chunks(file=file, kind=kind, cache_key=cache_key, dry_run=dry_run, request=request)
+
+        # El resultado con 'json_data' formateado se guarda por separado.
+        if echo is EchoModeEnum.PRETTY and cache_key is not None:
+            cache_key += ":pretty"
+
+        raw_content = None
+        if (result := result_cache.get(cache_key)) is None:
+            raw_content = await file.read()
+            result = await run_in_pool(
+                validate_upload,
+                content=raw_content,
+                filename=file.filename,
+                pretty=echo is EchoModeEnum.PRETTY,
+                record_history=not dry_run,
+                request=request,
+                )
+            result_cache.put(cache_key, result)
+        error_list = result["errors"]
+
+        if echo is EchoModeEnum.NONE:
+            return {"errors": error_list}
+
+        if echo is EchoModeEnum.RAW:
+            if raw_content is None:
+                raw_content = await file.read()
+            # Los bytes con secuencias inválidas se devuelven ya decodificados.
+            if not result["valid_utf8"]:
+                raw_content = raw_content.decode("UTF-8", errors="replace").encode("UTF-8")
+            return _raw_echo_response(raw_json=raw_content, errors=error_list)
+
+        return {"json_data": result["json_data"], "errors": error_list}
+
+    except ClienteDesconectadoError:
+        return {"Error": "Validación cancelada, el cliente se desconectó."}
 
     except json.JSONDecodeError as e:
         return {"Error": f"Error al cargar el archivo: {str(e)}"}
 
     except Exception as exc:
         return {"Error": f"Error al cargar el archivo: {str(exc)}"}
+
+
+@app.post("/batch")
+async def upload_batch(request: Request) -> StreamingResponse:
+    """Validate the json files sent as multipart 'files', or the members of zip archives, in parallel.\n
+    :return: NDJSON stream with one {'index', 'filename', 'errors'} object per file in
+    completion order."""
+    # El formulario se lee aquí para que los archivos sigan abiertos mientras se envía la respuesta.
+    form = await request.form(max_files=BATCH_MAX_FILES)
+    files = [item for item in form.getlist("files") if isinstance(item, StarletteUploadFile)]
+    if not files:
+        await form.close()
+        raise HTTPException(status_code=422, detail="Error: no se recibieron archivos en 'files'.")
+    return StreamingResponse(validate_batch(files=files), media_type="application/x-ndjson")
+
+
+@app.post("/jobs")
+async def create_job(
+        file: UploadFile = File(...),
+        callback_url: Optional[str] = Form(None),
+    ) -> Dict[str, str]:
+    """Queue a json file validation and return its job id right away.\n
+    :param callback_url: http(s) url that receives the final job status by POST."""
+    if callback_url:
+        try:
+            await asyncio.to_thread(check_callback_url, callback_url)
+        except ValueError as exc:
+            raise HTTPException(status_code=422, detail=str(exc)) from exc
+
+    content = await file.read()
+    job_id = await asyncio.to_thread(job_store.create_job, filename=file.filename, callback_url=callback_url)
+    submit_job(job_id=job_id, content=content, filename=file.filename)
+    job = await asyncio.to_thread(job_store.get_job, job_id)
+    return {"id": job_id, "status": job["status"]}
+
+
+@app.get("/jobs/{job_id}")
+async def get_job(
+        job_id: str,
+        offset: int = Query(0, ge=0),
+        limit: int = Query(100, ge=1, le=1000),
+    ) -> Dict[str, Any]:
+    """Return job status, progress and one page of its errors."""
+    if (job := await asyncio.to_thread(job_store.get_job, job_id)) is None:
+        raise HTTPException(status_code=404, detail="Error: trabajo no encontrado.")
+    errors = await asyncio.to_thread(job_store.get_errors, job_id, offset=offset, limit=limit)
+
+    response = {
+        "id": job["id"],
+        "filename": job["filename"],
+        "status": job["status"],
+        "progress": job["progress"],
+        "total_errors": job["total_errors"],
+        "offset": offset,
+        "limit": limit,
+        "errors": errors,
+        }
+    if job["error"]:
+        response["Error"] = job["error"]
+    return response
+
+
+async def _upload_by_chunks(
+        file: UploadFile,
+        kind: Optional[str],
+        cache_key: Optional[str],
+        dry_run: bool,
+        request: Request,
+    ) -> Dict[str, List]:
+    """Validate a json, gzip or zip upload on the pool reading it by chunks, so the worker
+    keeps one Producto in memory at a time. The upload is copied to a temporary file the
+    worker reads."""
+    if (result := result_cache.get(cache_key)) is None:
+        path = await asyncio.to_thread(save_upload, file.file)
+        try:
+            result = await run_in_pool(
+                validate_file, path=path, kind=kind, filename=file.filename, record_history=not dry_run,
+                request=request,
+                )
+        finally:
+            os.unlink(path)
+        result_cache.put(cache_key, result)
+    return {"errors": result["errors"]}
+
+
+@app.get("/cache/stats")
+async def cache_stats() -> Dict[str, Any]:
+    """Result cache counters of this process."""
+    return result_cache.stats()
+
+
+def _raw_echo_response(raw_json: bytes, errors: List[Dict[str, str]]) -> Response:
+    """Build the response around the uploaded bytes without serializing the parsed json again."""
+    body = b"".join((
+        b'{"json_data":',
+        raw_json,
+        b',"errors":',
+        json.dumps(errors, ensure_ascii=False).encode("UTF-8"),
+        b"}",
+        ))
+    return Response(content=body, media_type="application/json")
@@ -0,0 +1,177 @@
+"""This module stores background validation jobs in SQLite."""
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+
+from src.enumerators import JobStatusEnum
+
+JOBS_DB_PATH = os.getenv("JOBS_DB_PATH", os.path.join(tempfile.gettempdir(), "json_validator_jobs.db"))
+JOBS_RETENTION_SECONDS = int(os.getenv("JOBS_RETENTION_SECONDS", str(24 * 60 * 60)))
+# Cada proceso de la API renueva su registro con esta frecuencia; los trabajos de un proceso sin
+# registro reciente quedaron sin ejecutar y se marcan como fallidos.
+JOBS_HEARTBEAT_SECONDS = float(os.getenv("JOBS_HEARTBEAT_SECONDS", "10"))
+JOBS_OWNER_TIMEOUT_SECONDS = float(os.getenv("JOBS_OWNER_TIMEOUT_SECONDS", str(3 * JOBS_HEARTBEAT_SECONDS)))
+ORPHANED_MESSAGE = "Error: el servidor se reinició antes de terminar la validación, envíe el archivo de nuevo."
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    filename TEXT,
+    status TEXT NOT NULL,
+    progress TEXT NOT NULL DEFAULT '{}',
+    error TEXT,
+    callback_url TEXT,
+    owner TEXT,
+    total_errors INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS job_errors (
+    job_id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    type_error TEXT,
+    error TEXT,
+    source TEXT,
+    PRIMARY KEY (job_id, position)
+);
+CREATE TABLE IF NOT EXISTS job_owners (
+    owner TEXT PRIMARY KEY,
+    seen_at REAL NOT NULL
+);
+"""
+_UNFINISHED = (JobStatusEnum.QUEUED.value, JobStatusEnum.RUNNING.value)
+
+
+class JobStore:
+    """Jobs and their paginated results, shared by the API and the worker processes.
+
+    Every process and thread opens its own connection; WAL lets workers write progress
+    while the API reads it. A job belongs to the API process that queued it, which keeps
+    its owner row alive with ``heartbeat``; the content of a job only lives in that process,
+    so ``fail_orphaned`` marks as failed the unfinished jobs of an owner that stopped."""
+
+    def __init__(self, path: str = JOBS_DB_PATH) -> None:
+        self.path = path
+        self.owner = uuid.uuid4().hex
+        self._local = threading.local()
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+            if "owner" not in {row["name"] for row in conn.execute("PRAGMA table_info(jobs)")}:
+                # Base de datos creada antes de registrar el proceso de cada trabajo.
+                conn.execute("ALTER TABLE jobs ADD COLUMN owner TEXT")
+            self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+
+    def create_job(self, filename: str, callback_url: Optional[str] = None) -> str:
+        """Register a queued job owned by this process and drop the expired ones.\n
+        :return: job id."""
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        self.purge(older_than=now - JOBS_RETENTION_SECONDS)
+        self.conn.execute(
+            "INSERT INTO jobs (id, filename, status, callback_url, owner, created_at, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (job_id, filename, JobStatusEnum.QUEUED.value, callback_url, self.owner, now, now),
+            )
+        return job_id
+
+    def heartbeat(self) -> None:
+        """Mark this process as alive, the owner of its queued and running jobs.\n
+        :return: None."""
+        self.conn.execute(
+            "INSERT INTO job_owners (owner, seen_at) VALUES (?, ?) "
+            "ON CONFLICT (owner) DO UPDATE SET seen_at = excluded.seen_at",
+            (self.owner, time.time()),
+            )
+
+    def fail_orphaned(self, timeout: float = JOBS_OWNER_TIMEOUT_SECONDS) -> int:
+        """Mark as failed the queued and running jobs whose owner process did not renew its
+        heartbeat in the last timeout seconds, e.g. after a restart.\n
+        :return: number of jobs marked as failed."""
+        now = time.time()
+        with self.conn:
+            self.conn.execute("BEGIN")
+            cursor = self.conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, updated_at = ? "
+                "WHERE status IN (?, ?) AND (owner IS NULL OR owner NOT IN "
+                "(SELECT owner FROM job_owners WHERE seen_at >= ?))",
+                (JobStatusEnum.FAILED.value, ORPHANED_MESSAGE, now, *_UNFINISHED, now - timeout),
+                )
+            self.conn.execute("DELETE FROM job_owners WHERE seen_at < ?", (now - timeout,))
+        return cursor.rowcount
+
+    def set_status(self, job_id: str, status: JobStatusEnum, error: Optional[str] = None) -> None:
+        """Update job status.\n
+        :return: None."""
+        self.conn.execute(
+            "UPDATE jobs SET status = ?, error = ?, updated_at = ? WHERE id = ?",
+            (status.value, error, time.time(), job_id),
+            )
+
+    def update_progress(self, job_id: str, progress: Dict[str, Any]) -> None:
+        """Store the progress counters of a running job.\n
+        :return: None."""
+        self.conn.execute(
+            "UPDATE jobs SET progress = ?, updated_at = ? WHERE id = ?",
+            (json.dumps(progress), time.time(), job_id),
+            )
+
+    def save_results(self, job_id: str, errors: List[Dict[str, str]]) -> None:
+        """Store the validation errors and mark the job as finished.\n
+        :return: None."""
+        with self.conn:
+            self.conn.execute("BEGIN")
+            self.conn.execute("DELETE FROM job_errors WHERE job_id = ?", (job_id,))
+            self.conn.executemany(
+                "INSERT INTO job_errors (job_id, position, type_error, error, source) VALUES (?, ?, ?, ?, ?)",
+                (
+                    (job_id, position, error.get("type_error"), error.get("error"), error.get("source"))
+                    for position, error in enumerate(errors)
+                    ),
+                )
+            self.conn.execute(
+                "UPDATE jobs SET status = ?, total_errors = ?, updated_at = ? WHERE id = ?",
+                (JobStatusEnum.FINISHED.value, len(errors), time.time(), job_id),
+                )
+
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Return the job row as dict, None if it does not exist."""
+        row = self.conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        job = dict(row)
+        job["progress"] = json.loads(job["progress"])
+        return job
+
+    def get_errors(self, job_id: str, offset: int = 0, limit: int = 100) -> List[Dict[str, str]]:
+        """Return one page of job errors in their original order."""
+        rows = self.conn.execute(
+            "SELECT type_error, error, source FROM job_errors WHERE job_id = ? "
+            "ORDER BY position LIMIT ? OFFSET ?",
+            (job_id, limit, offset),
+            )
+        return [{key: value for key, value in dict(row).items() if value is not None} for row in rows]
+
+    def purge(self, older_than: float) -> None:
+        """Delete jobs and results last updated before the given timestamp.\n
+        :return: None."""
+        with self.conn:
+            self.conn.execute("BEGIN")
+            self.conn.execute(
+                "DELETE FROM job_errors WHERE job_id IN (SELECT id FROM jobs WHERE updated_at < ?)", (older_than,))
+            self.conn.execute("DELETE FROM jobs WHERE updated_at < ?", (older_than,))
+
+
+job_store = JobStore()
@@ -1,82 +1,77 @@
-import re 
+"""This module holds the root model of a monthly report."""
+from collections.abc import Mapping
+from typing import Any, Iterator, Set, Tuple
+
 from src.constants import caracteres
 
-class JsonRoot():
-    """Json class for Month and Daily structure."""
+# Claves raíz del reporte mensual, antes de las que dependen del caracter.
+MONTH_ROOT_KEYS = (
+    "Version",
+    "RfcContribuyente",
+    "RfcRepresentanteLegal",
+    "RfcProveedor",
+    "Caracter",
+    "ModalidadPermiso",
+    "NumPermiso",
+    "NumContratoOAsignacion",
+    "InstalacionAlmacenGasNatural",
+    "ClaveInstalacion",
+    "DescripcionInstalacion",
+    "NumeroPozos",
+    "NumeroTanques",
+    "NumeroDuctosEntradaSalida",
+    "NumeroDuctosTransporteDistribucion",
+    "NumeroDispensarios",
+    "FechaYHoraReporteMes",
+    "Producto",
+    "BitacoraMensual",
+    )
+
+# Claves que solo corresponden a algún caracter.
+_CARACTER_KEYS = frozenset(key for keys in caracteres.values() for key in keys)
+
+
+class JsonRoot(Mapping):
+    """Read-only view of the root object of one report.
+
+    The view keeps a reference to the parsed dict, nothing is copied and nothing is shared
+    between reports, so validators of different reports can run at once in threads."""
+    __slots__ = ("_data",)
+
+    def __init__(self, json_data: dict) -> None:
+        self._data = json_data
+
+    def __getitem__(self, key: str) -> Any:
+        return self._data[key]
 
-    month_root = {
-        "sVersion": "",
-        "RfcContribuyente": "",
-        "RfcRepresentanteLegal": "",
-        "RfcProveedor": "",
-        # "RfcProveedores": "",
-        "Caracter": "",
-        "ModalidadPermiso": "",
-        "NumPermiso": "",
-        "NumContratoOAsignacion": "",
-        "InstalacionAlmacenGasNatural": "",
-        "ClaveInstalacion": "",
-        "DescripcionInstalacion": "",
-        # "Geolocalizacion": "",
-        "NumeroPozos": "",
-        "NumeroTanques": "",
-        "NumeroDuctosEntradaSalida": "",
-        "NumeroDuctosTransporteDistribucion": "",
-        "NumeroDispensarios": "",
-        "FechaYHoraReporteMes": "",
-        "Producto": "",
-        "BitacoraMensual": ""
-        }
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._data)
 
-    daily_root = {
-        "Version": "",
-        "RfcContribuyente": "",
-        "RfcRepresentanteLegal": "",
-        "RfcProveedor": "",
-        "RfcProveedores": "",
-        "Caracter": "",
-        "ModalidadPermiso": "",
-        "NumPermiso": "",
-        "NumContratoOAsignacion": "",
-        "InstalacionAlmacenGasNatural": "",
-        "ClaveInstalacion": "",
-        "DescripcionInstalacion": "",
-        "Geolocalizacion": "",
-        "NumeroPozos": "",
-        "NumeroTanques": "",
-        "NumeroDuctosEntradaSalida": "",
-        "NumeroDuctosTransporteDistribucion": "",
-        "NumeroDispensarios": "",
-        "FechaYHoraReporteMes": "",
-        "Producto": "",
-        }
+    def __len__(self) -> int:
+        return len(self._data)
 
-    @classmethod
-    def set_caracter_structure(cls, caracter: str) -> None:
-        # print(cls.month_root, "BEFO")
-        # cls.month_root["caracter"] = caracter
-        caracter_keys = caracteres.copy().pop(caracter)
-        useless_keys = [value for values in caracteres.values() for value in values]
-        useless_keys = list(set(useless_keys) - set(caracter_keys))
-        for useless_key in useless_keys:
-            cls.month_root.pop(useless_key, None)
+    @property
+    def caracter(self) -> Any:
+        return self._data.get("Caracter")
 
-    @classmethod
-    def set_rfc_proveedores(cls, rfc: str) -> None:
-        cls.month_root["RfcProveedores"] = rfc
+    def required_keys(self) -> Tuple[str, ...]:
+        """Root keys of the report for its Caracter.\n
+        :raise KeyError: if Caracter is not a known caracter.\n
+        :return: Tuple of keys."""
+        caracter_keys = caracteres[self.caracter]
+        return tuple(key for key in MONTH_ROOT_KEYS if key not in _CARACTER_KEYS or key in caracter_keys)
 
-    @classmethod
-    def set_geolocalization(cls, geo_dict: dict) -> None:
-        cls.month_root["Geolocalizacion"] = geo_dict
+    def missing_keys(self) -> Set[str]:
+        """Required keys that the report does not declare.\n
+        :return: Set of keys."""
+        return {key for key in self.required_keys() if key not in self._data}
 
-    @classmethod
-    def set_json(cls, json_data) -> None:
+    def check_keys(self) -> None:
+        """Check that the report declares every required key.\n
+        :raise KeyError: if Caracter is unknown or a key is missing.\n
+        :return: None."""
         try:
-            if all(key in json_data for key in cls.month_root):
-                for key, value in json_data.items():
-                    cls.month_root[key] = value
-            else:
-                missing_keys = set(cls.month_root) - set(json_data)
+            if missing_keys := self.missing_keys():
                 raise KeyError(f"La(s) clave(s) {missing_keys} no se encuentra(n) en el JSON proporcionado.")
         except Exception as exc:
             raise KeyError(f"Error: al crear JSON {str(exc)}") from exc
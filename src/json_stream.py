@@ -0,0 +1,253 @@
+"""This module handles incremental parsing of uploaded JSON reports."""
+import json
+import os
+import re
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+from src.utils.decode_errors import DecodeErrorLocator
+from src.utils.definitions import parse_json_float
+
+CHUNK_SIZE = int(os.getenv("UPLOAD_CHUNK_SIZE", str(64 * 1024)))
+# Registros que esperan a una clave declarada después de ellos: productos leídos antes de
+# 'Caracter' y CFDIs leídos antes de 'TipoComplemento'. Los que exceden el límite se reportan.
+STREAM_PENDING_PRODUCTS = int(os.getenv("STREAM_PENDING_PRODUCTS", "64"))
+STREAM_PENDING_CFDIS = int(os.getenv("STREAM_PENDING_CFDIS", "100000"))
+
+_CFDIS_PATH = ("Complemento", "*", "Nacional", "*", "CFDIs", "*")
+STREAM_PATHS = (
+    ("Producto", "*"),
+    ("BitacoraMensual", "*"),
+    ("Producto", "*", "ReporteDeVolumenMensual", "Recepciones") + _CFDIS_PATH,
+    ("Producto", "*", "ReporteDeVolumenMensual", "Entregas") + _CFDIS_PATH,
+    )
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_NUMBER_CHARS = frozenset("0123456789.eE+-")
+
+Path = Tuple[Union[str, int], ...]
+
+
+class _Frame:
+    """Container being read: its value, concrete path, pattern path and parse state."""
+    __slots__ = ("value", "path", "pattern", "is_array", "detached", "state", "key", "index")
+
+    def __init__(self, value: Union[dict, list], path: Path, pattern: Tuple[str, ...], detached: bool) -> None:
+        self.value = value
+        self.path = path
+        self.pattern = pattern
+        self.is_array = isinstance(value, list)
+        self.detached = detached
+        self.state = "item_or_end" if self.is_array else "key_or_end"
+        self.key = None
+        self.index = 0
+
+
+class JsonStreamParser:
+    """Parse a top level JSON object fed by chunks, emitting records as they close.
+
+    ``stream_paths`` are key paths where ``"*"`` stands for any array index. A value whose
+    path matches one of them is handed to ``on_item(path, item)`` as soon as it closes and is
+    not kept, while containers on the way to a deeper path are read member by member. Arrays
+    of streamed records are left out of their parent and ``streamed`` keeps their length by
+    path, so the parser only holds the open containers and the record being read. Top level
+    members are stored in ``header``."""
+
+    def __init__(
+            self,
+            on_item: Callable[[Path, Any], None],
+            header: Optional[Dict[str, Any]] = None,
+            stream_paths: Iterable[Tuple[str, ...]] = STREAM_PATHS,
+        ) -> None:
+        self.on_item = on_item
+        self.header = {} if header is None else header
+        self.streamed: Dict[Path, int] = {}
+        self.decode_errors = DecodeErrorLocator()
+        self._leaves = frozenset(tuple(path) for path in stream_paths)
+        # Contenedor esperado en cada prefijo de una ruta: '[' si sigue un índice, '{' si sigue una clave.
+        self._descend = {
+            path[:depth]: "[" if path[depth] == "*" else "{"
+            for path in self._leaves
+            for depth in range(1, len(path))
+            }
+        self._json_decoder = json.JSONDecoder(parse_float=parse_json_float)
+        self._buffer = ""
+        self._pos = 0
+        self._offset = 0
+        self._final = False
+        self._retry_at = 0
+        self._state = "start"
+        self._stack: List[_Frame] = []
+
+    @property
+    def parents(self) -> List[Union[dict, list]]:
+        """Open containers from the top level object to the innermost one."""
+        return [frame.value for frame in self._stack]
+
+    def container(self, path: Path) -> Optional[Union[dict, list]]:
+        """Open container at a concrete path, e.g. ('Producto', 0, 'ReporteDeVolumenMensual').\n
+        :return: dict or list being read, None if no open container has that path."""
+        for frame in reversed(self._stack):
+            if frame.path == path:
+                return frame.value
+        return None
+
+    def feed(self, chunk: bytes) -> None:
+        """Decode a chunk of bytes and consume every complete value."""
+        self._buffer += self.decode_errors.decode(chunk)
+        self._parse()
+
+    def close(self) -> Dict[str, Any]:
+        """Flush pending bytes and check that the document is complete.\n
+        :return: Top level members that were not streamed."""
+        self._buffer += self.decode_errors.decode(b"", final=True)
+        self._final = True
+        self._parse()
+        if self._state != "done":
+            self._error("Expecting value" if self._state == "start" else "Unterminated object")
+        return self.header
+
+    def _parse(self) -> None:
+        while self._step():
+            pass
+        self._offset += self._pos
+        self._buffer = self._buffer[self._pos:]
+        self._pos = 0
+
+    def _step(self) -> bool:
+        """Advance one token; return False when more data is needed."""
+        char = self._next_char()
+        if char is None:
+            return False
+        if not self._stack:
+            if self._state != "start":
+                self._error("Extra data")
+            self._expect(char, "{")
+            self._state = "value"
+            self._stack.append(_Frame(value=self.header, path=(), pattern=(), detached=False))
+            return True
+
+        frame = self._stack[-1]
+        state = frame.state
+        if frame.is_array:
+            if state in ("item_or_end", "item"):
+                if char == "]" and state == "item_or_end":
+                    self._pos += 1
+                    self._close()
+                    return True
+                return self._value(frame, char)
+            if char == ",":
+                self._pos += 1
+                frame.state = "item"
+            else:
+                self._expect(char, "]")
+                self._close()
+        elif state in ("key_or_end", "key"):
+            if char == "}" and state == "key_or_end":
+                self._pos += 1
+                self._close()
+            elif char == '"':
+                if (key := self._decode_value()) is None:
+                    return False
+                frame.key = key[0]
+                frame.state = "colon"
+            else:
+                self._error("Expecting property name enclosed in double quotes")
+        elif state == "colon":
+            self._expect(char, ":")
+            frame.state = "value"
+        elif state == "value":
+            return self._value(frame, char)
+        elif char == ",":
+            self._pos += 1
+            frame.state = "key"
+        else:
+            self._expect(char, "}")
+            self._close()
+        return True
+
+    def _value(self, frame: _Frame, char: str) -> bool:
+        """Open the container at the cursor if it leads to a streamed path, else decode it whole."""
+        if frame.is_array:
+            path = frame.path + (frame.index,)
+            pattern = frame.pattern + ("*",)
+        else:
+            path = frame.path + (frame.key,)
+            pattern = frame.pattern + (frame.key,)
+
+        if self._descend.get(pattern) == char:
+            self._pos += 1
+            detached = char == "[" and pattern + ("*",) in self._leaves
+            if detached:
+                self.streamed[path] = 0
+            self._advance(frame)
+            self._stack.append(_Frame(value=[] if char == "[" else {}, path=path, pattern=pattern, detached=detached))
+            return True
+
+        if (decoded := self._decode_value()) is None:
+            return False
+        self._advance(frame)
+        self._store(frame, path, pattern, decoded[0])
+        return True
+
+    def _close(self) -> None:
+        frame = self._stack.pop()
+        if not self._stack:
+            self._state = "done"
+        elif not frame.detached:
+            self._store(self._stack[-1], frame.path, frame.pattern, frame.value)
+
+    def _store(self, parent: _Frame, path: Path, pattern: Tuple[str, ...], value: Any) -> None:
+        if pattern in self._leaves:
+            self.on_item(path, value)
+            self.streamed[parent.path] = path[-1] + 1
+        elif parent.is_array:
+            parent.value.append(value)
+        else:
+            parent.value[path[-1]] = value
+
+    @staticmethod
+    def _advance(frame: _Frame) -> None:
+        if frame.is_array:
+            frame.index += 1
+            frame.state = "item_comma"
+        else:
+            frame.state = "comma"
+
+    def _next_char(self) -> Optional[str]:
+        self._pos = _WHITESPACE.match(self._buffer, self._pos).end()
+        if self._pos >= len(self._buffer):
+            return None
+        return self._buffer[self._pos]
+
+    def _expect(self, char: str, expected: str) -> None:
+        if char != expected:
+            self._error(f"Expecting '{expected}' delimiter")
+        self._pos += 1
+
+    def _decode_value(self) -> Optional[tuple]:
+        """Decode the value at the cursor, or None if it is still incomplete.
+
+        Failed attempts wait until the pending text doubles, so a value that spans many
+        chunks is scanned a bounded number of times."""
+        pending = len(self._buffer) - self._pos
+        if not self._final and pending < self._retry_at:
+            return None
+        try:
+            value, end = self._json_decoder.raw_decode(self._buffer, self._pos)
+        except json.JSONDecodeError as exc:
+            if self._final:
+                self._error(exc.msg, exc.pos)
+            self._retry_at = pending * 2
+            return None
+        if not self._final and (end >= len(self._buffer) or self._buffer[end] in _NUMBER_CHARS):
+            # A number at the end of the buffer may continue in the next chunk.
+            self._retry_at = pending + 1
+            return None
+        self._retry_at = 0
+        self._pos = end
+        return (value,)
+
+    def _error(self, message: str, pos: Optional[int] = None) -> None:
+        pos = self._pos if pos is None else pos
+        raise json.JSONDecodeError(message, self._buffer, pos)
+
@@ -1,53 +1,232 @@
 """Json validation orchestrator."""
-import re
+import sqlite3
 import traceback
-
-from src.constants import (FILE_NAME_REGEX, MODALITY_PERMISSION_REGEX,
-                           RFC_CONTR_REGEX, RFC_PERSONA_FISICA,
-                           UTC_FORMAT_REGEX, VERSION_REGEX, caracteres,
+from collections import deque
+from typing import Any, Optional
+from uuid import UUID
+
+from src.complements.cfdi_history import (CHECK_CFDI_HISTORY,
+                                          HISTORY_MESSAGE, cfdi_history,
+                                          report_period)
+from src.complements.cfdi_index import (CHECK_DUPLICATE_CFDIS,
+                                        DUPLICATE_MESSAGE, CfdiIndex)
+from src.complements.enumerators import ComplementTypeEnum
+from src.complements.helpers import complement_builder
+from src.complements.totals import RECONCILE_TOTALS, DocumentTotals
+from src.constants import (MODALITY_PERMISSION_REGEX, RFC_CONTR_REGEX,
+                           RFC_PERSONA_FISICA, VERSION_REGEX, caracteres,
                            monthly_json_schema)
 from src.custom_exceptions import (CaracterAsignatarioError,
                                    CaracterContratistaError,
                                    CaracterPermisionarioError,
                                    CaracterUsuarioError, ClaveError,
-                                   LongitudError, RegexError, TipadoError,
-                                   ValorError, ValorMinMaxError)
+                                   DuplicadoError, LongitudError, RegexError,
+                                   TipadoError, ValorError, ValorMinMaxError)
 from src.decorators import exception_wrapper, wrapper_handler
 from src.enumerators import CaracterTypeEnum, PermisoEnum
 from src.json_model import JsonRoot
+from src.json_stream import (STREAM_PENDING_CFDIS, STREAM_PENDING_PRODUCTS,
+                             JsonStreamParser)
 from src.monthly_log import MonthlyLogValidator
+from src.product_pool import validate_products
 from src.product_validator import ProductValidator
 from src.utils.logger import logger
+from src.utils.progress import advance
+from src.utils.regex_registry import regex
 
 logging = logger()
 
 
 class JsonValidator():
     """Validates JSON strucutre according bound cases"""
-    def __init__(self, json_report: dict) -> None:
+    def __init__(self, json_report: dict, record_history: bool = True) -> None:
         self.json_report = json_report
-        self.json_model = JsonRoot
+        # False revisa el historial de CFDIs sin registrar el reporte, p. ej. en una prueba.
+        self.record_history = record_history
+        # Modelo raíz de este reporte, se crea en set_json.
+        self.json_model: Optional[JsonRoot] = None
         self.error = []
         self.errors = {}
         self._errors = []
         self.executed_functions = set()
-
-
-    def set_json(self) -> None:
-        """Make a copy of json and set copy structure according data."""
+        self._parser = None
+        self._streamed_errors = {"Producto": [], "BitacoraMensual": []}
+        self._pending_products = deque()
+        self._pending_cfdis = []
+        # Fuentes ya reportadas por exceder el límite de registros pendientes.
+        self._overflowed = set()
+        # (clave, objeto) del elemento Complemento de los últimos CFDIs leídos.
+        self._complement = None
+        # Totales por producto y sección de los CFDIs leídos, hasta validar su producto.
+        self._document_totals = {}
+        # UUIDs de todos los CFDIs del reporte, para encontrar los repetidos entre productos
+        # y los declarados en reportes de periodos anteriores.
+        self._cfdi_index = CfdiIndex() if CHECK_DUPLICATE_CFDIS or CHECK_CFDI_HISTORY else None
+        # (rfc, periodo, UUIDs) revisados contra el historial, se registran si el reporte es válido.
+        self._history = None
+
+    def stream_parser(self) -> JsonStreamParser:
+        """Return a parser that fills json_report and validates each Producto, BitacoraMensual
+        element and complement CFDI as soon as it is read."""
+        self._parser = JsonStreamParser(on_item=self.validate_streamed_item, header=self.json_report)
+        return self._parser
+
+    def validate_streamed_item(self, path: tuple, item: Any) -> None:
+        """Validate one streamed record and drop it.\n
+        :param path: Record path, ('Producto', i), ('BitacoraMensual', i) or the path of a CFDI
+        under Producto[i].ReporteDeVolumenMensual.\n
+        :return: None."""
         try:
-            json_copy = self.json_report.copy()
-            self.json_model.set_caracter_structure(caracter=self.json_report.get("Caracter"))
+            self._validate_streamed_item(path=path, item=item)
+        except Exception as exc:
+            # Como en validate_json, pero el error queda en el registro y se sigue con el siguiente.
+            source = "".join(f"[{part}]" if isinstance(part, int) else f".{part}" for part in path).lstrip(".")
+            self._streamed_errors["BitacoraMensual" if path[0] == "BitacoraMensual" else "Producto"].append({
+                "type_error": SystemError.__name__,
+                "error": f"Error al validar {path[0]} {exc}",
+                "source": source,
+                })
+            logging.warning(f"Error al validar {source}: {exc}")
+
+    def _validate_streamed_item(self, path: tuple, item: Any) -> None:
+        key = path[0]
+        if len(path) > 2:
+            self._validate_streamed_cfdi(path=path, cfdi=item)
+        elif key == "Producto":
+            self._flush_pending_cfdis(index=path[1], product=item)
+            if "Caracter" not in self.json_report:
+                if len(self._pending_products) >= STREAM_PENDING_PRODUCTS:
+                    self._pending_overflow(
+                        source=f"Producto[{path[1]}]", key="Caracter", before="Producto",
+                        limit=STREAM_PENDING_PRODUCTS, records="productos",
+                        )
+                    return
+                self._pending_products.append((path[1], item))
+                return
+            self._flush_pending_products()
+            self._validate_streamed_product(index=path[1], product=item)
+        elif key == "BitacoraMensual":
+            log_obj = MonthlyLogValidator(month_log=[item], offset=path[1])
+            log_obj.validate_log()
+            self._streamed_errors[key].extend(log_obj.errors)
+
+    def _validate_streamed_product(self, index: int, product: dict) -> None:
+        product_obj = ProductValidator(
+            products=[product], caracter=self.json_report.get("Caracter"), offset=index,
+            document_totals={index: self._document_totals.pop(index, {})}, cfdi_index=self._cfdi_index,
+            )
+        product_obj.validate_products()
+        self._streamed_errors["Producto"].extend(product_obj.errors)
 
-            if rfc_proveedores := self.json_report.get("RfcProveedores", None):
-                self.json_model.set_rfc_proveedores(rfc=rfc_proveedores)
-                json_copy.pop("RfcProveedores", None)
+    def _pending_overflow(self, source: str, key: str, before: str, limit: int, records: str) -> None:
+        """Report, once per source, the streamed records that are not validated because too
+        many records already wait for key."""
+        if source in self._overflowed:
+            return
+        self._overflowed.add(source)
+        self._streamed_errors["Producto"].append({
+            "type_error": ClaveError.__name__,
+            "error": (
+                f"Error: la clave '{key}' debe declararse antes de '{before}', no se validan más de "
+                f"{limit} {records} leídos antes de ella."
+                ),
+            "source": source,
+            })
+
+    def _flush_pending_products(self) -> None:
+        while self._pending_products:
+            index, product = self._pending_products.popleft()
+            self._validate_streamed_product(index=index, product=product)
+
+    def _validate_streamed_cfdi(self, path: tuple, cfdi: Any) -> None:
+        """Validate a CFDI with the complement type of its Complemento list, the CFDI waits
+        for the end of its Producto when TipoComplemento was not read yet."""
+        # path: Producto, i, ReporteDeVolumenMensual, sección, Complemento, j, Nacional, k, CFDIs, l
+        complements, complement = self._parser.container(path[:5]), self._parser.container(path[:6])
+        if complements is None or complement is None:
+            return
+        if not complements and "TipoComplemento" not in complement:
+            if len(self._pending_cfdis) >= STREAM_PENDING_CFDIS:
+                self._pending_overflow(
+                    source=f"Producto[{path[1]}].ReporteDeVolumenMensual.{path[3]}.Complemento[{path[5]}]",
+                    key="TipoComplemento", before="Nacional", limit=STREAM_PENDING_CFDIS, records="CFDIs",
+                    )
+                return
+            self._pending_cfdis.append((path, cfdi))
+            return
+        self._validate_cfdi(path=path, cfdi=cfdi, complement=complement, first=(complements or [complement])[0])
+
+    def _flush_pending_cfdis(self, index: int, product: Any) -> None:
+        pending, self._pending_cfdis = self._pending_cfdis, []
+        for path, cfdi in pending:
+            if path[1] != index:
+                self._pending_cfdis.append((path, cfdi))
+                continue
+            try:
+                complements = product["ReporteDeVolumenMensual"][path[3]]["Complemento"]
+                complement, first = complements[path[5]], complements[0]
+            except (KeyError, IndexError, TypeError):
+                continue
+            self._validate_cfdi(path=path, cfdi=cfdi, complement=complement, first=first)
+
+    def _validate_cfdi(self, path: tuple, cfdi: Any, complement: dict, first: Any) -> None:
+        """Validate a CFDI as MonthlyVolumeReportValidator does for its complement type, a CFDI
+        that breaks the validation is reported as SystemError with its source."""
+        comp_type = first.get("TipoComplemento") if isinstance(first, dict) else None
+        if not isinstance(comp_type, str) or comp_type not in {en.value for en in ComplementTypeEnum}:
+            return
+        _, product_index, _, section, _, comp_index, _, national_index, _, cfdi_index = path
+        prefix = f"Producto[{product_index}].ReporteDeVolumenMensual.{section}"
 
-            if geo_dict := self.json_report.get("Geolocalizacion", None):
-                self.json_model.set_geolocalization(geo_dict=geo_dict)
-                json_copy.pop("Geolocalizacion", None)
+        try:
+            complement_obj = self._streamed_complement(path=path, complement=complement, comp_type=comp_type)
+            errors = complement_obj.get_error_list()
+            start = len(errors)
+            complement_obj.validate_cfdi(cfdi=cfdi, national_index=national_index, cfdi_index=cfdi_index)
+        except Exception as exc:
+            source = f"{prefix}.Complemento[{comp_index}].Nacional[{national_index}].CFDIs[{cfdi_index}]"
+            self._streamed_errors["Producto"].append({
+                "type_error": SystemError.__name__,
+                "error": f"Error al validar CFDI {exc}",
+                "source": source,
+                })
+            logging.warning(f"Error al validar {source}: {exc}")
+            return
+        advance("cfdis")
+
+        for comp_err in errors[start:]:
+            if source := comp_err.get("source"):
+                comp_err["source"] = f"{prefix}.{source}"
+            self._streamed_errors["Producto"].append(comp_err)
+
+    def _streamed_complement(self, path: tuple, complement: dict, comp_type: str) -> Any:
+        """Complement object of the Complemento item holding the CFDI at path, built once per
+        item and reused by its CFDIs, which are streamed one after the other."""
+        _, product_index, _, section, _, comp_index = path[:6]
+        key = (product_index, section, comp_index, comp_type)
+        if self._complement is not None and self._complement[0] == key:
+            return self._complement[1]
+        complement_obj = complement_builder(complement_data=[complement], complement_type=comp_type, offset=comp_index)
+        if RECONCILE_TOTALS:
+            sections = self._document_totals.setdefault(product_index, {})
+            if (totals := sections.get(section)) is None:
+                totals = sections[section] = DocumentTotals(complement_type=comp_type, section=section)
+            complement_obj.totals = totals
+        complement_obj.cfdi_index, complement_obj.cfdi_scope = self._cfdi_index, (product_index, section)
+        self._complement = (key, complement_obj)
+        return complement_obj
+
+    def _streamed_count(self, key: str) -> Optional[int]:
+        """Number of streamed elements for key, None if key was not streamed."""
+        if self._parser is None:
+            return None
+        return self._parser.streamed.get((key,))
 
-            self.json_model.set_json(json_data=self.json_report)
+    def set_json(self) -> None:
+        """Set the root model of the report, a view over json_report, and check its keys."""
+        try:
+            self.json_model = JsonRoot(json_data=self.json_report)
+            self.json_model.check_keys()
         except Exception as e:
             self.error.append(e)
 
@@ -72,7 +251,10 @@ class JsonValidator():
             self._validate_report_date()
             self._validate_rfc_proveedores()
             self._validate_products()
+            self._validate_duplicate_cfdis()
+            self._validate_cfdi_history()
             self._validate_monthly_log()
+            self._record_cfdi_history()
         except Exception as exc:
             self.catch_error(err_type=SystemError, err_message=f"Error al validar JSON {exc}")
             logging.warning(f"Error al validar JSON: {exc}")
@@ -97,7 +279,7 @@ class JsonValidator():
                 err_message="Error: clave 'Version' no fue encontrada."
                 )
             return
-        if not re.match(VERSION_REGEX, version):
+        if not regex.VERSION_REGEX(version):
             self.catch_error(
                 err_type=RegexError,
                 err_message=f"Error: La version {version} no cumple con el patron {VERSION_REGEX}"
@@ -112,7 +294,7 @@ class JsonValidator():
                 )
             return
 
-        if not re.match(RFC_CONTR_REGEX, rfc_cont):
+        if not regex.RFC_CONTR_REGEX(rfc_cont):
             self.catch_error(
                 err_type=RegexError,
                 err_message=f"Error: RfcContribuyente {rfc_cont} no cumple con el patron {RFC_CONTR_REGEX}"
@@ -135,7 +317,7 @@ class JsonValidator():
                     err_message="Error: clave 'RfcRepresentanteLegal' es requerida en caso que el elemento 'RfcContribuyente' se manifieste de una persona moral (12 caracteres)"
                     )
                 return
-            if not re.match(RFC_PERSONA_FISICA, rfc_rep_leg):
+            if not regex.RFC_PERSONA_FISICA(rfc_rep_leg):
                 self.catch_error(
                     err_type=RegexError,
                     err_message=f"Error: clave 'RfcRepresentanteLegal' {rfc_rep_leg} no cumple con el patron {RFC_PERSONA_FISICA}"
@@ -167,7 +349,7 @@ class JsonValidator():
             pattern_parts = perm_pattern.split("/")
             perm_parts = num_permission.split("/")
 
-            if mod_permission and not re.match(MODALITY_PERMISSION_REGEX, mod_permission):
+            if mod_permission and not regex.MODALITY_PERMISSION_REGEX(mod_permission):
                 self.catch_error(
                     err_type=CaracterPermisionarioError,
                     err_message=f"Error: ModalidadPermiso '{mod_permission}' no cumple con el patron {MODALITY_PERMISSION_REGEX}"
@@ -359,7 +541,7 @@ class JsonValidator():
                 )
             return
 
-        if not re.match(UTC_FORMAT_REGEX, date):
+        if not regex.UTC_FORMAT_REGEX(date):
             self.catch_error(
                 err_type=TipadoError,
                 err_message="Error: 'FechaYHoraReporteMes' no se expresa en UTC 'yyyy-mm-ddThh:mm:ss+-hh:mm'."
@@ -382,13 +564,13 @@ class JsonValidator():
 
     # @wrapper_handler
     def _validate_products(self) -> None:
-        if products := self.json_report.get("Producto"):
+        if self._streamed_count("Producto"):
+            self._flush_pending_products()
+            self._errors.extend(self._streamed_errors["Producto"])
+        elif products := self.json_report.get("Producto"):
             caracter = self.json_report.get("Caracter")
 
-            product_obj = ProductValidator(products=products, caracter=caracter)
-            product_obj.validate_products()
-
-            if product_errors := product_obj.errors:
+            if product_errors := validate_products(products=products, caracter=caracter, cfdi_index=self._cfdi_index):
                 self._errors.extend(product_errors)
                 # self.errors = self.errors | product_errors
                 # self._errors = self.errors | product_errors
@@ -397,6 +579,9 @@ class JsonValidator():
 
     # @wrapper_handler
     def _validate_monthly_log(self) -> None:
+        if self._streamed_count("BitacoraMensual") is not None:
+            self._errors.extend(self._streamed_errors["BitacoraMensual"])
+            return
         if (month_log := self.json_report.get("BitacoraMensual")) is None:
             self.catch_error(err_type=ClaveError, err_message="Error: clave 'Bitácora' no encontrada.")
             return
@@ -413,11 +598,62 @@ class JsonValidator():
                 err_type=ValorError,
                 err_message="Error: nombre de archivo no está compuesto por 'IdentificadorTipo_IdentificadorEnvio_RfcCV_RFCProveedor_Periodo_CveInstalacion_TipoReporte_TipoEstandar'."
                 )
-        if not re.match(FILE_NAME_REGEX, name.replace(".json", "")):
+        if not regex.FILE_NAME_REGEX(name.replace(".json", "")):
             self.catch_error(err_type=ValorError,
                              err_message="Error: nombre de archivo no válido."
                              )
 
+    def _validate_duplicate_cfdis(self) -> None:
+        """Report every CFDI whose UUID was declared before in the report, with both paths.\n
+        :return: None."""
+        if not CHECK_DUPLICATE_CFDIS:
+            return
+        for uuid, first, repeated in self._cfdi_index.duplicates():
+            self._errors.append({
+                "type_error": DuplicadoError.__name__,
+                "error": DUPLICATE_MESSAGE.format(value=uuid, first=first),
+                "source": f"{repeated}.Cfdi",
+                })
+
+    def _validate_cfdi_history(self) -> None:
+        """Report every CFDI declared by RfcContribuyente in the report of an earlier period.\n
+        :return: None."""
+        if not CHECK_CFDI_HISTORY:
+            return
+        rfc = self.json_report.get("RfcContribuyente")
+        period = report_period(date=self.json_report.get("FechaYHoraReporteMes"))
+        if not isinstance(rfc, str) or period is None:
+            return
+        uuids = []
+        try:
+            for complement in self._cfdi_index.complements():
+                previous = cfdi_history.previous_periods(rfc=rfc, period=period, uuids=[key for key, _ in complement])
+                for key, location in complement:
+                    uuids.append(key)
+                    if key in previous:
+                        self._errors.append({
+                            "type_error": DuplicadoError.__name__,
+                            "error": HISTORY_MESSAGE.format(value=str(UUID(bytes=key)).upper(), period=previous[key]),
+                            "source": f"{self._cfdi_index.path(location=location)}.Cfdi",
+                            })
+        except sqlite3.Error as exc:
+            # Sin el historial el reporte se valida igual, solo sin esta revisión.
+            logging.warning(f"Error al consultar el historial de CFDIs: {exc}")
+            return
+        self._history = (rfc, period, uuids)
+
+    def _record_cfdi_history(self) -> None:
+        """Record the CFDIs of the report for its period, only when the report has no errors
+        and record_history is set.\n
+        :return: None."""
+        if self._history is None or not self.record_history or self._errors or self.error:
+            return
+        rfc, period, uuids = self._history
+        try:
+            cfdi_history.record(rfc=rfc, period=period, uuids=uuids)
+        except sqlite3.Error as exc:
+            logging.warning(f"Error al registrar el historial de CFDIs: {exc}")
+
     def catch_error(self, err_type: BaseException, err_message: str) -> dict:
         """Catch error from validations."""
         self._errors.append({"type_error": err_type.__name__,
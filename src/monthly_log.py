@@ -1,17 +1,18 @@
-import re
-
-from src.constants import UTC_FORMAT_REGEX, component_alarm, event_type
+from src.constants import component_alarm, event_type
 from src.custom_exceptions import (BitacoraMensualError, LongitudError,
                                    ValorMinMaxError)
 from src.dict_type_validator import DictionaryTypeValidator
 from src.dict_types import log_dict
+from src.utils.regex_registry import regex
 
 
 class MonthlyLogValidator:
     """Bitacora Mensual validator"""
 
-    def __init__(self, month_log: list) -> None:
-        self.month_log = month_log[0]
+    def __init__(self, month_log: list, offset: int = 0) -> None:
+        # Índice en BitacoraMensual del primer registro, los registros leídos en streaming llegan de uno en uno.
+        self.offset = offset
+        self.month_log = month_log[0] if month_log else None
         self.log = month_log
         self.log_len = len(month_log)
         self._logs_errors = []
@@ -19,22 +20,33 @@ class MonthlyLogValidator:
         self._log_index = 0
 
     def validate_log(self) -> None:
-        if self._next_log():
-            self._validate_bitacora_tipos()
-            self._validate_numero_registro()
-            self._validate_fecha_evento()
-            self._validate_usuario_responsable()
-            self._validate_tipo_evento()
-            self._validate_descripcion_evento()
-            self._validate_id_comp_alarma()
-
+        """Validate every log entry, iterating so long logs keep a constant stack depth. An entry
+        that breaks a validation is reported as SystemError with its source and the next one is validated."""
+        while self._next_log():
+            try:
+                self._validate_entry()
+            except Exception as exc:
+                self.errors = {
+                    "type_error": SystemError.__name__,
+                    "error": f"Error al validar BitacoraMensual {exc}",
+                    "source": f"BitacoraMensual[{self.offset + self._log_index}]",
+                    }
             self._update_index()
             del self.func_exc
-            self.validate_log()
+
+    def _validate_entry(self) -> None:
+        self._validate_bitacora_tipos()
+        self._validate_numero_registro()
+        self._validate_fecha_evento()
+        self._validate_usuario_responsable()
+        self._validate_tipo_evento()
+        self._validate_descripcion_evento()
+        self._validate_id_comp_alarma()
 
     # @exception_wrapper
     def _validate_bitacora_tipos(self) -> None:
-        DictionaryTypeValidator().validate_dict_type(dict_to_validate=self.month_log, dict_type=log_dict)
+        for err in DictionaryTypeValidator.validate_dict_types(dict_to_validate=self.month_log, dict_type=log_dict):
+            self.catch_error(err_type=err["type_err"], err_message=err["err_message"])
 
     # @exception_wrapper
     def _validate_numero_registro(self) -> None:
@@ -51,7 +63,7 @@ class MonthlyLogValidator:
     def _validate_fecha_evento(self) -> None:
         if (event_date := self.month_log.get("FechaYHoraEvento")) is None:
             self.catch_error(err_type=BitacoraMensualError, err_message="Error: clave 'FechaYHoraEvento' no fue declarada.")
-        if event_date and not re.match(UTC_FORMAT_REGEX, event_date):
+        if event_date and not regex.UTC_FORMAT_REGEX(event_date):
             self.catch_error(
                 err_type=TypeError,
                 err_message="Error: clave 'FechaYHoraEvento' no se expresa en UTC 'yyyy-mm-ddThh:mm:ss+-hh:mm'.")
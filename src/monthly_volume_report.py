@@ -1,17 +1,28 @@
 """This module handles ReporteDeVolumenMensual validations."""
-import re
-from typing import Optional, TypeVar, Union
+import os
+from concurrent.futures import Executor, Future
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Optional, TypeVar, Union
 
 from src.complements import ComplementBuilder
+from src.complements.cfdi_index import CfdiIndex
 from src.complements.enumerators import ComplementTypeEnum
-from src.complements.helpers import complement_builder
-from src.constants import UTC_FORMAT_REGEX, cal_value_caracteres
+from src.complements.helpers import (complement_builder,
+                                     validate_complement_task)
+from src.complements.totals import RECONCILE_TOTALS, DocumentTotals
+from src.constants import cal_value_caracteres
 from src.custom_exceptions import (ClaveError, EntregasError, LongitudError,
                                    RecepcionesError, RegexError, TipadoError,
                                    ValorError, ValorMinMaxError)
 from src.decorators import exception_wrapper
 from src.dict_type_validator import DictionaryTypeValidator
 from src.dict_types import deliveries_dict, exists_control, recepctions_dict
+from src.utils.progress import PROGRESS_KEYS, advance, count_cfdis
+from src.utils.regex_registry import regex
+
+# CFDIs de Recepciones y Entregas desde los que cada elemento Complemento es una tarea del executor.
+COMPLEMENT_TASKS_MIN_CFDIS = int(os.getenv("COMPLEMENT_TASKS_MIN_CFDIS", "10000"))
+SECTIONS = ("Recepciones", "Entregas")
 
 ComplementType = TypeVar("ComplementType", bound="ComplementBuilder")
 
@@ -19,21 +30,41 @@ ComplementType = TypeVar("ComplementType", bound="ComplementBuilder")
 class MonthlyVolumeReportValidator:
     """Validation of VolumenMensualReporte."""
 
-    def __init__(self, monthly_volume_report: dict, product_key: str, caracter: str):
+    def __init__(
+            self,
+            monthly_volume_report: dict,
+            product_key: str,
+            caracter: str,
+            document_totals: Optional[Dict[str, DocumentTotals]] = None,
+            cfdi_index: Optional[CfdiIndex] = None,
+            product_index: int = 0,
+            executor: Optional[Executor] = None,
+        ):
         self.monthly_report = monthly_volume_report
         self.product_key = product_key
         self.caracter = caracter
+        # Totales por sección; los CFDIs leídos en streaming ya están sumados en ellos.
+        self.document_totals = {} if document_totals is None else document_totals
+        # Índice de UUIDs del reporte y producto de este reporte mensual.
+        self.cfdi_index = cfdi_index
+        self.product_index = product_index
+        # Executor de las tareas por elemento Complemento y sus futuros por sección.
+        self.executor = executor
+        self._tasks: Dict[str, List[Future]] = {}
         self._errors = {}
         self._report_errors = []
         self._executed_functions = set()
 
     def validate_report(self) -> None:
         # self._validate_reporte_tipado()
+        self._submit_complements()
         self._validate_control_existencias()
         self._validate_recepciones()
         self.__validate_recepciones_complemento()
+        self._reconcile_totals(section="Recepciones")
         self._validate_entregas()
         self.__validate_entregas_complemento()
+        self._reconcile_totals(section="Entregas")
 
     # @exception_wrapper
     # def _validate_reporte_tipado(self) -> None:
@@ -47,10 +78,8 @@ class MonthlyVolumeReportValidator:
         if not (inv_control := self.monthly_report.get("ControlDeExistencias")):
             return
 
-        if err := DictionaryTypeValidator().validate_dict_type(dict_to_validate=inv_control, dict_type=exists_control):
-            type_err = err.get("type_err")
-            err_message = err.get("err_message")
-            self.catch_error(err_type=type_err, err_message=err_message)
+        for err in DictionaryTypeValidator.validate_dict_types(dict_to_validate=inv_control, dict_type=exists_control):
+            self.catch_error(err_type=err["type_err"], err_message=err["err_message"])
 
         month_volume = inv_control.get("VolumenExistenciasMes")
         month_measure_date = inv_control.get("FechaYHoraEstaMedicionMes")
@@ -70,7 +99,7 @@ class MonthlyVolumeReportValidator:
             #     err_type=ValorMinMaxError,
             #     err_message="Error:'VolumenExistenciasMes'
             # no está en el rango min -100000000000.0 o max 100000000000.0")
-        if month_measure_date and not re.match(UTC_FORMAT_REGEX, month_measure_date):
+        if month_measure_date and not regex.UTC_FORMAT_REGEX(month_measure_date):
             self.catch_error(
                 err_type=TipadoError,
                 err_message="Error: 'FechaYHoraEstaMedicionMes' no se expresa en UTC 'yyyy-mm-ddThh:mm:ss+-hh:mm'."
@@ -85,10 +114,8 @@ class MonthlyVolumeReportValidator:
             # self.catch_error(err_type=RecepcionesError, err_message="Error: 'Recepciones' no fue declarada.")
             # raise RecepcionesError("Error: 'Recepciones' no fue declarada.")
 
-        if err := DictionaryTypeValidator().validate_dict_type(dict_to_validate=receptions, dict_type=recepctions_dict):
-            type_err = err.get("type_err")
-            err_message = err.get("err_message")
-            self.catch_error(err_type=type_err, err_message=err_message)
+        for err in DictionaryTypeValidator.validate_dict_types(dict_to_validate=receptions, dict_type=recepctions_dict):
+            self.catch_error(err_type=err["type_err"], err_message=err["err_message"])
 
         recep_parent = "Recepciones"
         total_receptions_month = receptions.get("TotalRecepcionesMes")
@@ -156,7 +183,9 @@ class MonthlyVolumeReportValidator:
     def __validate_recepciones_complemento(self) -> None:
         """Validate Recepciones Complemento list object.\n
         :return: None."""
-        receives = self.monthly_report.get("Recepciones")
+        if not isinstance(receives := self.monthly_report.get("Recepciones"), dict):
+            # _validate_recepciones ya reportó la sección.
+            return
         if (complement := receives.get("Complemento")) is None:
             self._nonfound_key_error(key="Complemento")
             # self.catch_error(
@@ -171,7 +200,8 @@ class MonthlyVolumeReportValidator:
             #     err_message="Error: clave 'Complemento' vacía.")
             return
 
-        if (comp_type := complement[0].get("TipoComplemento")) is None:
+        if not isinstance(complement, list) or not isinstance(complement[0], dict) or (
+                comp_type := complement[0].get("TipoComplemento")) is None:
             self._nonfound_key_error(key="TipoComplemento")
             # self.catch_error(
             #     err_type=ClaveError,
@@ -179,18 +209,14 @@ class MonthlyVolumeReportValidator:
             return
 
         if self._check_complement(complement_type=comp_type):
-            complement_obj = complement_builder(complement_data=complement, complement_type=comp_type)
-            complement_obj.validate_complemento()
-
-            if complement_errors := complement_obj.errors:
-                comp_errors = complement_obj.get_error_list()
+            if comp_errors := self._validate_complements(section="Recepciones", complement=complement, comp_type=comp_type):
                 for comp_err in comp_errors:
                     if source := comp_err.get("source"):
                         comp_err["source"] = f"Recepciones.{source}"
+                    self._errors[comp_err["type_error"]] = comp_err["error"]
 
                 self._report_errors.extend(comp_errors)
                 # self._report_errors.extend(complement_obj.get_error_list())
-                self._errors = self._errors | complement_errors
 
 
     @exception_wrapper
@@ -208,10 +234,8 @@ class MonthlyVolumeReportValidator:
         amount_deliveries_month = deliveries.get("ImporteTotalEntregasMes")
         complement = deliveries.get("Complemento")
 
-        if err := DictionaryTypeValidator().validate_dict_type(dict_to_validate=deliveries, dict_type=deliveries_dict):
-            type_err = err.get("type_err")
-            err_message = err.get("err_message")
-            self.catch_error(err_type=type_err, err_message=err_message)
+        for err in DictionaryTypeValidator.validate_dict_types(dict_to_validate=deliveries, dict_type=deliveries_dict):
+            self.catch_error(err_type=err["type_err"], err_message=err["err_message"])
         if total_deliveries_month is None:
             self._nonfound_key_error(key="TotalEntregasMes")
             # self.catch_error(err_type=EntregasError, err_message="Error: 'TotalEntregasMes' no fue declarada.")
@@ -270,7 +294,9 @@ class MonthlyVolumeReportValidator:
     def __validate_entregas_complemento(self) -> None:
         """Validate Entregas Complemento list object.\n
         :return: None."""
-        deliveries = self.monthly_report.get("Entregas")
+        if not isinstance(deliveries := self.monthly_report.get("Entregas"), dict):
+            # _validate_entregas ya reportó la sección.
+            return
         deliv_parent = "Entregas"
 
         if (complement := deliveries.get("Complemento")) is None:
@@ -287,7 +313,8 @@ class MonthlyVolumeReportValidator:
                 )
             return
 
-        if (comp_type := complement[0].get("TipoComplemento")) is None:
+        if not isinstance(complement, list) or not isinstance(complement[0], dict) or (
+                comp_type := complement[0].get("TipoComplemento")) is None:
             self._nonfound_key_error(key="TipoComplemento", source=f"{deliv_parent}.Complemento")
             # self.catch_error(
             #     err_type=ClaveError,
@@ -295,22 +322,99 @@ class MonthlyVolumeReportValidator:
             return
 
         if self._check_complement(complement_type=comp_type):
-            complement_obj = complement_builder(complement_data=complement, complement_type=comp_type)
-            complement_obj.validate_complemento()
-
-            if complement_errors := complement_obj.errors:
-                comp_errors = complement_obj.get_error_list()
+            if comp_errors := self._validate_complements(section=deliv_parent, complement=complement, comp_type=comp_type):
                 for comp_err in comp_errors:
                     if source := comp_err.get("source"):
                         comp_err["source"] = f"{deliv_parent}.{source}"
+                    self._errors[comp_err["type_error"]] = comp_err["error"]
 
                 self._report_errors.extend(comp_errors)
                 # self._report_errors.extend(complement_obj.get_error_list())
-                self._errors = self._errors | complement_errors
+
+    def _submit_complements(self) -> None:
+        """Schedule every Complemento item of Recepciones and Entregas as a task of the
+        executor, when there is one and the sections hold COMPLEMENT_TASKS_MIN_CFDIS CFDIs;
+        lists that the section checks reject are left to them.\n
+        :return: None."""
+        if self.executor is None:
+            return
+        sections = {}
+        for section in SECTIONS:
+            section_data = self.monthly_report.get(section)
+            complement = section_data.get("Complemento") if isinstance(section_data, dict) else None
+            if not isinstance(complement, list) or not complement or not isinstance(complement[0], dict):
+                continue
+            if (comp_type := complement[0].get("TipoComplemento")) in {en.value for en in ComplementTypeEnum}:
+                sections[section] = (complement, comp_type)
+        if sum(count_cfdis(item) for complement, _ in sections.values() for item in complement) < COMPLEMENT_TASKS_MIN_CFDIS:
+            return
+        try:
+            for section, (complement, comp_type) in sections.items():
+                self._tasks[section] = [
+                    self.executor.submit(
+                        validate_complement_task,
+                        complement=item,
+                        complement_type=comp_type,
+                        offset=offset,
+                        cfdi_scope=(self.product_index, section),
+                        index_cfdis=self.cfdi_index is not None,
+                        with_totals=RECONCILE_TOTALS,
+                        )
+                    for offset, item in enumerate(complement)
+                    ]
+        except BrokenProcessPool:
+            # Sin executor disponible las listas se validan en el proceso.
+            self._tasks.clear()
+
+    def _validate_complements(self, section: str, complement: list, comp_type: str) -> list:
+        """Validate the Complemento list of section, merging the results of its tasks in
+        list order when they were submitted.\n
+        :return: Error list with sources relative to section."""
+        totals = self._section_totals(section=section, complement_type=comp_type)
+        if tasks := self._tasks.pop(section, None):
+            try:
+                results = [task.result() for task in tasks]
+            except BrokenProcessPool:
+                results = None
+            if results is not None:
+                errors = []
+                for task_errors, task_index, task_totals, counts in results:
+                    errors.extend(task_errors)
+                    if self.cfdi_index is not None:
+                        self.cfdi_index.update(other=task_index)
+                    if totals is not None:
+                        totals.update(other=task_totals)
+                    for key in PROGRESS_KEYS:
+                        advance(key, counts[key])
+                return errors
+
+        complement_obj = complement_builder(complement_data=complement, complement_type=comp_type)
+        complement_obj.totals = totals
+        complement_obj.cfdi_index, complement_obj.cfdi_scope = self.cfdi_index, (self.product_index, section)
+        complement_obj.validate_complemento()
+        return complement_obj.get_error_list()
+
+    def _section_totals(self, section: str, complement_type: str) -> Optional[DocumentTotals]:
+        """Totals of the documents of section, None when RECONCILE_TOTALS is off.\n
+        :return: DocumentTotals shared with the CFDIs streamed before the report."""
+        if not RECONCILE_TOTALS:
+            return None
+        if (totals := self.document_totals.get(section)) is None:
+            totals = self.document_totals[section] = DocumentTotals(complement_type=complement_type, section=section)
+        return totals
+
+    @exception_wrapper
+    def _reconcile_totals(self, section: str) -> None:
+        """Compare the CFDIs and pedimentos of section with its declared totals.\n
+        :return: None."""
+        if (totals := self.document_totals.get(section)) is None:
+            return
+        for err_type, err_message, source in totals.reconcile(declared=self.monthly_report.get(section)):
+            self.catch_error(err_type=err_type, err_message=err_message, source=f"{section}.{source}")
 
     def _check_complement(self, complement_type: str) -> bool:
         """Check if complement is a valid complement."""
-        if complement_type not in {en.value for en in ComplementTypeEnum}:
+        if not isinstance(complement_type, str) or complement_type not in {en.value for en in ComplementTypeEnum}:
             self.catch_error(err_type=TipadoError, err_message=f"Error: TipoComplemento {complement_type} no válido.")
             return False
         return True
@@ -0,0 +1,149 @@
+"""This module validates the Producto list of a report on a pool of worker processes.
+
+The list is split into contiguous chunks of about the same number of CFDIs and each worker
+gets only its chunk, with the offset of its first product so the error sources keep their
+index. Chunk results are merged in list order, and the CFDI index of every chunk into the
+one of the report, so the errors come back in the same order as a sequential run. Reports
+under PARALLEL_MIN_CFDIS CFDIs, or with a single product, are validated in process.
+
+The same pool runs the Complemento tasks of MonthlyVolumeReportValidator when
+PARALLEL_COMPLEMENTS is set and the products are validated in process, e.g. a report with
+one product that holds most of the CFDIs."""
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.complements.cfdi_index import CfdiIndex
+from src.product_validator import ProductValidator
+from src.utils.logger import logger
+from src.utils.progress import (PROGRESS_KEYS, ProgressTracker, advance,
+                                count_cfdis, tracking)
+
+logging = logger()
+
+PARALLEL_PRODUCTS = os.getenv("PARALLEL_PRODUCTS", "false").lower() in ("1", "true", "yes")
+PARALLEL_COMPLEMENTS = os.getenv("PARALLEL_COMPLEMENTS", "false").lower() in ("1", "true", "yes")
+PRODUCT_WORKERS = int(os.getenv("PRODUCT_WORKERS", str(os.cpu_count() or 1)))
+# Por debajo de este número de CFDIs copiar los productos a los procesos cuesta más de lo que se gana.
+PARALLEL_MIN_CFDIS = int(os.getenv("PARALLEL_MIN_CFDIS", "20000"))
+# Bloques por proceso, para repartir productos de tamaños distintos.
+CHUNKS_PER_WORKER = 2
+
+_pool: Optional[ProcessPoolExecutor] = None
+
+
+def get_pool() -> ProcessPoolExecutor:
+    """Return the product pool of this process, creating it on first use."""
+    global _pool
+    if _pool is not None and _pool._broken:
+        # Un proceso terminó de forma abrupta; se reemplaza el pool.
+        shutdown_pool()
+    if _pool is None:
+        if "forkserver" in multiprocessing.get_all_start_methods():
+            context = multiprocessing.get_context("forkserver")
+            context.set_forkserver_preload(["src.product_pool"])
+        else:
+            context = multiprocessing.get_context("spawn")
+        _pool = ProcessPoolExecutor(max_workers=max(PRODUCT_WORKERS, 1), mp_context=context)
+    return _pool
+
+
+def shutdown_pool() -> None:
+    """Stop the product workers.\n
+    :return: None."""
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=True, cancel_futures=True)
+        _pool = None
+
+
+def product_weight(product: Any) -> int:
+    """Number of CFDIs of a product plus one, the product itself.\n
+    :return: int."""
+    report = product.get("ReporteDeVolumenMensual") if isinstance(product, dict) else None
+    weight = 1
+    for section in ("Recepciones", "Entregas"):
+        section_data = report.get(section) if isinstance(report, dict) else None
+        complements = section_data.get("Complemento") if isinstance(section_data, dict) else None
+        if isinstance(complements, list):
+            weight += sum(map(count_cfdis, complements))
+    return weight
+
+
+def split_products(weights: List[int], chunks: int) -> List[Tuple[int, int]]:
+    """Contiguous (start, end) ranges of products with about the same weight each.\n
+    :return: List of ranges in list order."""
+    target = sum(weights) / max(chunks, 1)
+    ranges, start, weight = [], 0, 0
+    for index, value in enumerate(weights):
+        weight += value
+        if weight >= target and len(ranges) < chunks - 1:
+            ranges.append((start, index + 1))
+            start, weight = index + 1, 0
+    if start < len(weights):
+        ranges.append((start, len(weights)))
+    return ranges
+
+
+def validate_chunk(
+        products: list,
+        caracter: str,
+        offset: int,
+        index_cfdis: bool,
+    ) -> Tuple[list, Optional[CfdiIndex], Dict[str, int]]:
+    """Validate a chunk of products in a worker.\n
+    :param offset: Index of the first product in the report.\n
+    :param index_cfdis: True to return the CFDI index of the chunk.\n
+    :return: (errors, CFDI index or None, progress counters)."""
+    cfdi_index = CfdiIndex() if index_cfdis else None
+    with tracking(ProgressTracker(on_update=lambda counts: None, interval=float("inf"))) as tracker:
+        product_obj = ProductValidator(products=products, caracter=caracter, offset=offset, cfdi_index=cfdi_index)
+        product_obj.validate_products()
+    return product_obj.errors, cfdi_index, tracker.counts
+
+
+def validate_products(products: list, caracter: str, cfdi_index: Optional[CfdiIndex] = None) -> list:
+    """Validate a Producto list, on the product pool when PARALLEL_PRODUCTS is set and the
+    report is large enough, otherwise in process with the pool as executor of the Complemento
+    tasks when PARALLEL_COMPLEMENTS is set.\n
+    :param cfdi_index: Index of the report, filled with the CFDIs of every product.\n
+    :return: errors in product order."""
+    if not PARALLEL_PRODUCTS or PRODUCT_WORKERS < 2 or len(products) < 2:
+        return _validate_in_process(products=products, caracter=caracter, cfdi_index=cfdi_index)
+    weights = [product_weight(product) for product in products]
+    if sum(weights) - len(weights) < PARALLEL_MIN_CFDIS:
+        return _validate_in_process(products=products, caracter=caracter, cfdi_index=cfdi_index)
+
+    ranges = split_products(weights=weights, chunks=PRODUCT_WORKERS * CHUNKS_PER_WORKER)
+    try:
+        results = list(get_pool().map(
+            validate_chunk,
+            [products[start:end] for start, end in ranges],
+            [caracter] * len(ranges),
+            [start for start, _ in ranges],
+            [cfdi_index is not None] * len(ranges),
+            ))
+    except BrokenProcessPool as exc:
+        # Un proceso terminó de forma abrupta; el siguiente reporte crea otro pool.
+        logging.warning(f"Pool de productos interrumpido, se valida en el proceso: {exc}")
+        shutdown_pool()
+        return _validate_in_process(products=products, caracter=caracter, cfdi_index=cfdi_index)
+
+    errors = []
+    # map entrega los resultados en el orden de los bloques, el mismo de los productos.
+    for chunk_errors, chunk_index, counts in results:
+        errors.extend(chunk_errors)
+        if cfdi_index is not None:
+            cfdi_index.update(other=chunk_index)
+        for key in PROGRESS_KEYS:
+            advance(key, counts[key])
+    return errors
+
+
+def _validate_in_process(products: list, caracter: str, cfdi_index: Optional[CfdiIndex]) -> list:
+    executor = get_pool() if PARALLEL_COMPLEMENTS and PRODUCT_WORKERS > 1 else None
+    product_obj = ProductValidator(products=products, caracter=caracter, cfdi_index=cfdi_index, executor=executor)
+    product_obj.validate_products()
+    return product_obj.errors
@@ -1,7 +1,9 @@
 """This module handles product validations."""
-import re
-from typing import Optional, Union, List
+from concurrent.futures import Executor
+from typing import Dict, Optional, Union, List
 
+from src.complements.cfdi_index import CfdiIndex
+from src.complements.totals import DocumentTotals
 from src.condensed_gas_validator import CondensedGasValidator
 from src.constants import (SUBPRODUCTO_REGEX, petroleo_caracteres,
                            products_keys, subproducts_keys)
@@ -14,13 +16,35 @@ from src.dict_type_validator import DictionaryTypeValidator
 from src.dict_types import product_dict
 from src.enumerators import ProductEnum, SiNoEnum, SubProductEnum
 from src.monthly_volume_report import MonthlyVolumeReportValidator
+from src.utils.logger import logger
+from src.utils.path_context import PathContext
+from src.utils.progress import advance
+from src.utils.regex_registry import regex
+
+logging = logger()
 
 
 class ProductValidator:
     """Product validator class."""
 
-    def __init__(self, products: list, caracter: str):
+    def __init__(
+            self,
+            products: list,
+            caracter: str,
+            offset: int = 0,
+            document_totals: Optional[Dict[int, Dict[str, DocumentTotals]]] = None,
+            cfdi_index: Optional[CfdiIndex] = None,
+            executor: Optional[Executor] = None,
+        ):
         self._gen_index = 0
+        self.offset = offset
+        # Totales de documentos por índice de producto y sección, de los CFDIs leídos en streaming.
+        self.document_totals = {} if document_totals is None else document_totals
+        # Índice de UUIDs compartido por todos los productos del reporte.
+        self.cfdi_index = cfdi_index
+        # Executor de las tareas por elemento Complemento de cada reporte mensual.
+        self.executor = executor
+        self.path = PathContext(key="Producto", index=offset)
         self.caracter = caracter
         self.products = products
         self.products_len = len(products)
@@ -31,43 +55,53 @@ class ProductValidator:
         self._executed_functions = set()
 
     def validate_products(self) -> None:
-        """Validate product JSON body."""
-        if self._next_product():
-            self._validate_producto_tipado()
-            self._validate_clave_producto()
-            self._validate_clave_sub_producto()
-            self._validate_octanaje_gasolina()
-            self._validate_combustible_nofosil()
-            self._validate_combustible_nofosil_engasolina()
-            self._validate_diesel_combustible_nofosil()
-            self._validate_combustible_nofosil_endiesel()
-            self._validate_combustible_turbosina_nofosil()
-            self._validate_combustible_nofosil_enturbosina()
-            self._validate_compos_propano_gaslp()
-            self._validate_compos_butano_gaslp()
-            self._validate_densidad_petroleo()
-            self._validate_compos_azufre_petroleo()
-            self._validate_otros()
-            self._validate_marca_comercial()
-            self._validate_marcaje()
-            self._validate_concentracion_sustancia_marcaje()
-            self._validate_monthly_report()
-            self._validate_gasnatural_ocondensados()
-            self._additionals_validations()
-
+        """Validate product JSON body, one product per iteration so the stack depth does not grow with the list.
+        A validation that breaks on a product is reported as SystemError with the product source and the
+        remaining validations of the product still run."""
+        while self._next_product():
+            failures = set()
+            for validation in self._validations():
+                try:
+                    validation()
+                except Exception as exc:
+                    if str(exc) not in failures:
+                        failures.add(str(exc))
+                        self.catch_error(err_type=SystemError, err_message=f"Error al validar Producto {exc}")
+                    logging.warning(f"Error al validar {self.path.render()} en {validation.__name__}: {exc}")
             self._update_index()
-            self.validate_products()
-        else:
-            print("Ya no hay productos por validar ==================================")
+        logging.debug("Ya no hay productos por validar ==================================")
+
+    def _validations(self) -> tuple:
+        return (
+            self._validate_producto_tipado,
+            self._validate_clave_producto,
+            self._validate_clave_sub_producto,
+            self._validate_octanaje_gasolina,
+            self._validate_combustible_nofosil,
+            self._validate_combustible_nofosil_engasolina,
+            self._validate_diesel_combustible_nofosil,
+            self._validate_combustible_nofosil_endiesel,
+            self._validate_combustible_turbosina_nofosil,
+            self._validate_combustible_nofosil_enturbosina,
+            self._validate_compos_propano_gaslp,
+            self._validate_compos_butano_gaslp,
+            self._validate_densidad_petroleo,
+            self._validate_compos_azufre_petroleo,
+            self._validate_otros,
+            self._validate_marca_comercial,
+            self._validate_marcaje,
+            self._validate_concentracion_sustancia_marcaje,
+            self._validate_monthly_report,
+            self._validate_gasnatural_ocondensados,
+            self._additionals_validations,
+            )
 
     @exception_wrapper
     def _validate_producto_tipado(self) -> None:
         prod = self.current_product
 
-        if err := DictionaryTypeValidator().validate_dict_type(dict_to_validate=prod, dict_type=product_dict):
-            type_err = err.get("type_err")
-            err_message = err.get("err_message")
-            self.catch_error(err_type=type_err, err_message=err_message)
+        for err in DictionaryTypeValidator.validate_dict_types(dict_to_validate=prod, dict_type=product_dict):
+            self.catch_error(err_type=err["type_err"], err_message=err["err_message"])
 
     @exception_wrapper
     def _validate_clave_producto(self) -> None:
@@ -89,7 +123,7 @@ class ProductValidator:
                 err_type=ClaveSubProductoError,
                 err_message=f"Error: Elemento 'ClaveSubProducto' requerido para ClaveProducto: {product_key}",
                 )
-        if subproduct_key and not re.match(SUBPRODUCTO_REGEX, subproduct_key):
+        if subproduct_key and not regex.SUBPRODUCTO_REGEX(subproduct_key):
             self._regex_error(
                     key="ClaveSubProducto", value=subproduct_key, pattern=SUBPRODUCTO_REGEX,
                     source="ClaveSubProducto"
@@ -326,13 +360,17 @@ class ProductValidator:
             month_report_obj = MonthlyVolumeReportValidator(
                 monthly_volume_report=month_report,
                 product_key=product_key,
-                caracter=self.caracter)
+                caracter=self.caracter,
+                document_totals=self.document_totals.get(self.offset + self._gen_index),
+                cfdi_index=self.cfdi_index,
+                product_index=self.offset + self._gen_index,
+                executor=self.executor)
             month_report_obj.validate_report()
 
             if report_errors := month_report_obj.errors:
                 for err in report_errors:
                     if source := err.get("source"):
-                        err["source"] = f"Producto[{self.products.index(self.current_product)}].{source}"
+                        err["source"] = self.path.render(source)
                 self._product_errors_list.extend(report_errors)
 
     # @exception_wrapper
@@ -667,7 +705,9 @@ class ProductValidator:
         return self._gen_index < self.products_len
 
     def _update_index(self) -> None:
+        advance("products")
         self._gen_index += 1
+        self.path.set_index(self.offset + self._gen_index)
         if self._next_product():
             self.current_product = self.products[self._gen_index]
 
@@ -681,7 +721,7 @@ class ProductValidator:
             "type_error": err_type.__name__, 
             "error": err_message,
             # "source": source,
-            "source": f"Producto[{self.products.index(self.current_product)}].{source}"
+            "source": self.path.render(source)
             }
 
     def _product_key_error(
@@ -806,7 +846,8 @@ class ProductValidator:
     @errors.setter
     def errors(self, errors: dict) -> None:
         """set errors in product validation obj."""
-        key = self.current_product.get("ClaveProducto")
+        key = self.current_product.get("ClaveProducto") if isinstance(self.current_product, dict) else None
+        key = key if isinstance(key, str) else None
 
         if key not in self._product_errors:
             self._product_errors[key] = []
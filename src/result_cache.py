@@ -0,0 +1,121 @@
+"""This module caches validation results of repeated uploads."""
+import hashlib
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from src.complements.cfdi_history import CHECK_CFDI_HISTORY
+from src.constants import RULESET_VERSION
+from src.json_stream import CHUNK_SIZE
+
+RESULT_CACHE_MAX_BYTES = int(os.getenv("RESULT_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+RESULT_CACHE_MAX_ENTRIES = int(os.getenv("RESULT_CACHE_MAX_ENTRIES", "1024"))
+RESULT_CACHE_TTL_SECONDS = float(os.getenv("RESULT_CACHE_TTL_SECONDS", str(60 * 60)))
+
+_ENTRY_OVERHEAD = 256
+
+
+async def upload_key(upload, chunk_size: int = CHUNK_SIZE) -> str:
+    """Hash an UploadFile by chunks and rewind it.\n
+    :return: cache key made of rule-set version, filename and sha256 of the bytes."""
+    digest = hashlib.sha256()
+    while chunk := await upload.read(chunk_size):
+        digest.update(chunk)
+    await upload.seek(0)
+    return f"{RULESET_VERSION}:{upload.filename}:{digest.hexdigest()}"
+
+
+class ResultCache:
+    """LRU cache with expiration and an approximate memory ceiling.
+
+    Values are dicts of str/list/bool as returned by validate_upload."""
+
+    def __init__(
+            self,
+            max_bytes: int = RESULT_CACHE_MAX_BYTES,
+            max_entries: int = RESULT_CACHE_MAX_ENTRIES,
+            ttl: float = RESULT_CACHE_TTL_SECONDS,
+        ) -> None:
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.size = 0
+        self._entries = OrderedDict()
+
+    @property
+    def enabled(self) -> bool:
+        """False when no entry can be stored, callers skip hashing the upload."""
+        return self.max_entries > 0 and self.max_bytes > 0
+
+    def get(self, key: Optional[str]) -> Optional[Dict[str, Any]]:
+        """Return the cached value or None, expired entries count as misses. A None key,
+        given when the cache is disabled, is never found."""
+        if key is None:
+            return None
+        if (entry := self._entries.get(key)) is None:
+            self.misses += 1
+            return None
+        expires_at, size, value = entry
+        if expires_at < time.monotonic():
+            self._remove(key, size)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: Optional[str], value: Dict[str, Any]) -> None:
+        """Store value, evicting least recently used entries over the limits. A None key is
+        not stored.\n
+        :return: None."""
+        if key is None or not self.enabled:
+            return
+        size = _estimate_size(value)
+        if (previous := self._entries.pop(key, None)) is not None:
+            self.size -= previous[1]
+        if size > self.max_bytes:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl, size, value)
+        self.size += size
+        while self.size > self.max_bytes or len(self._entries) > self.max_entries:
+            old_key, (_, old_size, _) = next(iter(self._entries.items()))
+            self._remove(old_key, old_size)
+            self.evictions += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters to size the cache."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "size_bytes": self.size,
+            "max_bytes": self.max_bytes,
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+    def _remove(self, key: str, size: int) -> None:
+        del self._entries[key]
+        self.size -= size
+
+
+def _estimate_size(value: Any) -> int:
+    """Approximate memory used by a result, counting string lengths plus a fixed overhead."""
+    if isinstance(value, str):
+        return len(value) + _ENTRY_OVERHEAD // 4
+    if isinstance(value, dict):
+        return _ENTRY_OVERHEAD + sum(len(key) + _estimate_size(item) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return _ENTRY_OVERHEAD + sum(_estimate_size(item) for item in value)
+    return 32
+
+
+# Con el historial de CFDIs el resultado depende de los reportes validados antes, no se guarda.
+result_cache = ResultCache(max_entries=0 if CHECK_CFDI_HISTORY else RESULT_CACHE_MAX_ENTRIES)
@@ -0,0 +1,97 @@
+"""This module locates invalid UTF-8 sequences while decoding uploads."""
+import codecs
+import os
+from array import array
+from contextvars import ContextVar
+from typing import Dict, List
+
+DECODE_ERRORS_LIMIT = int(os.getenv("DECODE_ERRORS_LIMIT", "50"))
+ERROR_HANDLER = "locate_invalid_utf8"
+
+_active_locator = ContextVar("active_locator", default=None)
+
+
+def _locate_invalid(exc: UnicodeDecodeError) -> tuple:
+    """Codec error handler: record the sequence in the active locator and replace it."""
+    if (locator := _active_locator.get()) is not None:
+        locator.record(exc)
+    return ("�", exc.end)
+
+
+codecs.register_error(ERROR_HANDLER, _locate_invalid)
+
+
+class DecodeErrorLocator:
+    """Decode UTF-8 by chunks keeping byte offset, line and column of each invalid sequence.
+
+    Adjacent invalid bytes are merged into one sequence and only the first ``limit``
+    sequences are kept as ``(offset, line, column)`` triples in ``offsets``."""
+
+    def __init__(self, limit: int = DECODE_ERRORS_LIMIT) -> None:
+        self.limit = limit
+        self.offsets = array("Q")
+        self.total = 0
+        self._decoder = codecs.getincrementaldecoder("UTF-8")(errors=ERROR_HANDLER)
+        self._consumed = 0
+        self._lines = 1
+        self._line_start = 0
+        self._base = 0
+        self._scan_pos = 0
+        self._scan_line = 1
+        self._scan_line_start = 0
+        self._last_end = -1
+
+    def decode(self, chunk: bytes, final: bool = False) -> str:
+        """Decode chunk, invalid sequences are replaced by U+FFFD."""
+        pending = self._decoder.getstate()[0]
+        self._base = self._consumed - len(pending)
+        self._scan_pos = 0
+        self._scan_line = self._lines
+        self._scan_line_start = self._line_start
+
+        token = _active_locator.set(self)
+        try:
+            text = self._decoder.decode(chunk, final)
+        finally:
+            _active_locator.reset(token)
+
+        if (newlines := chunk.count(b"\n")):
+            self._lines += newlines
+            self._line_start = self._consumed + chunk.rfind(b"\n") + 1
+        self._consumed += len(chunk)
+        return text
+
+    def record(self, exc: UnicodeDecodeError) -> None:
+        """Store the invalid sequence reported by the codec."""
+        offset = self._base + exc.start
+        if offset == self._last_end:
+            self._last_end = self._base + exc.end
+            return
+        self._last_end = self._base + exc.end
+        self.total += 1
+        if self.total > self.limit:
+            return
+
+        data = exc.object
+        if (newlines := data.count(b"\n", self._scan_pos, exc.start)):
+            self._scan_line += newlines
+            self._scan_line_start = self._base + data.rfind(b"\n", self._scan_pos, exc.start) + 1
+        self._scan_pos = exc.start
+        self.offsets.extend((offset, self._scan_line, offset - self._scan_line_start + 1))
+
+    def get_errors(self) -> List[Dict[str, str]]:
+        """Return decoding errors in the response error format."""
+        errors = [
+            {
+                "type_error": "Decodificación",
+                "error": (f"Error: secuencia de bytes no válida en UTF-8 en línea {self.offsets[ind + 1]}, "
+                          f"columna {self.offsets[ind + 2]} (byte {self.offsets[ind]})."),
+            }
+            for ind in range(0, len(self.offsets), 3)
+            ]
+        if self.total > self.limit:
+            errors.append({
+                "type_error": "Decodificación",
+                "error": f"Error: {self.total - self.limit} secuencias de bytes no válidas adicionales omitidas.",
+            })
+        return errors
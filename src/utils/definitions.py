@@ -1,81 +1,118 @@
 """SAT definitions"""
+from typing import Optional
 
-class CantidadMonetaria(float):
-    """CantidadMonetaria definition."""
-    min_val = 0
-    max_val = 1_000_000_000_000.0
-    max_decimals = 3
-    def __new__(cls, value):
-        if isinstance(value, int):
-            value = float(value)
+# Mayor número de decimales que se distingue; cualquier valor con más decimales se cuenta con este.
+_MAX_TRACKED_DECIMALS = 16
 
-        if not isinstance(value, float):
-            raise TypeError(".")
 
-        if not cls.min_val <= value <= cls.max_val:
-            raise ValueError(f" está fuera del rango permitido {cls.min_val}-{cls.max_val}.")
+def lexeme_decimals(lexeme: str) -> int:
+    """Count the significant decimal places of a JSON number as written, exponent
+    included, e.g. '1.250' gives 2, '1.5e-3' gives 4 and '12e2' gives 0.\n
+    :return: int."""
+    mantissa, _, exponent = lexeme.lower().partition("e")
+    fraction = mantissa.partition(".")[2].rstrip("0")
+    decimals = len(fraction) - int(exponent) if exponent else len(fraction)
+    return max(decimals, 0)
 
-        if "." in str(value) and len(str(value).split(".")[-1]) > cls.max_decimals:
-            raise ValueError(" tiene más de 3 decimales.")
 
-        return super().__new__(cls, value)
+class JsonFloat(float):
+    """Float parsed from a JSON document that remembers the decimal places of its lexeme,
+    so definitions check them without a float to str round trip."""
+    __slots__ = ()
+    decimals = 0
 
-class ValorNumerico(float):
-    """ValorNumerico definition."""
-    min_val = 0
-    max_val = 1_000_000_000_00.0
-    max_decimals = 3
-    def __new__(cls, value):
-        if isinstance(value, int):
-            value = float(value)
+    def __reduce__(self):
+        return _json_float, (float(self), self.decimals)
 
-        if not isinstance(value, float):
-            raise TypeError(".")
 
-        if not cls.min_val <= value <= cls.max_val:
-            raise ValueError(f" está fuera del rango permitido {cls.min_val}-{cls.max_val}.")
+# Una subclase por número de decimales, el conteo vive en la clase y no en cada instancia.
+# Se llaman 'float' para que los mensajes de error digan el tipo que ve el usuario.
+JSON_FLOAT_TYPES = tuple(
+    type("float", (JsonFloat,), {"__slots__": (), "__qualname__": "float", "decimals": decimals})
+    for decimals in range(_MAX_TRACKED_DECIMALS + 1)
+    )
 
-        if "." in str(value) and len(str(value).split(".")[-1]) > cls.max_decimals:
-            raise ValueError(" tiene más de 3 decimales.")
 
-        return super().__new__(cls, value)
+def _json_float(value: float, decimals: int) -> JsonFloat:
+    return JSON_FLOAT_TYPES[min(decimals, _MAX_TRACKED_DECIMALS)](value)
 
-class PositiveNegativeNumber(float):
-    """Number definition."""
-    min_val = -1_000_000_000_00.0
+
+def parse_json_float(lexeme: str) -> JsonFloat:
+    """``parse_float`` hook of the JSON decoders.\n
+    :return: JsonFloat."""
+    return JSON_FLOAT_TYPES[min(lexeme_decimals(lexeme), _MAX_TRACKED_DECIMALS)](lexeme)
+
+
+def float_decimals(value: float) -> int:
+    """Decimal places of a float, from its lexeme when it was parsed by parse_json_float
+    and from its shortest repr otherwise.\n
+    :return: int."""
+    if isinstance(value, JsonFloat):
+        return value.decimals
+    if isinstance(value, int):
+        return 0
+    text = float.__repr__(value)
+    if "e" in text or "." not in text:
+        return lexeme_decimals(text)
+    # repr de un float sin exponente no deja ceros al final, salvo 'x.0'.
+    fraction = text.partition(".")[2]
+    return 0 if fraction == "0" else len(fraction)
+
+
+class Definition(float):
+    """Bounded number with a maximum of decimal places."""
+    __slots__ = ()
+    min_val = 0
     max_val = 1_000_000_000_00.0
     max_decimals = 3
-    def __new__(cls, value):
-        if isinstance(value, int):
-            value = float(value)
 
-        if not isinstance(value, float):
+    def __new__(cls, value):
+        if not isinstance(value, (int, float)):
             raise TypeError(".")
+        if (message := cls.validate(value)) is not None:
+            raise ValueError(message)
+        return super().__new__(cls, value)
 
+    @classmethod
+    def validate(cls, value) -> Optional[str]:
+        """Check range and decimal places of a number without building the definition.\n
+        :return: Message suffix of the first failure or None."""
+        if not isinstance(value, (int, float)):
+            return "."
         if not cls.min_val <= value <= cls.max_val:
-            raise ValueError(f" está fuera del rango permitido {cls.min_val}-{cls.max_val}.")
+            return f" está fuera del rango permitido {cls.min_val}-{cls.max_val}."
+        if float_decimals(value) > cls.max_decimals:
+            return f" tiene más de {cls.max_decimals} decimales."
+        return None
 
-        if "." in str(value) and len(str(value).split(".")[-1]) > 3:
-            raise ValueError(" tiene más de 3 decimales.")
 
-        return super().__new__(cls, value)
+class CantidadMonetaria(Definition):
+    """CantidadMonetaria definition."""
+    __slots__ = ()
+    min_val = 0
+    max_val = 1_000_000_000_000.0
+    max_decimals = 3
 
-class PositiveNumber(float):
-    """Number definition."""
+
+class ValorNumerico(Definition):
+    """ValorNumerico definition."""
+    __slots__ = ()
     min_val = 0
     max_val = 1_000_000_000_00.0
     max_decimals = 3
-    def __new__(cls, value):
-        if isinstance(value, int):
-            value = float(value)
 
-        if not isinstance(value, float):
-            raise TypeError(".")
 
-        if not cls.min_val <= value <= cls.max_val:
-            raise ValueError(f" está fuera del rango permitido {cls.min_val}-{cls.max_val}.")
+class PositiveNegativeNumber(Definition):
+    """Number definition."""
+    __slots__ = ()
+    min_val = -1_000_000_000_00.0
+    max_val = 1_000_000_000_00.0
+    max_decimals = 3
 
-        if "." in str(value) and len(str(value).split(".")[-1]) > 3:
-            raise ValueError(" tiene más de 3 decimales.")
 
-        return super().__new__(cls, value)
+class PositiveNumber(Definition):
+    """Number definition."""
+    __slots__ = ()
+    min_val = 0
+    max_val = 1_000_000_000_00.0
+    max_decimals = 3
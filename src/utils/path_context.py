@@ -0,0 +1,58 @@
+"""This module tracks the location of the element being validated."""
+from contextlib import contextmanager
+from typing import Iterator, List, Optional, Tuple
+
+
+class PathContext:
+    """Location in the report as a stack of keys with an optional list index each.
+
+    Validators move the innermost index while they iterate and push a key when they
+    descend, every step is O(1); the source text is only built by ``render`` when an
+    error is stored, e.g. ``Complemento[0].Nacional[2].CFDIs[41].Cfdi``."""
+    __slots__ = ("_keys", "_indices")
+
+    def __init__(self, key: Optional[str] = None, index: Optional[int] = None) -> None:
+        self._keys: List[str] = []
+        self._indices: List[Optional[int]] = []
+        if key is not None:
+            self.push(key=key, index=index)
+
+    def push(self, key: str, index: Optional[int] = None) -> None:
+        """Descend into key, index is given when key holds a list.\n
+        :return: None."""
+        self._keys.append(key)
+        self._indices.append(index)
+
+    def pop(self) -> None:
+        """Go back to the parent element.\n
+        :return: None."""
+        self._keys.pop()
+        self._indices.pop()
+
+    def set_index(self, index: int) -> None:
+        """Move the innermost list to the given index.\n
+        :return: None."""
+        self._indices[-1] = index
+
+    @property
+    def indices(self) -> Tuple[Optional[int], ...]:
+        """List index of every key, outermost first."""
+        return tuple(self._indices)
+
+    @contextmanager
+    def at(self, key: str, index: Optional[int] = None) -> Iterator["PathContext"]:
+        """Push key for the duration of the block, it is popped even if the block raises."""
+        self.push(key=key, index=index)
+        try:
+            yield self
+        finally:
+            self.pop()
+
+    def render(self, source: Optional[str] = None) -> str:
+        """Build the dotted source of the current element.\n
+        :param source: Key path relative to the current element.\n
+        :return: str."""
+        parts = [key if index is None else f"{key}[{index}]" for key, index in zip(self._keys, self._indices)]
+        if source is not None:
+            parts.append(source)
+        return ".".join(parts)
@@ -0,0 +1,69 @@
+"""This module tracks validation progress for background jobs."""
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterator, Optional
+
+PROGRESS_KEYS = ("products", "complements", "cfdis")
+
+_current_tracker = ContextVar("progress_tracker", default=None)
+
+
+class ProgressTracker:
+    """Count processed products, complements and CFDIs.
+
+    ``on_update`` receives the counters at most once every ``interval`` seconds
+    and once more on ``flush``."""
+
+    def __init__(self, on_update: Callable[[Dict[str, int]], None], interval: float = 0.5) -> None:
+        self.on_update = on_update
+        self.interval = interval
+        self.counts = dict.fromkeys(PROGRESS_KEYS, 0)
+        self.total_products = None
+        self._last_update = 0.0
+
+    def advance(self, key: str, amount: int = 1) -> None:
+        """Add amount to the key counter."""
+        self.counts[key] += amount
+        if (now := time.monotonic()) - self._last_update >= self.interval:
+            self._last_update = now
+            self.flush()
+
+    def flush(self) -> None:
+        """Report the current counters."""
+        self.on_update(dict(self.counts, total_products=self.total_products))
+
+
+def advance(key: str, amount: int = 1) -> None:
+    """Advance the active tracker, no-op when validation is not tracked."""
+    if (tracker := _current_tracker.get()) is not None:
+        tracker.advance(key, amount)
+
+
+def set_total_products(total: Optional[int]) -> None:
+    """Set the number of products of the report being tracked."""
+    if (tracker := _current_tracker.get()) is not None:
+        tracker.total_products = total
+
+
+def count_cfdis(complement: dict) -> int:
+    """Number of CFDIs declared in a complement 'Nacional' list."""
+    national = complement.get("Nacional") if isinstance(complement, dict) else None
+    if not isinstance(national, list):
+        return 0
+    return sum(
+        len(cfdis)
+        for item in national
+        if isinstance(item, dict) and isinstance(cfdis := item.get("CFDIs"), list)
+        )
+
+
+@contextmanager
+def tracking(tracker: ProgressTracker) -> Iterator[ProgressTracker]:
+    """Make tracker the active one while the block runs."""
+    token = _current_tracker.set(tracker)
+    try:
+        yield tracker
+    finally:
+        _current_tracker.reset(token)
+        tracker.flush()
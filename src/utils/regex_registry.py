@@ -0,0 +1,87 @@
+"""This module keeps every validation pattern compiled once, with usage counters."""
+import os
+import re
+import time
+from typing import Any, Dict, Iterable, List, Mapping, Optional
+
+REGEX_STATS = os.getenv("REGEX_STATS", "false").lower() in ("1", "true", "yes")
+
+
+class RegexMatcher:
+    """Compiled pattern callable as ``matcher(value)``, same result as ``re.match(pattern, value)``.
+
+    Calls are always counted; time is only measured when REGEX_STATS is enabled."""
+    __slots__ = ("name", "pattern", "calls", "seconds", "_match", "_timed")
+
+    def __init__(self, name: str, pattern: str, timed: bool = REGEX_STATS) -> None:
+        self.name = name
+        self.pattern = pattern
+        self.calls = 0
+        self.seconds = 0.0
+        self._match = re.compile(pattern).match
+        self._timed = timed
+
+    def __call__(self, value: str) -> Optional[re.Match]:
+        self.calls += 1
+        if not self._timed:
+            return self._match(value)
+        start = time.perf_counter()
+        try:
+            return self._match(value)
+        finally:
+            self.seconds += time.perf_counter() - start
+
+
+class RegexRegistry:
+    """Named matchers, ``regex.RFC_REGEX(value)`` is a plain attribute lookup and a call."""
+
+    def __init__(self, timed: bool = REGEX_STATS) -> None:
+        self._timed = timed
+        self._matchers: Dict[str, RegexMatcher] = {}
+
+    def register(self, name: str, pattern: str) -> RegexMatcher:
+        """Compile pattern under name, registering the same name twice must give the same pattern.\n
+        :return: RegexMatcher."""
+        if (matcher := self._matchers.get(name)) is not None:
+            if matcher.pattern != pattern:
+                raise ValueError(f"Error: el patrón '{name}' ya fue registrado con otro valor.")
+            return matcher
+        matcher = RegexMatcher(name=name, pattern=pattern, timed=self._timed)
+        self._matchers[name] = matcher
+        setattr(self, name, matcher)
+        return matcher
+
+    def register_all(self, namespace: Mapping[str, Any], names: Iterable[str]) -> None:
+        """Register the given constant names of a module namespace.\n
+        :return: None."""
+        for name in names:
+            self.register(name=name, pattern=namespace[name])
+
+    def set_timing(self, enabled: bool) -> None:
+        """Turn time measurement on or off for every pattern.\n
+        :return: None."""
+        self._timed = enabled
+        for matcher in self._matchers.values():
+            matcher._timed = enabled
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """Counters per pattern, the most expensive first."""
+        return [
+            {
+                "name": matcher.name,
+                "calls": matcher.calls,
+                "seconds": round(matcher.seconds, 6),
+                "avg_us": round(matcher.seconds / matcher.calls * 1e6, 3) if matcher.calls else 0.0,
+                }
+            for matcher in sorted(self._matchers.values(), key=lambda item: (-item.seconds, -item.calls))
+            ]
+
+    def reset_stats(self) -> None:
+        """Set every counter to zero.\n
+        :return: None."""
+        for matcher in self._matchers.values():
+            matcher.calls = 0
+            matcher.seconds = 0.0
+
+
+regex = RegexRegistry()
@@ -0,0 +1,253 @@
+"""This module runs report validations on a pool of pre-warmed worker processes."""
+import asyncio
+import importlib
+import ipaddress
+import json
+import multiprocessing
+import os
+import socket
+import urllib.request
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional
+from urllib.parse import urlparse
+
+from src.custom_exceptions import ClienteDesconectadoError
+from src.enumerators import JobStatusEnum
+from src.job_store import job_store
+from src.json_validator import JsonValidator
+from src.utils.decode_errors import DecodeErrorLocator
+from src.utils.definitions import parse_json_float
+from src.utils.logger import logger
+from src.utils.progress import ProgressTracker, set_total_products, tracking
+
+logging = logger()
+
+VALIDATION_WORKERS = int(os.getenv("VALIDATION_WORKERS", str(os.cpu_count() or 1)))
+DISCONNECT_POLL_SECONDS = float(os.getenv("DISCONNECT_POLL_SECONDS", "0.5"))
+CALLBACK_TIMEOUT_SECONDS = float(os.getenv("CALLBACK_TIMEOUT_SECONDS", "10"))
+CALLBACK_WORKERS = int(os.getenv("CALLBACK_WORKERS", "4"))
+# Hosts permitidos para callback_url separados por coma; vacío permite cualquier host público.
+CALLBACK_ALLOWED_HOSTS = frozenset(
+    host.strip().lower() for host in os.getenv("CALLBACK_ALLOWED_HOSTS", "").split(",") if host.strip()
+    )
+PRELOAD_MODULES = [
+    "src.json_validator",
+    "src.product_validator",
+    "src.monthly_log",
+    "src.monthly_volume_report",
+    "src.complements.helpers",
+    "src.utils.decode_errors",
+    "src.archive_stream",
+    ]
+
+_pool: Optional[ProcessPoolExecutor] = None
+_callback_pool: Optional[ThreadPoolExecutor] = None
+
+
+def _warm_up() -> None:
+    """Worker initializer, import validator modules so the first job does not pay for it."""
+    for module in PRELOAD_MODULES:
+        importlib.import_module(module)
+
+
+def _ping() -> int:
+    return os.getpid()
+
+
+def get_pool() -> ProcessPoolExecutor:
+    """Return the shared pool, creating it on first use."""
+    global _pool
+    if _pool is None:
+        if "forkserver" in multiprocessing.get_all_start_methods():
+            context = multiprocessing.get_context("forkserver")
+            context.set_forkserver_preload(PRELOAD_MODULES)
+        else:
+            context = multiprocessing.get_context("spawn")
+        _pool = ProcessPoolExecutor(
+            max_workers=max(VALIDATION_WORKERS, 1),
+            mp_context=context,
+            initializer=_warm_up,
+            )
+    return _pool
+
+
+async def start_pool() -> None:
+    """Create the pool and start every worker before the first request."""
+    pool = get_pool()
+    loop = asyncio.get_running_loop()
+    pids = await asyncio.gather(*(loop.run_in_executor(pool, _ping) for _ in range(max(VALIDATION_WORKERS, 1))))
+    logging.info(f"Pool de validación iniciado con {len(set(pids))} procesos.")
+
+
+def shutdown_pool() -> None:
+    """Stop the workers, pending jobs are cancelled. Callbacks being sent are not waited for."""
+    global _pool, _callback_pool
+    if _pool is not None:
+        _pool.shutdown(wait=True, cancel_futures=True)
+        _pool = None
+    if _callback_pool is not None:
+        _callback_pool.shutdown(wait=False, cancel_futures=True)
+        _callback_pool = None
+
+
+def _get_callback_pool() -> ThreadPoolExecutor:
+    global _callback_pool
+    if _callback_pool is None:
+        _callback_pool = ThreadPoolExecutor(max_workers=max(CALLBACK_WORKERS, 1), thread_name_prefix="callback")
+    return _callback_pool
+
+
+async def run_in_pool(func: Callable, *args, request=None, **kwargs) -> Any:
+    """Run func on the pool without blocking the event loop.\n
+    :param request: when given, a client disconnection cancels the job if it did not start yet;
+    a running job is left to finish and its result discarded.
+    :return: func result.
+    :raise ClienteDesconectadoError: if the client disconnected."""
+    loop = asyncio.get_running_loop()
+    future = loop.run_in_executor(get_pool(), partial(func, *args, **kwargs))
+    if request is None:
+        return await future
+
+    while True:
+        done, _ = await asyncio.wait({future}, timeout=DISCONNECT_POLL_SECONDS)
+        if done:
+            return future.result()
+        if await request.is_disconnected():
+            future.cancel()
+            raise ClienteDesconectadoError("Cliente desconectado.")
+
+
+def validate_upload(
+        content: bytes,
+        filename: str,
+        pretty: bool = False,
+        record_history: bool = True,
+    ) -> Dict[str, Any]:
+    """Decode, parse and validate an uploaded report, runs inside the workers.\n
+    :param pretty: include 'json_data' re-serialized with indent.
+    :param record_history: False to check the CFDI history without recording the report.
+    :return: dict with 'errors', 'valid_utf8' and optionally 'json_data'."""
+    decode_errors = DecodeErrorLocator()
+    json_data = json.loads(decode_errors.decode(content, final=True), parse_float=parse_json_float)
+    products = json_data.get("Producto") if isinstance(json_data, dict) else None
+    if isinstance(products, list):
+        set_total_products(len(products))
+
+    # Validamos el JSON
+    validator = JsonValidator(json_report=json_data, record_history=record_history)
+    validator.set_json()
+    validator.validate_json_name(name=filename)
+    validator.validate_json()
+
+    result = {
+        "errors": format_errors(validator.get_errors()) + decode_errors.get_errors(),
+        "valid_utf8": not decode_errors.total,
+        }
+    if pretty:
+        result["json_data"] = json.dumps(json_data, indent=4)
+    return result
+
+
+def submit_job(job_id: str, content: bytes, filename: str) -> None:
+    """Queue a stored job on the pool, a pool failure marks the job as failed.
+    The callback, if any, is sent from a thread of this process once the job is done, so it
+    never holds a validation worker.\n
+    :return: None."""
+    def _on_done(future) -> None:
+        if future.cancelled():
+            return
+        _get_callback_pool().submit(_finish_job, job_id, future.exception())
+
+    get_pool().submit(run_job, job_id=job_id, content=content, filename=filename).add_done_callback(_on_done)
+
+
+def run_job(job_id: str, content: bytes, filename: str) -> None:
+    """Validate a stored job reporting progress, runs inside the workers.\n
+    :return: None."""
+    job_store.set_status(job_id, JobStatusEnum.RUNNING)
+    tracker = ProgressTracker(on_update=partial(job_store.update_progress, job_id))
+    try:
+        with tracking(tracker):
+            result = validate_upload(content=content, filename=filename)
+        job_store.save_results(job_id, result["errors"])
+    except Exception as exc:
+        job_store.set_status(job_id, JobStatusEnum.FAILED, error=f"Error al cargar el archivo: {exc}")
+
+
+def _finish_job(job_id: str, exc: Optional[BaseException]) -> None:
+    """Mark the job as failed if the pool could not run it and send its callback.\n
+    :return: None."""
+    if exc is not None:
+        logging.error(f"Trabajo {job_id} no se pudo ejecutar: {exc}")
+        job_store.set_status(job_id, JobStatusEnum.FAILED, error=f"Error al validar el archivo: {exc}")
+    if (job := job_store.get_job(job_id)) and job["callback_url"]:
+        _send_callback(job)
+
+
+def check_callback_url(url: str) -> None:
+    """Check that a callback url is http(s) and that its host is in CALLBACK_ALLOWED_HOSTS or,
+    without an allowlist, that every address it resolves to is public. Private, loopback,
+    link-local (e.g. 169.254.169.254), multicast and reserved addresses are rejected.\n
+    :raise ValueError: if the url is not allowed.\n
+    :return: None."""
+    parsed = urlparse(url)
+    if parsed.scheme not in ("http", "https") or not parsed.hostname:
+        raise ValueError("Error: callback_url debe ser una url http o https.")
+    host = parsed.hostname.lower()
+    if CALLBACK_ALLOWED_HOSTS:
+        if host not in CALLBACK_ALLOWED_HOSTS:
+            raise ValueError(f"Error: el host {host} de callback_url no está permitido.")
+        return
+
+    try:
+        port = parsed.port or (443 if parsed.scheme == "https" else 80)
+        addresses = {info[4][0] for info in socket.getaddrinfo(host, port, proto=socket.IPPROTO_TCP)}
+    except (OSError, ValueError) as exc:
+        raise ValueError(f"Error: no se pudo resolver el host {host} de callback_url: {exc}") from exc
+    for address in addresses:
+        ip = ipaddress.ip_address(address.split("%", 1)[0])
+        if ip.version == 6 and ip.ipv4_mapped is not None:
+            ip = ip.ipv4_mapped
+        if not ip.is_global or ip.is_multicast:
+            raise ValueError(f"Error: el host {host} de callback_url resuelve a una dirección no pública.")
+
+
+class _NoRedirect(urllib.request.HTTPRedirectHandler):
+    """Do not follow redirects, the target of a redirect was not checked."""
+
+    def redirect_request(self, req, fp, code, msg, headers, newurl):
+        return None
+
+
+_callback_opener = urllib.request.build_opener(_NoRedirect)
+
+
+def _send_callback(job: Dict[str, Any]) -> None:
+    """POST the final job status to its callback url, failures are only logged. The url is
+    checked again since its host may resolve to another address than when the job was queued."""
+    payload = {key: job[key] for key in ("id", "status", "error", "total_errors", "progress")}
+    callback = urllib.request.Request(
+        job["callback_url"],
+        data=json.dumps(payload).encode("UTF-8"),
+        headers={"Content-Type": "application/json"},
+        method="POST",
+        )
+    try:
+        check_callback_url(job["callback_url"])
+        with _callback_opener.open(callback, timeout=CALLBACK_TIMEOUT_SECONDS):
+            pass
+    except Exception as exc:
+        logging.warning(f"Error al notificar el trabajo {job['id']} a {job['callback_url']}: {exc}")
+
+
+def format_errors(errors: List[dict]) -> List[Dict[str, str]]:
+    """Normalize validator errors for the response."""
+    return [
+        {
+            "type_error": error.get("type_error", "Desconocido"),
+            "error": error.get("error", "Sin mensaje"),
+            "source": error.get("source", "Objeto no encontrado.")
+        }
+        for error in errors
+        ]
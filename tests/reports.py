@@ -0,0 +1,175 @@
+"""Small monthly reports built in code for the equivalence tests."""
+import copy
+import json
+import random
+import uuid
+
+from src.complements.helpers import complement_builder
+from src.json_validator import JsonValidator
+from src.utils.definitions import parse_json_float
+
+COMPLEMENT_TYPES = ("Almacenamiento", "CDLRGN", "Comercializacion", "Distribucion", "Expendio", "Transporte")
+
+# Lexemas válidos, fuera de rango, con decimales de más, de otro tipo y null.
+LEXEMES = (
+    "10.5", "0", "-1", "1.2345", "1e-5", "12e2", "true", '"7"', "null", "1e13", "100000000001", "3", "0.001",
+    "[1]", "{}",
+    )
+PRICE_KEYS = (
+    "PrecioCompra", "PrecioVenta", "Contraprestacion", "TarifaDeAlmacenamiento", "Descuento", "CargoPorUsoAlmac",
+    "PrecioVentaOCompraOContrap", "TarifaDeTransporte", "PrecioDeVentaAlPublico",
+    )
+
+
+def build_cfdi(rng: random.Random, index: int) -> dict:
+    return {
+        "Cfdi": str(uuid.UUID(int=rng.getrandbits(128))).upper(),
+        "TipoCfdi": "Ingreso" if index % 7 else "Otro",
+        "PrecioCompra": 10.5,
+        "PrecioVenta": 12.5,
+        "Contraprestacion": 100.125 + index,
+        "PrecioVentaOCompraOContrap": 100.125,
+        "FechaYHoraTransaccion": "2024-01-02T10:00:00-06:00" if index % 5 else "2024-01-02",
+        "VolumenDocumentado": {"ValorNumerico": 10.0 + index, "UnidadDeMedida": "UM03"},
+        }
+
+
+def build_complement(rng: random.Random, complement_type: str, cfdis: int) -> dict:
+    return {
+        "TipoComplemento": complement_type,
+        "Nacional": [{
+            "RfcClienteOProveedor": "AAA010101AAA",
+            "NombreClienteOProveedor": "Proveedor Ejemplo SA",
+            "PermisoProveedor": "H/12345/COM/2020",
+            "PermisoClienteOProveedor": "H/12345/COM/2020",
+            "CFDIs": [build_cfdi(rng=rng, index=index) for index in range(cfdis)],
+            }],
+        }
+
+
+def build_product(rng: random.Random, index: int, complement_type: str, cfdis: int) -> dict:
+    return {
+        "ClaveProducto": "PR07" if index % 2 == 0 else "PR12",
+        "ClaveSubProducto": "SP16" if index % 2 == 0 else None,
+        "ComposOctanajeGasolina": 87,
+        "GasolinaConCombustibleNoFosil": "No",
+        "ReporteDeVolumenMensual": {
+            "ControlDeExistencias": {
+                "VolumenExistenciasMes": 100.5,
+                "FechaYHoraEstaMedicionMes": "2024-01-31T23:00:00-06:00",
+                },
+            "Recepciones": {
+                "TotalRecepcionesMes": 3,
+                "SumaVolumenRecepcionMes": {"ValorNumerico": 30.0, "UnidadDeMedida": "UM03"},
+                "TotalDocumentosMes": cfdis,
+                "ImporteTotalRecepcionesMensual": 300.0,
+                "Complemento": [build_complement(rng=rng, complement_type=complement_type, cfdis=cfdis)],
+                },
+            "Entregas": {
+                "TotalEntregasMes": 2,
+                "SumaVolumenEntregadoMes": {"ValorNumerico": 20.0, "UnidadDeMedida": "UM03"},
+                "TotalDocumentosMes": cfdis,
+                "ImporteTotalEntregasMes": 200.0,
+                "Complemento": [build_complement(rng=rng, complement_type=complement_type, cfdis=cfdis)],
+                },
+            },
+        }
+
+
+def build_numeric_complement(rng: random.Random, complement_type: str, records: int = 300) -> list:
+    """Complement parsed from JSON text as uploads are, with CFDIs and pedimentos whose
+    numeric keys take any of LEXEMES."""
+    cfdis = []
+    for _ in range(records):
+        members = [
+            '"Cfdi": "CD613E30-D8F1-6ADF-91B7-584A2265B1F5"',
+            '"TipoCfdi": "Ingreso"',
+            '"FechaYHoraTransaccion": "2024-01-02T10:00:00-06:00"',
+            ]
+        members.extend(f'"{key}": {rng.choice(LEXEMES)}' for key in PRICE_KEYS if rng.random() < 0.5)
+        volume = rng.choice((
+            '{"ValorNumerico": %s, "UnidadDeMedida": "UM03"}' % rng.choice(LEXEMES),
+            "null", '"x"', '{"UnidadDeMedida": "UM03"}',
+            ))
+        members.append(f'"VolumenDocumentado": {volume}')
+        cfdis.append("{" + ", ".join(members) + "}")
+    pedimentos = [
+        cfdi.replace("PrecioCompra", "PrecioDeImportacion").replace("Descuento", "PrecioDeImportacionOExportacion")
+        for cfdi in cfdis
+        ]
+    return json.loads(
+        '[{"TipoComplemento": "%s", "Nacional": [{"CFDIs": [%s]}], "Extranjero": [{"Pedimentos": [%s]}]}]'
+        % (complement_type, ", ".join(cfdis), ", ".join(pedimentos)),
+        parse_float=parse_json_float,
+        )
+
+
+def build_report(products: int = 2, cfdis: int = 3, logs: int = 3, complement_type: str = "Comercializacion",
+                 seed: int = 1) -> dict:
+    """Report with errors of every kind: CFDI dates, totals, repeated UUIDs across products
+    when the seed is reused and log entries."""
+    rng = random.Random(seed)
+    return {
+        "Version": "1.0",
+        "RfcContribuyente": "AAA010101AAA",
+        "RfcRepresentanteLegal": "AAAA010101AAA",
+        "RfcProveedor": "BBB010101BBB",
+        "Caracter": "permisionario",
+        "ModalidadPermiso": "PER5",
+        "NumPermiso": "H/12345/COM/2020",
+        "ClaveInstalacion": "CLAVE0001",
+        "DescripcionInstalacion": "Instalacion",
+        "NumeroPozos": 0,
+        "NumeroTanques": 1,
+        "NumeroDuctosEntradaSalida": 0,
+        "NumeroDuctosTransporteDistribucion": 0,
+        "NumeroDispensarios": 0,
+        "FechaYHoraReporteMes": "2024-01-31T23:59:59-06:00",
+        "Producto": [
+            build_product(rng=rng, index=index, complement_type=complement_type, cfdis=cfdis)
+            for index in range(products)
+            ],
+        "BitacoraMensual": [
+            {
+                "NumeroRegistro": index + 1,
+                "FechaYHoraEvento": "2024-01-01T00:00:00-06:00",
+                "TipoEvento": 5 if index % 2 else 99,
+                "DescripcionEvento": "Evento",
+                }
+            for index in range(logs)
+            ],
+        }
+
+
+def validate(report: dict, filename: str = "M_x.json") -> list:
+    """Errors of a report validated after parsing it whole."""
+    validator = JsonValidator(json_report=json.loads(json.dumps(report)))
+    validator.set_json()
+    validator.validate_json_name(name=filename)
+    validator.validate_json()
+    return validator.get_errors()
+
+
+def validate_complement(complement: list, complement_type: str) -> list:
+    """Errors of one complement as (type, message, source), in order."""
+    complement_obj = complement_builder(complement_data=copy.deepcopy(complement), complement_type=complement_type)
+    complement_obj.validate_complemento()
+    return [(error.get("type_error"), error.get("error"), error.get("source")) for error in complement_obj.get_error_list()]
+
+
+def validate_streamed(raw: bytes, chunk_size: int, filename: str = "M_x.json") -> list:
+    """Errors of a report validated while it is fed to the stream parser by chunks."""
+    validator = JsonValidator(json_report={})
+    parser = validator.stream_parser()
+    for start in range(0, len(raw), chunk_size):
+        parser.feed(raw[start:start + chunk_size])
+    parser.close()
+    validator.set_json()
+    validator.validate_json_name(name=filename)
+    validator.validate_json()
+    return validator.get_errors()
+
+
+def error_set(errors: list) -> list:
+    """Errors as a sorted list of json strings, to compare runs that may order them differently."""
+    return sorted(json.dumps(error, default=str, sort_keys=True) for error in errors)
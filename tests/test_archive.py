@@ -0,0 +1,59 @@
+"""Uploads validated by chunks from a copy, zip uploads by members."""
+import gzip
+import io
+import json
+import os
+
+from src import archive_stream
+from src.result_cache import ResultCache
+from tests.reports import build_report
+from tests.test_batch import build_zip
+
+
+def test_only_json_members():
+    archive = build_zip({
+        "reportes/M_x.json": json.dumps(build_report()).encode("UTF-8"),
+        "reportes/notas.txt": b"x",
+        "__MACOSX/reportes/._M_x.json": b"x",
+        })
+    names = [name for name, _ in archive_stream.iter_archive(fileobj=archive, kind="zip", filename="reportes.zip")]
+    assert names == ["M_x.json"]
+
+
+def test_member_error_reported(monkeypatch):
+    validate_stream = archive_stream.validate_stream
+
+    def breaking(reader, filename, **kwargs):
+        if filename == "roto.json":
+            raise RuntimeError("falla")
+        return validate_stream(reader=reader, filename=filename, **kwargs)
+
+    monkeypatch.setattr(archive_stream, "validate_stream", breaking)
+    report = json.dumps(build_report()).encode("UTF-8")
+    archive = build_zip({"roto.json": report, "M_x.json": report})
+    errors = archive_stream.validate_archive(fileobj=archive, kind="zip", filename="reportes.zip", record_history=False)["errors"]
+    assert errors[0] == {"type_error": "RuntimeError", "error": "Error al cargar el archivo: falla", "filename": "roto.json"}
+    assert len(errors) > 1 and all(error["filename"] == "M_x.json" for error in errors[1:])
+
+
+def test_saved_upload_same_errors():
+    """A json report and its gzip are validated the same from the copy the workers read."""
+    report = json.dumps(build_report()).encode("UTF-8")
+    results = []
+    for kind, content in ((None, report), ("gzip", gzip.compress(report))):
+        upload = io.BytesIO(content)
+        path = archive_stream.save_upload(upload)
+        try:
+            results.append(archive_stream.validate_file(path=path, kind=kind, filename="M_x.json", record_history=False))
+        finally:
+            os.unlink(path)
+        assert upload.tell() == 0
+    assert results[0]["errors"] and results[0]["valid_utf8"]
+    assert results[1]["errors"] == results[0]["errors"]
+
+
+def test_disabled_cache_stores_nothing():
+    cache = ResultCache(max_entries=0)
+    cache.put("clave", {"errors": []})
+    cache.put(None, {"errors": []})
+    assert not cache.enabled and cache.get("clave") is None and cache.get(None) is None
@@ -0,0 +1,40 @@
+"""Zip members of a /batch upload."""
+import asyncio
+import io
+import zipfile
+
+from starlette.datastructures import UploadFile
+
+from src import batch_validator
+
+
+def build_zip(members: dict) -> io.BytesIO:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for name, content in members.items():
+            archive.writestr(name, content)
+    buffer.seek(0)
+    return buffer
+
+
+async def collect(upload: UploadFile) -> list:
+    return [member async for member in batch_validator.iter_members([upload])]
+
+
+def test_only_json_members():
+    upload = UploadFile(file=build_zip({
+        "reportes/enero.json": b"{}",
+        "reportes/notas.txt": b"x",
+        "__MACOSX/reportes/._enero.json": b"x",
+        "reportes/._febrero.json": b"x",
+        "reportes/FEBRERO.JSON": b"[]",
+        }), filename="reportes.zip")
+    assert asyncio.run(collect(upload)) == [("enero.json", b"{}"), ("FEBRERO.JSON", b"[]")]
+
+
+def test_member_over_limit(monkeypatch):
+    monkeypatch.setattr(batch_validator, "ARCHIVE_MAX_BYTES", 1024)
+    upload = UploadFile(file=build_zip({"grande.json": b" " * 4096, "chico.json": b"{}"}), filename="reportes.zip")
+    (big_name, big), small = asyncio.run(collect(upload))
+    assert big_name == "grande.json" and isinstance(big, ValueError)
+    assert small == ("chico.json", b"{}")
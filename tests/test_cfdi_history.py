@@ -0,0 +1,43 @@
+"""CFDI history: only valid reports are recorded, a period is replaced or dropped as a whole."""
+import pytest
+
+from src import json_validator
+from src.complements.cfdi_history import CfdiHistory
+from src.json_validator import JsonValidator
+
+RFC = "AAA010101AAA"
+FIRST, SECOND = bytes(range(16)), bytes(range(1, 17))
+
+
+@pytest.fixture
+def history(tmp_path, monkeypatch):
+    history = CfdiHistory(path=str(tmp_path / "cfdis.db"))
+    monkeypatch.setattr(json_validator, "cfdi_history", history)
+    return history
+
+
+def test_record_replaces_period(history):
+    history.record(rfc=RFC, period="2024-01", uuids=[FIRST, SECOND])
+    history.record(rfc=RFC, period="2024-01", uuids=[SECOND])
+    assert history.previous_periods(rfc=RFC, period="2024-02", uuids=[FIRST, SECOND]) == {SECOND: "2024-01"}
+
+
+def test_forget(history):
+    history.record(rfc=RFC, period="2024-01", uuids=[FIRST, SECOND])
+    history.record(rfc=RFC, period="2024-02", uuids=[FIRST])
+    assert history.forget(rfc=RFC, period="2024-01") == 2
+    assert history.previous_periods(rfc=RFC, period="2024-03", uuids=[FIRST, SECOND]) == {FIRST: "2024-02"}
+
+
+@pytest.mark.parametrize("record_history, errors, recorded", [
+    (True, [], True),
+    (True, [{"type_error": "ValorError", "error": "Error: ..."}], False),
+    (False, [], False),
+    ])
+def test_record_only_valid_reports(history, record_history, errors, recorded):
+    validator = JsonValidator(json_report={}, record_history=record_history)
+    validator._history = (RFC, "2024-01", [FIRST])
+    validator._errors = errors
+    validator._record_cfdi_history()
+    found = history.previous_periods(rfc=RFC, period="2024-02", uuids=[FIRST])
+    assert bool(found) is recorded
@@ -0,0 +1,51 @@
+"""Background jobs: callback urls and the jobs left behind by a stopped API process."""
+import pytest
+
+from src import validation_pool
+from src.enumerators import JobStatusEnum
+from src.job_store import ORPHANED_MESSAGE, JobStore
+from src.validation_pool import check_callback_url
+
+
+@pytest.mark.parametrize("url", [
+    "ftp://example.com/",
+    "http://127.0.0.1:8000/done",
+    "http://10.0.0.5/done",
+    "http://192.168.1.10/done",
+    "http://169.254.169.254/latest/meta-data/",
+    "http://[::1]/done",
+    "http://[::ffff:127.0.0.1]/done",
+    "http://0.0.0.0/done",
+    ])
+def test_callback_url_rejected(url):
+    with pytest.raises(ValueError):
+        check_callback_url(url)
+
+
+def test_callback_url_public_address():
+    check_callback_url("https://93.184.215.14/done")
+
+
+def test_callback_url_allowlist(monkeypatch):
+    monkeypatch.setattr(validation_pool, "CALLBACK_ALLOWED_HOSTS", frozenset({"hooks.internal"}))
+    check_callback_url("http://hooks.internal/done")
+    with pytest.raises(ValueError):
+        check_callback_url("https://93.184.215.14/done")
+
+
+def test_orphaned_jobs_fail(tmp_path):
+    path = str(tmp_path / "jobs.db")
+    alive, stopped = JobStore(path=path), JobStore(path=path)
+    alive.heartbeat()
+    stopped.heartbeat()
+    alive_job = alive.create_job(filename="a.json")
+    stopped_job = stopped.create_job(filename="b.json")
+    stopped.set_status(stopped_job, JobStatusEnum.RUNNING)
+
+    assert alive.fail_orphaned() == 0
+    stopped.conn.execute("UPDATE job_owners SET seen_at = 0 WHERE owner = ?", (stopped.owner,))
+    assert alive.fail_orphaned() == 1
+
+    job = alive.get_job(stopped_job)
+    assert (job["status"], job["error"]) == (JobStatusEnum.FAILED.value, ORPHANED_MESSAGE)
+    assert alive.get_job(alive_job)["status"] == JobStatusEnum.QUEUED.value
@@ -0,0 +1,51 @@
+"""JsonRoot is a view of one report, so reports validated at once in threads do not mix."""
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.json_model import JsonRoot
+from tests.reports import COMPLEMENT_TYPES, build_report, validate, validate_streamed
+
+
+def reports() -> list:
+    """Reports of every complement type, of another caracter and with missing keys."""
+    reports = [build_report(products=2, cfdis=3, complement_type=name, seed=seed)
+               for seed, name in enumerate(COMPLEMENT_TYPES)]
+    contratista = build_report(seed=10)
+    contratista.update({"Caracter": "contratista", "NumContratoOAsignacion": "CNH-R01-L01-A1/2015"})
+    missing = build_report(seed=11)
+    del missing["RfcProveedor"], missing["ModalidadPermiso"]
+    return [*reports, contratista, missing]
+
+
+def test_view_is_read_only():
+    data = {"Caracter": "usuario"}
+    root = JsonRoot(json_data=data)
+    with pytest.raises(TypeError):
+        root["Caracter"] = "contratista"
+    data["Version"] = "1.0"
+    assert dict(root) == data and root.caracter == "usuario"
+
+
+def test_missing_keys_per_caracter():
+    root = JsonRoot(json_data={"Caracter": "usuario", "Version": "1.0"})
+    assert "InstalacionAlmacenGasNatural" in root.missing_keys()
+    assert "NumContratoOAsignacion" not in root.missing_keys()
+    with pytest.raises(KeyError):
+        root.check_keys()
+
+
+def test_threads_match_sequential():
+    cases = reports()
+    raws = [json.dumps(report).encode("UTF-8") for report in cases]
+    expected = [validate(report) for report in cases] + [validate_streamed(raw, chunk_size=1 << 10) for raw in raws]
+    jobs = [(validate, report) for report in cases] + [(validate_streamed, raw) for raw in raws]
+
+    def run(job):
+        function, data = job
+        return function(data) if function is validate else function(data, chunk_size=1 << 10)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(run, jobs * 3))
+    assert results == expected * 3
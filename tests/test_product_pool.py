@@ -0,0 +1,54 @@
+"""The product pool reports the same errors, in the same order, as a sequential run."""
+import copy
+import random
+
+import pytest
+
+from src import monthly_volume_report, product_pool
+from tests.reports import COMPLEMENT_TYPES, build_complement, build_report, validate
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    monkeypatch.setattr(product_pool, "PRODUCT_WORKERS", 2)
+    monkeypatch.setattr(product_pool, "PARALLEL_MIN_CFDIS", 0)
+    monkeypatch.setattr(monthly_volume_report, "COMPLEMENT_TASKS_MIN_CFDIS", 0)
+    yield
+    product_pool.shutdown_pool()
+
+
+def repeated_report(complement_type: str) -> dict:
+    """Report whose last product repeats the CFDIs of the first one."""
+    report = build_report(products=5, cfdis=4, complement_type=complement_type)
+    report["Producto"][-1]["ReporteDeVolumenMensual"] = copy.deepcopy(report["Producto"][0]["ReporteDeVolumenMensual"])
+    return report
+
+
+def run(monkeypatch, report: dict, mode: str) -> dict:
+    results = {}
+    for enabled in (False, True):
+        monkeypatch.setattr(product_pool, mode, enabled)
+        results[enabled] = validate(report)
+    # La corrida en paralelo usó el pool.
+    assert product_pool._pool is not None
+    return results
+
+
+@pytest.mark.parametrize("complement_type", COMPLEMENT_TYPES)
+def test_parallel_products(pool, monkeypatch, complement_type):
+    results = run(monkeypatch, report=repeated_report(complement_type=complement_type), mode="PARALLEL_PRODUCTS")
+    assert any("duplicado" in error["error"] for error in results[False])
+    assert results[True] == results[False]
+
+
+@pytest.mark.parametrize("complement_type", COMPLEMENT_TYPES)
+def test_parallel_complements(pool, monkeypatch, complement_type):
+    report = repeated_report(complement_type=complement_type)
+    # Varios elementos Complemento por sección, cada uno es una tarea del pool.
+    for index, product in enumerate(report["Producto"]):
+        for section in ("Recepciones", "Entregas"):
+            complements = product["ReporteDeVolumenMensual"][section]["Complemento"]
+            complements.extend(copy.deepcopy(complements[0]) for _ in range(2))
+            complements.append(build_complement(rng=random.Random(index), complement_type=complement_type, cfdis=3))
+    results = run(monkeypatch, report=report, mode="PARALLEL_COMPLEMENTS")
+    assert results[True] == results[False]
@@ -0,0 +1,32 @@
+"""Every rule table reports values of the wrong type, the value checks skip them."""
+import pytest
+
+from src.complements.rule_tables import COMPLEMENT_RULES
+from tests.reports import validate_complement
+
+SECTIONS = [(name, section) for name, sections in COMPLEMENT_RULES.items() for section in sections]
+
+
+@pytest.mark.parametrize("complement_type,section", SECTIONS)
+def test_wrong_types_reported(complement_type, section):
+    rules = COMPLEMENT_RULES[complement_type][section]
+    for field in rules.fields:
+        if field.fields:
+            continue
+        # Números en claves de texto y texto en claves numéricas.
+        value = 12345 if rules.schema.get(field.key) is str else "x"
+        errors = list(rules.check(record={field.key: value}))
+        assert any(field.key in message for _, message, _ in errors), field.key
+
+
+def test_distribution_permit_not_str():
+    complement = [{
+        "TipoComplemento": "Distribucion",
+        "TerminalAlmYDist": {"Almacenamiento": {
+            "TerminalAlm": "Terminal Norte", "PermisoAlmacenamiento": 12345, "TarifaDeAlmacenamiento": 10,
+            }},
+        }]
+    assert validate_complement(complement=complement, complement_type="Distribucion") == [(
+        "TipadoError", "Error: Clave PermisoAlmacenamiento no es de tipo str",
+        "Complemento[0].TerminalAlmYDist.Almacenamiento",
+        )]
@@ -0,0 +1,61 @@
+"""Generated checkers report the same errors, in the same order, as the interpreted rule tables."""
+import os
+import random
+
+import pytest
+
+from src.complements import rules_codegen, vector_bounds
+from tests.reports import COMPLEMENT_TYPES, build_numeric_complement, build_report, validate, validate_complement
+
+
+def run_both(monkeypatch, validation) -> dict:
+    results = {}
+    for enabled in (True, False):
+        monkeypatch.setattr(rules_codegen, "RULES_CODEGEN", enabled)
+        monkeypatch.setattr(rules_codegen, "_compiled", {})
+        results[enabled] = validation()
+    return results
+
+
+@pytest.mark.parametrize("complement_type", COMPLEMENT_TYPES)
+def test_codegen_matches_rules_report(monkeypatch, complement_type):
+    report = build_report(products=2, cfdis=4, complement_type=complement_type)
+    results = run_both(monkeypatch, lambda: validate(report))
+    assert results[True] == results[False]
+
+
+@pytest.mark.parametrize("vectorized", (False, True))
+@pytest.mark.parametrize("complement_type", COMPLEMENT_TYPES)
+def test_codegen_matches_rules_bounds(monkeypatch, complement_type, vectorized):
+    """Values of every class on the numeric keys; with vectorized bounds the records that pass
+    them are checked by the lean checkers."""
+    monkeypatch.setattr(vector_bounds, "VECTORIZED_BOUNDS", vectorized)
+    monkeypatch.setattr(vector_bounds, "VECTORIZE_MIN_RECORDS", 0)
+    complement = build_numeric_complement(rng=random.Random(complement_type), complement_type=complement_type)
+    results = run_both(monkeypatch, lambda: validate_complement(complement=complement, complement_type=complement_type))
+    assert results[True]
+    assert results[True] == results[False]
+
+
+def test_cache_only_in_private_dir(tmp_path):
+    tables = rules_codegen.COMPLEMENT_RULES["Transporte"]
+    cache_dir = tmp_path / "reglas"
+    rules_codegen.compile_checkers(complement_type="Transporte", tables=tables, cache_dir=str(cache_dir))
+    assert cache_dir.stat().st_mode & 0o777 == 0o700
+    (code_path,) = cache_dir.glob("*.marshal")
+    assert rules_codegen._load_cached(str(code_path)) is not None
+
+    # Un archivo o directorio que otros pueden escribir no se carga ni se usa.
+    code_path.chmod(0o666)
+    assert rules_codegen._load_cached(str(code_path)) is None
+    shared = tmp_path / "compartido"
+    shared.mkdir(mode=0o777)
+    shared.chmod(0o777)
+    rules_codegen.compile_checkers(complement_type="Transporte", tables=tables, cache_dir=str(shared))
+    assert not list(shared.iterdir())
+
+
+def test_cache_off_by_default():
+    if "RULES_CACHE_DIR" in os.environ:
+        pytest.skip("RULES_CACHE_DIR está definido en el entorno.")
+    assert rules_codegen.RULES_CACHE_DIR is None
@@ -0,0 +1,107 @@
+"""A report validated while it is streamed gets the same errors as the report parsed whole."""
+import json
+
+import pytest
+
+from src import json_validator
+from src.complements.helpers import complement_builder
+from tests.reports import COMPLEMENT_TYPES, build_report, error_set, validate, validate_streamed
+
+CHUNK_SIZES = (1, 7, 1 << 20)
+
+
+def move_key_last(data: dict, key: str) -> dict:
+    return {**{name: value for name, value in data.items() if name != key}, key: data[key]}
+
+
+def late_keys(report: dict) -> dict:
+    """TipoComplemento after Nacional in every complement and Caracter after Producto."""
+    for product in report["Producto"]:
+        for section in ("Recepciones", "Entregas"):
+            section_data = product["ReporteDeVolumenMensual"][section]
+            section_data["Complemento"] = [move_key_last(item, "TipoComplemento") for item in section_data["Complemento"]]
+    return move_key_last(move_key_last(report, "Caracter"), "BitacoraMensual")
+
+
+@pytest.mark.parametrize("complement_type", COMPLEMENT_TYPES)
+def test_stream_matches_buffered(complement_type):
+    report = build_report(products=3, cfdis=4, complement_type=complement_type)
+    raw = json.dumps(report).encode("UTF-8")
+    expected = error_set(validate(report))
+    for chunk_size in CHUNK_SIZES:
+        assert error_set(validate_streamed(raw, chunk_size=chunk_size)) == expected
+
+
+def test_stream_matches_buffered_late_keys():
+    report = late_keys(build_report(products=3, cfdis=4))
+    raw = json.dumps(report).encode("UTF-8")
+    expected = error_set(validate(report))
+    for chunk_size in CHUNK_SIZES:
+        assert error_set(validate_streamed(raw, chunk_size=chunk_size)) == expected
+
+
+def test_stream_matches_buffered_malformed():
+    """Records that break a validation are reported with their source and the rest are validated."""
+    report = build_report(products=3, cfdis=4)
+    report["Producto"][0]["ReporteDeVolumenMensual"]["Entregas"] = None
+    report["Producto"][1] = "x"
+    report["BitacoraMensual"][0]["FechaYHoraEvento"] = 20240101
+    report["BitacoraMensual"][1]["DescripcionEvento"] = 5
+    report["BitacoraMensual"][2]["DescripcionEvento"] = 1.5
+    raw = json.dumps(report).encode("UTF-8")
+    expected = error_set(validate(report))
+    for chunk_size in CHUNK_SIZES:
+        assert error_set(validate_streamed(raw, chunk_size=chunk_size)) == expected
+    crashed = {error["source"] for error in validate(report) if error["type_error"] == "SystemError"}
+    assert crashed == {"Producto[1]", "BitacoraMensual[0]", "BitacoraMensual[1]", "BitacoraMensual[2]"}
+    assert any(error["source"].startswith("Producto[2].") for error in validate(report) if error.get("source"))
+
+
+def test_stream_matches_buffered_empty_log():
+    report = build_report(products=1, cfdis=1)
+    report["BitacoraMensual"] = []
+    raw = json.dumps(report).encode("UTF-8")
+    assert error_set(validate_streamed(raw, chunk_size=1 << 20)) == error_set(validate(report))
+    assert not any(error["type_error"] == "SystemError" for error in validate(report))
+
+
+def test_log_type_errors_reported():
+    report = build_report(products=1, cfdis=1)
+    report["BitacoraMensual"][1]["NumeroRegistro"] = "2"
+    raw = json.dumps(report).encode("UTF-8")
+    assert error_set(validate_streamed(raw, chunk_size=1 << 10)) == error_set(validate(report))
+    assert {"type_error": "TipadoError", "error": "Error: Clave NumeroRegistro no es de tipo int"} in validate(report)
+
+
+def test_complement_built_once(monkeypatch):
+    """The CFDIs of a Complemento item share one complement object, also when they wait for TipoComplemento."""
+    built = []
+
+    def builder(**kwargs):
+        built.append(kwargs["offset"])
+        return complement_builder(**kwargs)
+
+    monkeypatch.setattr(json_validator, "complement_builder", builder)
+    for report in (build_report(products=2, cfdis=5), late_keys(build_report(products=2, cfdis=5))):
+        built.clear()
+        validate_streamed(json.dumps(report).encode("UTF-8"), chunk_size=1 << 20)
+        # Un elemento Complemento por sección y producto.
+        assert built == [0] * 4
+
+
+def test_pending_cfdis_over_limit(monkeypatch):
+    monkeypatch.setattr(json_validator, "STREAM_PENDING_CFDIS", 2)
+    raw = json.dumps(late_keys(build_report(products=1, cfdis=4))).encode("UTF-8")
+    errors = [error for error in validate_streamed(raw, chunk_size=1 << 20) if "'TipoComplemento'" in error["error"]]
+    # Los CFDIs esperan al final de su producto, los de Entregas exceden el límite también.
+    assert [error["source"] for error in errors] == [
+        "Producto[0].ReporteDeVolumenMensual.Recepciones.Complemento[0]",
+        "Producto[0].ReporteDeVolumenMensual.Entregas.Complemento[0]",
+        ]
+
+
+def test_pending_products_over_limit(monkeypatch):
+    monkeypatch.setattr(json_validator, "STREAM_PENDING_PRODUCTS", 1)
+    raw = json.dumps(late_keys(build_report(products=3, cfdis=1))).encode("UTF-8")
+    errors = [error for error in validate_streamed(raw, chunk_size=1 << 20) if "'Caracter'" in error["error"]]
+    assert [error["source"] for error in errors] == ["Producto[1]", "Producto[2]"]
@@ -0,0 +1,100 @@
+"""Reconciliation of the CFDI totals with the totals declared by Recepciones and Entregas."""
+import pytest
+
+from src.complements.totals import AMOUNT_KEYS, DocumentTotals
+from src.monthly_volume_report import MonthlyVolumeReportValidator
+
+# Importe de cada clave de precio en los CFDIs de prueba; solo la clave de la sección suma 100.
+PRICES = {
+    "PrecioCompra": 0,
+    "PrecioVenta": 100,
+    "PrecioDeVentaAlPublico": 25,
+    "Contraprestacion": 100,
+    "PrecioVentaOCompraOContrap": 100,
+    }
+
+
+def build_cfdi(amount_key: str) -> dict:
+    cfdi = {
+        "Cfdi": "CD613E30-D8F1-6ADF-91B7-584A2265B1F5",
+        "TipoCfdi": "Ingreso",
+        "FechaYHoraTransaccion": "2024-01-02T10:00:00-06:00",
+        "VolumenDocumentado": {"ValorNumerico": 10.0, "UnidadDeMedida": "UM03"},
+        **PRICES,
+        }
+    if amount_key == "PrecioCompra":
+        cfdi["PrecioCompra"] = 100
+    return cfdi
+
+
+def build_section(section: str, amount: float) -> dict:
+    volume_key = "SumaVolumenRecepcionMes" if section == "Recepciones" else "SumaVolumenEntregadoMes"
+    amount_key = "ImporteTotalRecepcionesMensual" if section == "Recepciones" else "ImporteTotalEntregasMes"
+    return {
+        "TotalDocumentosMes": 3,
+        volume_key: {"ValorNumerico": 30.0, "UnidadDeMedida": "UM03"},
+        amount_key: amount,
+        }
+
+
+@pytest.mark.parametrize("complement_type", sorted(AMOUNT_KEYS))
+@pytest.mark.parametrize("section", ["Recepciones", "Entregas"])
+def test_amount_key_per_section(complement_type: str, section: str) -> None:
+    amount_key = AMOUNT_KEYS[complement_type][section]
+    totals = DocumentTotals(complement_type=complement_type, section=section)
+    for _ in range(3):
+        totals.add(record=build_cfdi(amount_key=amount_key))
+
+    assert list(totals.reconcile(declared=build_section(section=section, amount=300.0))) == []
+    mismatches = [message for _, message, _ in totals.reconcile(declared=build_section(section=section, amount=999.0))]
+    if amount_key is None:
+        assert mismatches == []
+    else:
+        assert len(mismatches) == 1 and "con valor 999.0 no concuerda con 300.0 " in mismatches[0]
+
+
+def test_public_price_is_not_summed() -> None:
+    totals = DocumentTotals(complement_type="Expendio", section="Entregas")
+    totals.add(record={"PrecioCompra": 0, "PrecioDeVentaAlPublico": 25})
+    assert totals.without_amount == 1 and totals.amount == 0
+
+
+def test_expendio_entregas_report() -> None:
+    cfdis = [
+        {
+            "Cfdi": f"CD613E30-D8F1-6ADF-91B7-584A2265B1F{index}",
+            "TipoCfdi": "Ingreso",
+            "PrecioCompra": 0,
+            "PrecioVenta": 100,
+            "PrecioDeVentaAlPublico": 25,
+            "FechaYHoraTransaccion": "2024-01-02T10:00:00-06:00",
+            "VolumenDocumentado": {"ValorNumerico": 10.0, "UnidadDeMedida": "UM03"},
+            }
+        for index in range(3)
+        ]
+    complement = {
+        "TipoComplemento": "Expendio",
+        "Nacional": [{
+            "RfcClienteOProveedor": "AAA010101AAA",
+            "NombreClienteOProveedor": "Cliente Ejemplo SA",
+            "CFDIs": cfdis,
+            }],
+        }
+    report = {
+        "Recepciones": {
+            "TotalRecepcionesMes": 0,
+            "SumaVolumenRecepcionMes": {"ValorNumerico": 0.0, "UnidadDeMedida": "UM03"},
+            "TotalDocumentosMes": 0,
+            "ImporteTotalRecepcionesMensual": 0.0,
+            },
+        "Entregas": {
+            "TotalEntregasMes": 3,
+            "SumaVolumenEntregadoMes": {"ValorNumerico": 30.0, "UnidadDeMedida": "UM03"},
+            "TotalDocumentosMes": 3,
+            "ImporteTotalEntregasMes": 300.0,
+            "Complemento": [complement],
+            },
+        }
+    validator = MonthlyVolumeReportValidator(monthly_volume_report=report, product_key="PR07", caracter="permisionario")
+    validator.validate_report()
+    assert [err for err in validator.errors if "concuerda" in str(err.get("error"))] == []
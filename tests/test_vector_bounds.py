@@ -0,0 +1,36 @@
+"""Vectorized bounds report the same errors, in the same order, as checking every record in full."""
+import os
+import random
+
+import pytest
+
+from src.complements import vector_bounds
+from tests.reports import COMPLEMENT_TYPES, build_numeric_complement, validate_complement
+
+MODES = {
+    "full": (False, vector_bounds.np),
+    "numpy": (True, vector_bounds.np),
+    "python": (True, None),
+    }
+
+
+def test_off_by_default():
+    if "VECTORIZED_BOUNDS" in os.environ:
+        pytest.skip("VECTORIZED_BOUNDS está definido en el entorno.")
+    assert vector_bounds.VECTORIZED_BOUNDS is False
+
+
+@pytest.mark.parametrize("complement_type", COMPLEMENT_TYPES)
+def test_vectorized_matches_full(monkeypatch, complement_type):
+    complement = build_numeric_complement(rng=random.Random(complement_type), complement_type=complement_type)
+    monkeypatch.setattr(vector_bounds, "VECTORIZE_MIN_RECORDS", 0)
+    results = {}
+    for mode, (enabled, np_module) in MODES.items():
+        if mode == "numpy" and np_module is None:
+            continue
+        monkeypatch.setattr(vector_bounds, "VECTORIZED_BOUNDS", enabled)
+        monkeypatch.setattr(vector_bounds, "np", np_module)
+        results[mode] = validate_complement(complement=complement, complement_type=complement_type)
+    assert results["full"]
+    for mode, errors in results.items():
+        assert errors == results["full"], mode